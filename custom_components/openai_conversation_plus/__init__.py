@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+import copy
+import functools
 import json
 import logging
 import time
+from pathlib import Path
 from typing import Literal, Any
 from types import SimpleNamespace
 
@@ -15,31 +18,31 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_NAME, CONF_API_KEY, MATCH_ALL, Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import (
-    ConfigEntryNotReady,
     HomeAssistantError,
     TemplateError,
 )
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import entity_registry as er
-from homeassistant.helpers import intent, template
-from homeassistant.helpers.httpx_client import get_async_client
+from homeassistant.helpers import intent, issue_registry as ir, template
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.util import ulid
 from openai import AsyncOpenAI
-from openai._exceptions import AuthenticationError, OpenAIError
 
 from .const import (
     CONF_API_VERSION,
     CONF_ATTACH_USERNAME,
     CONF_BASE_URL,
     CONF_CHAT_MODEL,
+    CONF_CONVERSATION_TOOL_CALL_BUDGET,
     CONF_ENABLE_CONVERSATION_EVENTS,
     CONF_ENABLE_WEB_SEARCH,
     CONF_FUNCTIONS,
     CONF_MAX_FUNCTION_CALLS_PER_CONVERSATION,
+    CONF_MAX_CONCURRENT_REQUESTS,
     CONF_MAX_TOKENS,
     CONF_MCP_SERVERS,
     CONF_ORGANIZATION,
+    CONF_PERFORMANCE_SENSORS,
     CONF_PROMPT,
     CONF_REASONING_LEVEL,
     CONF_SEARCH_CONTEXT_SIZE,
@@ -47,6 +50,7 @@ from .const import (
     CONF_STORE_CONVERSATIONS,
     CONF_TEMPERATURE,
     CONF_TOP_P,
+    CONF_TRACE_BUFFER,
     CONF_USE_TOOLS,
     CONF_USER_LOCATION,
     CONF_VERBOSITY,
@@ -56,9 +60,11 @@ from .const import (
     DEFAULT_CONF_FUNCTIONS,
     DEFAULT_ENABLE_CONVERSATION_EVENTS,
     DEFAULT_ENABLE_WEB_SEARCH,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
     DEFAULT_MAX_FUNCTION_CALLS_PER_CONVERSATION,
     DEFAULT_MAX_TOKENS,
     DEFAULT_NAME,
+    DEFAULT_PERFORMANCE_SENSORS,
     DEFAULT_PROMPT,
     DEFAULT_REASONING_LEVEL,
     DEFAULT_SEARCH_CONTEXT_SIZE,
@@ -66,9 +72,12 @@ from .const import (
     DEFAULT_STORE_CONVERSATIONS,
     DEFAULT_TEMPERATURE,
     DEFAULT_TOP_P,
+    DEFAULT_TRACE_BUFFER,
     DEFAULT_USE_TOOLS,
     DEFAULT_USER_LOCATION,
     DEFAULT_VERBOSITY,
+    DATA_CAPABILITIES,
+    DATA_CREDENTIALS,
     DOMAIN,
     EVENT_CONVERSATION_FINISHED,
     GPT5_MODELS,
@@ -81,8 +90,16 @@ from .exceptions import (
     ParseArgumentsFailed,
     TokenLengthExceededError,
 )
+from .api_log import ApiLog, ApiLogSettings
+from .capabilities import async_load_capabilities
+from .credentials import async_load_validation_cache, async_validate_entry, issue_id
 from .helpers import get_function_executor
 from . import helpers
+from .http_client import HttpClientSettings, async_create_http_client
+from .metrics import PerformanceMetrics
+from .scheduler import Priority, RequestScheduler
+from .spans import PhaseHistograms
+from .traces import TraceBuffer
 from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
@@ -90,7 +107,7 @@ _LOGGER = logging.getLogger(__name__)
 # Version is imported from const.py as INTEGRATION_VERSION
 
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
-PLATFORMS = ["ai_task", Platform.CONVERSATION]
+PLATFORMS = ["ai_task", Platform.CONVERSATION, Platform.SENSOR]
 DATA_AGENT = "agent"
 
 
@@ -106,6 +123,9 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         _LOGGER.warning("[v%s] OpenAI Conversation Plus: OpenAI library not available", INTEGRATION_VERSION)
 
     hass.data.setdefault(DOMAIN, {})
+    # What each model endpoint rejected, so requests are shaped before sending
+    hass.data[DATA_CAPABILITIES] = await async_load_capabilities(hass)
+    hass.data[DATA_CREDENTIALS] = await async_load_validation_cache(hass)
     await async_setup_services(hass, config)
 
     try:
@@ -121,6 +141,23 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     return True
 
 
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Migrate options of older entries."""
+    if entry.version > 1:
+        return False
+    if entry.minor_version < 2:
+        # The per-conversation function call limit was stored but never enforced.
+        # A value the user chose becomes the conversation tool call budget; the
+        # stored default of 1 is dropped rather than capping every conversation.
+        options = dict(entry.options)
+        calls = options.pop(CONF_MAX_FUNCTION_CALLS_PER_CONVERSATION, None)
+        if calls is not None and calls != DEFAULT_MAX_FUNCTION_CALLS_PER_CONVERSATION:
+            options.setdefault(CONF_CONVERSATION_TOOL_CALL_BUDGET, calls)
+        hass.config_entries.async_update_entry(entry, options=options, minor_version=2)
+        _LOGGER.debug("[v%s] Migrated entry %s to version 1.2", INTEGRATION_VERSION, entry.entry_id)
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up OpenAI Conversation from a config entry."""
     try:
@@ -136,33 +173,14 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             INTEGRATION_VERSION
         )
 
-    # Validate authentication
-    try:
-        await helpers.validate_authentication(
-            hass=hass,
-            api_key=entry.data[CONF_API_KEY],
-            base_url=entry.data.get(CONF_BASE_URL),
-            api_version=entry.data.get(CONF_API_VERSION),
-            organization=entry.data.get(CONF_ORGANIZATION),
-            skip_authentication=entry.data.get(
-                CONF_SKIP_AUTHENTICATION, DEFAULT_SKIP_AUTHENTICATION
-            ),
-        )
-    except AuthenticationError as err:
-        _LOGGER.error("[v%s] Invalid API key: %s", INTEGRATION_VERSION, err)
-        return False
-    except OpenAIError as err:
-        raise ConfigEntryNotReady(err) from err
-    except Exception as err:
-        _LOGGER.error("[v%s] Authentication failed: %s", INTEGRATION_VERSION, err)
-        return False
-
-    # Create OpenAI client for conversation platform to use
+    # Create OpenAI client for conversation platform to use, on a connection
+    # pool of its own rather than Home Assistant's shared client
+    http = await async_create_http_client(hass, entry.options)
     client = AsyncOpenAI(
         api_key=entry.data[CONF_API_KEY],
         base_url=entry.data.get(CONF_BASE_URL),
         organization=entry.data.get(CONF_ORGANIZATION),
-        http_client=get_async_client(hass),
+        http_client=http.client,
     )
     
     # Store client in runtime_data for conversation.py to access
@@ -171,6 +189,54 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Store entry data for backward compatibility
     data = hass.data.setdefault(DOMAIN, {}).setdefault(entry.entry_id, {})
     data[CONF_API_KEY] = entry.data[CONF_API_KEY]
+    data["http"] = http
+
+    # All requests of this entry share its rate limit and concurrency slots
+    scheduler = RequestScheduler(
+        int(entry.options.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS))
+    )
+    http.async_add_response_listener(scheduler.observe_response)
+    data["scheduler"] = scheduler
+
+    # Debug log of API traffic, written in the background
+    data["api_log"] = ApiLog(
+        hass,
+        Path(hass.config.path("custom_components", DOMAIN, "logs")),
+        ApiLogSettings.from_options(entry.options),
+    )
+    # Recent turn traces, only written out by the dump_traces service
+    data["traces"] = TraceBuffer(int(entry.options.get(CONF_TRACE_BUFFER, DEFAULT_TRACE_BUFFER)))
+    # Latency percentiles of each turn phase, shown in the diagnostics
+    data["latency"] = PhaseHistograms()
+    if entry.options.get(CONF_PERFORMANCE_SENSORS, DEFAULT_PERFORMANCE_SENSORS):
+        data["metrics"] = PerformanceMetrics()
+
+    # Check the API key after setup instead of making startup wait for the API
+    entry.async_create_background_task(
+        hass,
+        async_validate_entry(
+            hass,
+            entry,
+            hass.data[DATA_CREDENTIALS],
+            None if helpers.is_azure(entry.data.get(CONF_BASE_URL)) else client,
+        ),
+        f"{DOMAIN} validate API key {entry.entry_id}",
+    )
+
+    # Open a connection now and keep one warm while idle
+    ping_client = client.with_options(max_retries=0, timeout=http.settings.connect_timeout + 5)
+    model = entry.options.get(CONF_CHAT_MODEL, DEFAULT_CHAT_MODEL)
+
+    async def async_ping() -> None:
+        # Never take a slot or rate limit share a conversation turn needs
+        async with scheduler.slot(Priority.BACKGROUND):
+            await ping_client.models.retrieve(model)
+
+    http.async_start_keep_warm(async_ping)
+    entry.async_on_unload(entry.add_update_listener(_async_options_updated))
+
+    # Import what the configured functions need outside the event loop
+    await helpers.async_load_function_executors(hass, configured_function_types(entry.options))
 
     # Forward to platforms (conversation.py will register the agent)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -180,17 +246,52 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+async def _async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when connection settings changed."""
+    await helpers.async_load_function_executors(hass, configured_function_types(entry.options))
+    data = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
+    if (scheduler := data.get("scheduler")) is not None:
+        scheduler.max_concurrency = max(
+            1, int(entry.options.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS))
+        )
+    if (api_log := data.get("api_log")) is not None:
+        api_log.settings = ApiLogSettings.from_options(entry.options)
+    if (traces := data.get("traces")) is not None:
+        traces.resize(int(entry.options.get(CONF_TRACE_BUFFER, DEFAULT_TRACE_BUFFER)))
+    if (capabilities := hass.data.get(DATA_CAPABILITIES)) is not None:
+        # Changed options may fix what the endpoint rejected; learn it again
+        capabilities.forget(entry.data.get(CONF_BASE_URL))
+    http = data.get("http")
+    if http is not None and http.settings != HttpClientSettings.from_options(entry.options):
+        _LOGGER.info("[v%s] Connection settings changed, reloading entry", INTEGRATION_VERSION)
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+    elif data and ("metrics" in data) != bool(
+        entry.options.get(CONF_PERFORMANCE_SENSORS, DEFAULT_PERFORMANCE_SENSORS)
+    ):
+        _LOGGER.info("[v%s] Performance sensors switched, reloading entry", INTEGRATION_VERSION)
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         try:
-            hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+            data = hass.data.get(DOMAIN, {}).pop(entry.entry_id, None) or {}
+            if data.get("api_log") is not None:
+                await data["api_log"].async_close()
+            if data.get("http") is not None:
+                await data["http"].async_close()
         except Exception:
             pass
         ha_conversation.async_unset_agent(hass, entry)
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the invalid key issue of a deleted entry."""
+    ir.async_delete_issue(hass, DOMAIN, issue_id(entry))
+
+
 def _normalize_mcp_items(data):
     """Normalize MCP configuration data into a consistent format."""
     if isinstance(data, dict) and "mcpServers" in data:
@@ -232,12 +333,16 @@ def _normalize_mcp_items(data):
 def build_mcp_tools_from_options(options):
     """Build MCP tools from integration options."""
     raw = options.get(CONF_MCP_SERVERS) or ""
-    _LOGGER.info("[v%s] Building MCP tools from configuration...", INTEGRATION_VERSION)
-    
     if not raw or not raw.strip():
-        _LOGGER.info("[v%s] No MCP servers configured", INTEGRATION_VERSION)
         return []
-    
+    # Called for every turn; the configuration is only parsed and logged when it changes
+    return copy.deepcopy(list(_build_mcp_tools(raw)))
+
+
+@functools.lru_cache(maxsize=8)
+def _build_mcp_tools(raw: str) -> tuple[dict[str, Any], ...]:
+    """Parse the MCP server configuration into tools."""
+    _LOGGER.info("[v%s] Building MCP tools from configuration...", INTEGRATION_VERSION)
     try:
         data = yaml.safe_load(raw)
         _LOGGER.debug("[v%s] Parsed MCP YAML data: %s", INTEGRATION_VERSION, data)
@@ -250,10 +355,10 @@ def build_mcp_tools_from_options(options):
             e,
             raw[:500] if len(raw) > 500 else raw
         )
-        return []
+        return ()
     except Exception as e:
         _LOGGER.error("[v%s] Unexpected error parsing MCP configuration: %s", INTEGRATION_VERSION, e)
-        return []
+        return ()
     
     items = _normalize_mcp_items(data) if data else []
     _LOGGER.info("[v%s] Normalized %d MCP server configurations", INTEGRATION_VERSION, len(items))
@@ -325,7 +430,7 @@ def build_mcp_tools_from_options(options):
             )
     
     _LOGGER.info("[v%s] Successfully built %d MCP tools", INTEGRATION_VERSION, len(tools))
-    return tools
+    return tuple(tools)
 
 
 def sanitize_tools_for_responses(tools: list[dict]) -> list[dict]:
@@ -394,6 +499,19 @@ def sanitize_tools_for_responses(tools: list[dict]) -> list[dict]:
             continue
     return sanitized
 
+def configured_function_types(options: dict) -> set[str]:
+    """Return the executor types the configured functions use."""
+    try:
+        function = options.get(CONF_FUNCTIONS)
+        result = yaml.safe_load(function) if function else DEFAULT_CONF_FUNCTIONS
+    except yaml.YAMLError:
+        return set()
+    settings = result if isinstance(result, list) else []
+    return helpers.function_types(
+        setting.get("function") for setting in settings if isinstance(setting, dict)
+    )
+
+
 def get_functions_from_options(options: dict) -> list[dict]:
     """Get function definitions from integration options."""
     try:
@@ -0,0 +1,278 @@
+"""Debug log of API requests, responses and tool calls, written in the background.
+
+Events are queued on the event loop without any I/O. They are serialized
+and appended to JSON Lines segments in the executor, in batches. Segments
+are optionally compressed, rotated by size and age, and removed once they
+are older than the retention period or exceed the size limit. When the
+log is off, nothing is queued and no payload is built.
+"""
+
+from __future__ import annotations
+
+import gzip
+import importlib.util
+import json
+import logging
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    CONF_API_LOG,
+    CONF_API_LOG_COMPRESSION,
+    CONF_API_LOG_MAX_SIZE,
+    CONF_API_LOG_RETENTION_DAYS,
+    CONF_API_LOG_SAMPLE_RATE,
+    DEFAULT_API_LOG,
+    DEFAULT_API_LOG_COMPRESSION,
+    DEFAULT_API_LOG_MAX_SIZE,
+    DEFAULT_API_LOG_RETENTION_DAYS,
+    DEFAULT_API_LOG_SAMPLE_RATE,
+    INTEGRATION_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# A segment is closed once it reaches this size or age
+SEGMENT_MAX_BYTES = 5 * 1024 * 1024
+SEGMENT_MAX_AGE = 3600
+# Seconds events wait in the queue before a batch is written
+FLUSH_INTERVAL = 2.0
+# Events kept while a batch is being written; more are dropped
+MAX_QUEUED_EVENTS = 1000
+
+SEGMENT_PREFIX = "api_"
+SEGMENT_SUFFIXES = {"none": ".jsonl", "gzip": ".jsonl.gz", "zstd": ".jsonl.zst"}
+# Files of the former one-file-per-event log, removed by the same retention
+LEGACY_SUFFIX = ".json"
+
+
+def zstd_available() -> bool:
+    """Return True if the optional `zstandard` package is installed."""
+    return importlib.util.find_spec("zstandard") is not None
+
+
+@dataclass(frozen=True)
+class ApiLogSettings:
+    """What is logged and how long it is kept."""
+
+    enabled: bool = DEFAULT_API_LOG
+    compression: str = DEFAULT_API_LOG_COMPRESSION
+    sample_rate: float = DEFAULT_API_LOG_SAMPLE_RATE / 100
+    retention_days: float = DEFAULT_API_LOG_RETENTION_DAYS
+    max_size_mb: float = DEFAULT_API_LOG_MAX_SIZE
+
+    @classmethod
+    def from_options(cls, options) -> ApiLogSettings:
+        """Build settings from integration options."""
+        compression = options.get(CONF_API_LOG_COMPRESSION, DEFAULT_API_LOG_COMPRESSION)
+        if compression not in SEGMENT_SUFFIXES:
+            compression = DEFAULT_API_LOG_COMPRESSION
+        return cls(
+            enabled=bool(options.get(CONF_API_LOG, DEFAULT_API_LOG)),
+            compression=compression,
+            sample_rate=float(options.get(CONF_API_LOG_SAMPLE_RATE, DEFAULT_API_LOG_SAMPLE_RATE)) / 100,
+            retention_days=float(options.get(CONF_API_LOG_RETENTION_DAYS, DEFAULT_API_LOG_RETENTION_DAYS)),
+            max_size_mb=float(options.get(CONF_API_LOG_MAX_SIZE, DEFAULT_API_LOG_MAX_SIZE)),
+        )
+
+
+@dataclass
+class ApiLogStats:
+    """Counters of the API log."""
+
+    events: int = 0
+    dropped: int = 0
+    bytes_written: int = 0
+    segments_removed: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters for diagnostics."""
+        return {
+            "events": self.events,
+            "dropped": self.dropped,
+            "bytes_written": self.bytes_written,
+            "segments_removed": self.segments_removed,
+        }
+
+
+def _compress(data: bytes, compression: str) -> bytes:
+    # Each batch is a complete gzip member or zstd frame; concatenated ones
+    # decompress as one stream with zcat, zstdcat or gzip.open
+    if compression == "gzip":
+        return gzip.compress(data, compresslevel=6)
+    if compression == "zstd":
+        import zstandard
+
+        return zstandard.ZstdCompressor().compress(data)
+    return data
+
+
+class SegmentWriter:
+    """Appends batches to the current segment; only used from the executor."""
+
+    def __init__(self, directory: Path) -> None:
+        """Initialize the writer."""
+        self.directory = directory
+        self._path: Path | None = None
+        self._opened = 0.0
+        self._size = 0
+
+    def write(self, data: bytes, settings: ApiLogSettings, now: float) -> tuple[int, int]:
+        """Append a batch of lines; returns the bytes written and segments removed."""
+        suffix = SEGMENT_SUFFIXES[settings.compression]
+        removed = 0
+        if (
+            self._path is None
+            or not self._path.name.endswith(suffix)
+            or self._size >= SEGMENT_MAX_BYTES
+            or now - self._opened >= SEGMENT_MAX_AGE
+        ):
+            self.directory.mkdir(parents=True, exist_ok=True)
+            stamp = datetime.fromtimestamp(now).strftime("%Y%m%d_%H%M%S_%f")
+            self._path = self.directory / f"{SEGMENT_PREFIX}{stamp}{suffix}"
+            self._opened = now
+            self._size = 0
+            removed = self.prune(settings, now)
+        payload = _compress(data, settings.compression)
+        with open(self._path, "ab") as file:
+            file.write(payload)
+        self._size += len(payload)
+        return len(payload), removed
+
+    def prune(self, settings: ApiLogSettings, now: float) -> int:
+        """Remove segments past the retention period or beyond the size limit, oldest first."""
+        if not self.directory.is_dir():
+            return 0
+        files = []
+        for path in self.directory.iterdir():
+            name = path.name
+            if path == self._path or not path.is_file():
+                continue
+            if not (name.startswith(SEGMENT_PREFIX) or name.endswith(LEGACY_SUFFIX)):
+                continue
+            stat = path.stat()
+            files.append((stat.st_mtime, stat.st_size, path))
+        files.sort(reverse=True)
+
+        max_age = settings.retention_days * 86400
+        budget = settings.max_size_mb * 1024 * 1024 - self._size
+        removed = 0
+        for mtime, size, path in files:
+            budget -= size
+            if now - mtime > max_age or budget < 0:
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+
+class TurnLog:
+    """Logs the events of one sampled turn under a shared turn id."""
+
+    def __init__(self, api_log: ApiLog) -> None:
+        """Initialize the turn log."""
+        self._api_log = api_log
+        self.turn_id = uuid.uuid4().hex[:12]
+
+    def write(self, log_type: str, data: dict[str, Any]) -> None:
+        """Queue an event; never blocks."""
+        self._api_log.write(log_type, {"turn": self.turn_id, **data})
+
+
+class ApiLog:
+    """Background writer of API log events of one config entry."""
+
+    def __init__(self, hass: HomeAssistant, directory: Path, settings: ApiLogSettings) -> None:
+        """Initialize the log."""
+        self.hass = hass
+        self.stats = ApiLogStats()
+        self._writer = SegmentWriter(directory)
+        self._pending: list[tuple[float, str, dict[str, Any]]] = []
+        self._flush_scheduled: Any = None
+        self._flushing = False
+        self.settings = settings
+
+    @property
+    def settings(self) -> ApiLogSettings:
+        """Return the current settings."""
+        return self._settings
+
+    @settings.setter
+    def settings(self, settings: ApiLogSettings) -> None:
+        if settings.compression == "zstd" and not zstd_available():
+            _LOGGER.warning("[v%s] zstandard is not installed, compressing the API log with gzip", INTEGRATION_VERSION)
+            settings = ApiLogSettings(
+                settings.enabled, "gzip", settings.sample_rate, settings.retention_days, settings.max_size_mb
+            )
+        self._settings = settings
+
+    def start_turn(self) -> TurnLog | None:
+        """Return a log for a new turn, or None if the log is off or the turn is not sampled."""
+        settings = self._settings
+        if not settings.enabled or random.random() >= settings.sample_rate:
+            return None
+        return TurnLog(self)
+
+    @callback
+    def write(self, log_type: str, data: dict[str, Any]) -> None:
+        """Queue an event to be written in the next batch."""
+        if not self._settings.enabled:
+            return
+        if len(self._pending) >= MAX_QUEUED_EVENTS:
+            self.stats.dropped += 1
+            return
+        self.stats.events += 1
+        self._pending.append((time.time(), log_type, data))
+        if self._flush_scheduled is None and not self._flushing:
+            self._flush_scheduled = self.hass.loop.call_later(FLUSH_INTERVAL, self._schedule_flush)
+
+    @callback
+    def _schedule_flush(self) -> None:
+        self._flush_scheduled = None
+        self.hass.async_create_background_task(self.async_flush(), "openai_conversation_plus api log")
+
+    async def async_flush(self) -> None:
+        """Write the queued events."""
+        if self._flushing or not self._pending:
+            return
+        self._flushing = True
+        try:
+            while self._pending:
+                batch, self._pending = self._pending, []
+                written, removed = await self.hass.async_add_executor_job(self._write_batch, batch, self._settings)
+                self.stats.bytes_written += written
+                self.stats.segments_removed += removed
+        finally:
+            self._flushing = False
+
+    async def async_close(self) -> None:
+        """Write what is still queued."""
+        if self._flush_scheduled is not None:
+            self._flush_scheduled.cancel()
+            self._flush_scheduled = None
+        await self.async_flush()
+
+    def _write_batch(self, batch: list[tuple[float, str, dict[str, Any]]], settings: ApiLogSettings) -> tuple[int, int]:
+        # Runs in the executor; the caller counts what was written on the loop
+        lines = []
+        for timestamp, log_type, data in batch:
+            event = {
+                "time": datetime.fromtimestamp(timestamp, timezone.utc).isoformat(),
+                "type": log_type,
+                **data,
+            }
+            try:
+                lines.append(json.dumps(event, ensure_ascii=False, default=str))
+            except (TypeError, ValueError) as err:
+                lines.append(json.dumps({"time": event["time"], "type": log_type, "error": str(err)}))
+        try:
+            return self._writer.write(("\n".join(lines) + "\n").encode(), settings, time.time())
+        except OSError as err:
+            _LOGGER.error("[v%s] Failed to write API log: %s", INTEGRATION_VERSION, err)
+            return 0, 0
@@ -0,0 +1,143 @@
+"""Tool-call budgets for OpenAI Conversation Plus."""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from .const import INTEGRATION_VERSION
+
+_LOGGER = logging.getLogger(__name__)
+
+# Number of conversations whose tool usage is remembered
+MAX_TRACKED_CONVERSATIONS = 100
+# Exhaustions within one conversation after which the loop is reported as runaway
+RUNAWAY_EXHAUSTIONS = 3
+
+
+@dataclass
+class ConversationUsage:
+    """Tool usage accumulated over a conversation."""
+
+    tool_calls: int = 0
+    round_trips: int = 0
+    exhaustions: int = 0
+    last_seen: float = 0.0
+
+
+class TurnToolBudget:
+    """Tool-call budget for a single conversation turn.
+
+    A turn may run ``max_tool_rounds`` rounds of tool calls (all calls the
+    model emits in one response count as one round), and the conversation as a
+    whole may run ``max_conversation_calls`` individual tool calls and
+    ``max_conversation_round_trips`` model round trips. Once any is spent the
+    turn must finish with a text-only answer.
+    """
+
+    def __init__(
+        self,
+        usage: ConversationUsage,
+        max_tool_rounds: int,
+        max_conversation_calls: int,
+        max_conversation_round_trips: int,
+    ) -> None:
+        """Initialize the budget."""
+        self.usage = usage
+        self.max_tool_rounds = max(0, int(max_tool_rounds))
+        self.max_conversation_calls = max(0, int(max_conversation_calls))
+        self.max_conversation_round_trips = max(0, int(max_conversation_round_trips))
+        self.tool_rounds = 0
+        self.tool_calls = 0
+        self.denied_calls = 0
+        self._reported = False
+
+    @property
+    def exhausted(self) -> bool:
+        """Return True if no more tool calls may run in this turn."""
+        return (
+            self.tool_rounds >= self.max_tool_rounds
+            or self.usage.tool_calls >= self.max_conversation_calls
+            or self.usage.round_trips >= self.max_conversation_round_trips
+        )
+
+    def shape_request(self, kwargs: dict[str, Any]) -> bool:
+        """Ask for a text-only answer once the budget is spent; return True if it did."""
+        if not self.exhausted or "tools" not in kwargs:
+            return False
+        kwargs["tool_choice"] = "none"
+        return True
+
+    def record_round_trip(self) -> None:
+        """Record a model round trip."""
+        self.usage.round_trips += 1
+
+    def allow_call(self) -> bool:
+        """Take one tool call from the budget, returning False if none is left."""
+        if self.exhausted:
+            self.denied_calls += 1
+            return False
+        self.tool_calls += 1
+        self.usage.tool_calls += 1
+        return True
+
+    def finish_round(self) -> None:
+        """Close a round of tool calls."""
+        self.tool_rounds += 1
+
+    def mark_exhausted(self) -> int:
+        """Record that the turn ran out of budget; returns the conversation's exhaustion count."""
+        if not self._reported:
+            self._reported = True
+            self.usage.exhaustions += 1
+        return self.usage.exhaustions
+
+
+class ToolBudgetTracker:
+    """Track tool usage per conversation for one agent."""
+
+    def __init__(self) -> None:
+        """Initialize the tracker."""
+        self._usage: OrderedDict[str, ConversationUsage] = OrderedDict()
+        self.total_exhaustions = 0
+
+    def start_turn(
+        self,
+        conversation_id: str | None,
+        max_tool_rounds: int,
+        max_conversation_calls: int,
+        max_conversation_round_trips: int,
+    ) -> TurnToolBudget:
+        """Return the budget for a new turn of a conversation."""
+        key = conversation_id or ""
+        usage = self._usage.pop(key, None) or ConversationUsage()
+        usage.last_seen = time.monotonic()
+        self._usage[key] = usage
+        while len(self._usage) > MAX_TRACKED_CONVERSATIONS:
+            self._usage.popitem(last=False)
+        return TurnToolBudget(usage, max_tool_rounds, max_conversation_calls, max_conversation_round_trips)
+
+    def report_exhausted(self, conversation_id: str | None, budget: TurnToolBudget) -> bool:
+        """Log an exhausted budget; returns True when the conversation looks runaway."""
+        exhaustions = budget.mark_exhausted()
+        self.total_exhaustions += 1
+        runaway = exhaustions >= RUNAWAY_EXHAUSTIONS
+        (_LOGGER.warning if runaway else _LOGGER.info)(
+            "[v%s] Tool budget exhausted in conversation %s (rounds=%d/%d, "
+            "conversation calls=%d/%d, round trips=%d/%d, denied=%d, exhausted %d time(s)%s)",
+            INTEGRATION_VERSION,
+            conversation_id,
+            budget.tool_rounds,
+            budget.max_tool_rounds,
+            budget.usage.tool_calls,
+            budget.max_conversation_calls,
+            budget.usage.round_trips,
+            budget.max_conversation_round_trips,
+            budget.denied_calls,
+            exhaustions,
+            ", possible runaway tool loop" if runaway else "",
+        )
+        return runaway
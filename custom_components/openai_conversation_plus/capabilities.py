@@ -0,0 +1,244 @@
+"""What each model endpoint accepts, learned from rejected requests.
+
+Local endpoints and older models reject some request parameters, tool
+types or streaming. Instead of sending a request that is known to fail
+and retrying it on every turn, the rejection is remembered per base URL
+and model, persisted, and the request is shaped before it is sent.
+Only errors saying a parameter is not accepted at all are learned; invalid
+values and schema errors are about one request, not the endpoint. What
+was learned for an entry's endpoint is forgotten when its options change.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, INTEGRATION_VERSION
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.capabilities"
+STORAGE_VERSION = 1
+# Seconds to batch learned capabilities before writing them
+SAVE_DELAY = 10
+
+# Parameters dropped on a TypeError that names none, as before the cache existed
+LEGACY_OPTIONAL_PARAMETERS = ("response_format", "text", "reasoning")
+# Retries of one request after learning from its rejection
+MAX_CAPABILITY_RETRIES = 3
+# Request fields that only make sense with tools
+TOOL_PARAMETERS = ("tool_choice", "parallel_tool_calls")
+
+# Error codes of a 400 that rejects a parameter as such, not its value
+UNSUPPORTED_CODES = frozenset({"unsupported_parameter", "unknown_parameter"})
+
+_UNEXPECTED_KEYWORD_RE = re.compile(r"unexpected keyword argument '(\w+)'")
+_TOOL_INDEX_RE = re.compile(r"^tools\[(\d+)\]")
+_PARAM_IN_MESSAGE_RE = re.compile(r"(?:parameter|argument)[:\s]+'?([\w.\[\]]+)'?", re.IGNORECASE)
+# Endpoints that send no error code only say so in the message
+_UNSUPPORTED_MESSAGE_RE = re.compile(
+    r"unsupported parameter|unknown parameter|unrecognized (?:request )?argument|not supported|does not support",
+    re.IGNORECASE,
+)
+_INVALID_VALUE_RE = re.compile(r"\bvalue\b|invalid|schema", re.IGNORECASE)
+
+CapabilityKey = tuple[str, str]
+
+
+def tool_type(tool: Any) -> str:
+    """Return the type of a tool definition, grouping web search variants."""
+    kind = str(tool.get("type", "")) if isinstance(tool, dict) else ""
+    return "web_search" if kind.startswith("web_search") else kind
+
+
+@dataclass
+class ModelCapabilities:
+    """Parameters, tool types and modes a model endpoint rejected."""
+
+    unsupported_parameters: set[str] = field(default_factory=set)
+    unsupported_tools: set[str] = field(default_factory=set)
+    streaming: bool = True
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the capabilities for storage and diagnostics."""
+        return {
+            "unsupported_parameters": sorted(self.unsupported_parameters),
+            "unsupported_tools": sorted(self.unsupported_tools),
+            "streaming": self.streaming,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ModelCapabilities:
+        """Restore capabilities from storage."""
+        return cls(
+            set(data.get("unsupported_parameters") or ()),
+            set(data.get("unsupported_tools") or ()),
+            bool(data.get("streaming", True)),
+        )
+
+
+class CapabilityCache:
+    """Capabilities of every base URL and model used, persisted in a store."""
+
+    def __init__(self, store: Store | None = None, data: dict[str, Any] | None = None) -> None:
+        """Initialize the cache from stored data."""
+        self._store = store
+        self._models: dict[CapabilityKey, ModelCapabilities] = {}
+        for item in (data or {}).get("models", []):
+            key = (item.get("base_url") or "", item.get("model") or "")
+            self._models[key] = ModelCapabilities.from_dict(item)
+
+    @staticmethod
+    def key(base_url: Any, model: str) -> CapabilityKey:
+        """Return the key of a model endpoint."""
+        return (str(base_url or "").rstrip("/"), model or "")
+
+    def get(self, key: CapabilityKey) -> ModelCapabilities:
+        """Return what is known about a model endpoint."""
+        return self._models.get(key) or ModelCapabilities()
+
+    def shape(self, key: CapabilityKey, kwargs: dict[str, Any]) -> list[str]:
+        """Drop parameters and tools the endpoint is known to reject; return what was dropped."""
+        capabilities = self._models.get(key)
+        if capabilities is None:
+            return []
+        dropped = [name for name in sorted(capabilities.unsupported_parameters) if kwargs.pop(name, None) is not None]
+        tools = kwargs.get("tools")
+        if tools and capabilities.unsupported_tools:
+            kept = [tool for tool in tools if tool_type(tool) not in capabilities.unsupported_tools]
+            removed = {tool_type(tool) for tool in tools} - {tool_type(tool) for tool in kept}
+            dropped.extend(f"tools:{kind}" for kind in sorted(removed))
+            if kept:
+                kwargs["tools"] = kept
+            else:
+                kwargs.pop("tools", None)
+        if "tools" not in kwargs:
+            for name in TOOL_PARAMETERS:
+                kwargs.pop(name, None)
+        if dropped:
+            _LOGGER.debug("[v%s] Not sending %s to %s", INTEGRATION_VERSION, dropped, key)
+        return dropped
+
+    def learn(self, key: CapabilityKey, kwargs: dict[str, Any], err: Exception) -> list[str]:
+        """Record what a rejected request tells about the endpoint.
+
+        Returns what was learned; an empty list means the error is not about
+        request capabilities and retrying would not help. On success
+        `kwargs` is reshaped for the retry. A rejected tool named by its
+        index is only left out of this request.
+        """
+        capabilities = self._models.get(key) or ModelCapabilities()
+        learned: list[str] = []
+
+        if isinstance(err, TypeError):
+            # The installed SDK does not know the parameter at all
+            match = _UNEXPECTED_KEYWORD_RE.search(str(err))
+            names = [match.group(1)] if match else [name for name in LEGACY_OPTIONAL_PARAMETERS if name in kwargs]
+            for name in names:
+                if name in kwargs and name not in capabilities.unsupported_parameters:
+                    capabilities.unsupported_parameters.add(name)
+                    learned.append(name)
+        elif getattr(err, "status_code", None) == 400 and _rejects_parameter(err):
+            param, message = _rejected_param(err)
+            if match := _TOOL_INDEX_RE.match(param or ""):
+                # One tool was rejected, not its type; leave it out of this request only
+                return _drop_tool(kwargs, int(match.group(1)))
+            learned = self._learn_from_bad_request(capabilities, kwargs, param, message)
+
+        if not learned:
+            return []
+        self._models[key] = capabilities
+        _LOGGER.info("[v%s] %s %s does not support %s, adjusting requests", INTEGRATION_VERSION, key[0] or "OpenAI", key[1], learned)
+        self.shape(key, kwargs)
+        self._async_schedule_save()
+        return learned
+
+    def _learn_from_bad_request(
+        self, capabilities: ModelCapabilities, kwargs: dict[str, Any], param: str | None, message: str
+    ) -> list[str]:
+        root = re.split(r"[.\[]", param or "", maxsplit=1)[0]
+
+        if root == "stream":
+            if not capabilities.streaming:
+                return []
+            capabilities.streaming = False
+            return ["stream"]
+
+        tools = kwargs.get("tools") or []
+        if root == "tools" or (not root and "tools" in message):
+            present = {tool_type(tool) for tool in tools}
+            kinds = {kind for kind in present if kind and kind in message} or present
+            kinds -= capabilities.unsupported_tools
+            capabilities.unsupported_tools |= kinds
+            return [f"tools:{kind}" for kind in sorted(kinds)]
+
+        if root in kwargs and root not in ("model", "input"):
+            capabilities.unsupported_parameters.add(root)
+            return [root]
+        return []
+
+    def forget(self, base_url: Any) -> None:
+        """Forget what was learned about the models of a base URL."""
+        prefix = self.key(base_url, "")[0]
+        stale = [key for key in self._models if key[0] == prefix]
+        for key in stale:
+            del self._models[key]
+        if stale:
+            self._async_schedule_save()
+
+    def as_data(self) -> dict[str, Any]:
+        """Return the data to store."""
+        return {
+            "models": [
+                {"base_url": base_url, "model": model, **capabilities.as_dict()}
+                for (base_url, model), capabilities in self._models.items()
+            ]
+        }
+
+    def _async_schedule_save(self) -> None:
+        if self._store is not None:
+            self._store.async_delay_save(self.as_data, SAVE_DELAY)
+
+
+def _rejected_param(err: Exception) -> tuple[str | None, str]:
+    """Return the parameter a bad request names and its message."""
+    message = str(getattr(err, "message", None) or err)
+    param = getattr(err, "param", None)
+    if not param and (match := _PARAM_IN_MESSAGE_RE.search(message)):
+        param = match.group(1)
+    return param, message
+
+
+def _rejects_parameter(err: Exception) -> bool:
+    """Return True if a bad request rejects a parameter as such, not its value or schema."""
+    code = getattr(err, "code", None)
+    if code:
+        return code in UNSUPPORTED_CODES
+    message = str(getattr(err, "message", None) or err)
+    return bool(_UNSUPPORTED_MESSAGE_RE.search(message)) and not _INVALID_VALUE_RE.search(message)
+
+
+def _drop_tool(kwargs: dict[str, Any], index: int) -> list[str]:
+    tools = kwargs.get("tools") or []
+    if index >= len(tools):
+        return []
+    kept = tools[:index] + tools[index + 1 :]
+    if kept:
+        kwargs["tools"] = kept
+    else:
+        kwargs.pop("tools", None)
+        for name in TOOL_PARAMETERS:
+            kwargs.pop(name, None)
+    return [f"tools[{index}]"]
+
+
+async def async_load_capabilities(hass: HomeAssistant) -> CapabilityCache:
+    """Load the capabilities learned before the last restart."""
+    store: Store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+    return CapabilityCache(store, await store.async_load())
@@ -0,0 +1,116 @@
+"""Share one turn between satellites that heard the same utterance.
+
+Several satellites in one room often wake on the same command. Without
+coalescing, each one runs its own turn, which doubles the API calls and
+the service calls. A turn whose text, language and area match a turn that
+started a moment earlier waits for that turn and returns its result.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+from .const import INTEGRATION_VERSION
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+@dataclass
+class CoalesceStats:
+    """How many turns ran and how many joined a running one."""
+
+    turns: int = 0
+    joined: int = 0
+
+    @property
+    def join_rate(self) -> float:
+        """Return the share of coalescable turns that joined another one."""
+        total = self.turns + self.joined
+        return self.joined / total if total else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters for diagnostics."""
+        return {"turns": self.turns, "joined": self.joined, "join_rate": round(self.join_rate, 3)}
+
+
+@dataclass
+class _Flight(Generic[_T]):
+    started: float
+    future: asyncio.Future[_T]
+
+
+class TurnCoalescer(Generic[_T]):
+    """Single-flight execution of identical turns within a time window."""
+
+    def __init__(self) -> None:
+        """Initialize the coalescer."""
+        self.stats = CoalesceStats()
+        self._flights: dict[Hashable, _Flight[_T]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of turns that can still be joined."""
+        return len(self._flights)
+
+    async def run(
+        self,
+        key: Hashable,
+        window: float,
+        call: Callable[[], Awaitable[_T]],
+        now: float | None = None,
+    ) -> tuple[_T, bool]:
+        """Run `call`, or join the turn with the same key started within `window` seconds.
+
+        Returns the result and whether it was shared from another turn. A
+        joined turn raises what the shared turn raised. If the shared turn
+        is cancelled, the joined turn runs on its own.
+        """
+        now = time.monotonic() if now is None else now
+        self._prune(window, now)
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.stats.joined += 1
+            _LOGGER.debug(
+                "[v%s] Joining the turn for %r started %.0f ms ago",
+                INTEGRATION_VERSION,
+                key,
+                (now - flight.started) * 1000,
+            )
+            try:
+                return await asyncio.shield(flight.future), True
+            except asyncio.CancelledError:
+                if not flight.future.cancelled():
+                    raise
+            self.stats.joined -= 1
+            _LOGGER.debug("[v%s] Shared turn for %r was cancelled, running it again", INTEGRATION_VERSION, key)
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+        flight = _Flight(now, asyncio.get_running_loop().create_future())
+        self._flights[key] = flight
+        self.stats.turns += 1
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            flight.future.cancel()
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            raise
+        except Exception as err:
+            flight.future.set_exception(err)
+            # Retrieve it so an unjoined turn does not log "exception never retrieved"
+            flight.future.exception()
+            raise
+        flight.future.set_result(result)
+        return result, False
+
+    def _prune(self, window: float, now: float) -> None:
+        expired = [key for key, flight in self._flights.items() if now - flight.started > window]
+        for key in expired:
+            del self._flights[key]
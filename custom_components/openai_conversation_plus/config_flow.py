@@ -32,39 +32,95 @@ from openai._exceptions import APIConnectionError, AuthenticationError
 
 from .const import (
     CONF_API_VERSION,
+    CONF_API_LOG,
+    CONF_LATENCY_SPANS,
+    CONF_PERFORMANCE_SENSORS,
+    CONF_API_LOG_COMPRESSION,
+    CONF_API_LOG_MAX_SIZE,
+    CONF_TRACE_BUFFER,
+    CONF_API_LOG_RETENTION_DAYS,
+    CONF_API_LOG_SAMPLE_RATE,
     CONF_ATTACH_USERNAME,
     CONF_BASE_URL,
     CONF_CHAT_MODEL,
+    CONF_COALESCE_WINDOW,
+    CONF_CONVERSATION_ROUND_TRIP_BUDGET,
+    CONF_CONVERSATION_TOOL_CALL_BUDGET,
     CONF_ENABLE_CONVERSATION_EVENTS,
     CONF_ENABLE_WEB_SEARCH,
     CONF_FUNCTIONS,
     CONF_HOUSE_CONTEXT,
-    CONF_MAX_FUNCTION_CALLS_PER_CONVERSATION,
+    CONF_HEDGE_DELAY,
+    CONF_HEDGE_MODEL,
+    CONF_HEDGE_REQUESTS,
+    CONF_HTTP2,
+    CONF_HTTP_CONNECT_TIMEOUT,
+    CONF_HTTP_KEEPALIVE_EXPIRY,
+    CONF_HTTP_MAX_CONNECTIONS,
+    CONF_HTTP_READ_TIMEOUT,
+    CONF_KEEP_WARM_INTERVAL,
+    CONF_LOCAL_INTENTS,
+    CONF_RESPONSE_CACHE,
+    CONF_RESPONSE_CACHE_TTL,
+    CONF_MAX_CONCURRENT_REQUESTS,
     CONF_MAX_TOKENS,
+    CONF_MAX_TOOL_ROUNDS,
     CONF_MCP_SERVERS,
     CONF_ORGANIZATION,
     CONF_PROMPT,
     CONF_REASONING_LEVEL,
+    CONF_ROUTING,
+    CONF_ROUTING_TABLE,
     CONF_SEARCH_CONTEXT_SIZE,
     CONF_SKIP_AUTHENTICATION,
     CONF_STORE_CONVERSATIONS,
     CONF_SYSTEM_PROMPT,
     CONF_TEMPERATURE,
+    CONF_TOOL_RESULT_MAX_ITEMS,
+    CONF_TOOL_RESULT_MAX_TOKENS,
+    CONF_TOOL_TIMEOUT,
     CONF_TOP_P,
+    CONF_TURN_TIMEOUT,
     CONF_USE_TOOLS,
     CONF_USER_LOCATION,
     CONF_VERBOSITY,
+    DEFAULT_API_LOG,
+    DEFAULT_LATENCY_SPANS,
+    DEFAULT_PERFORMANCE_SENSORS,
+    DEFAULT_API_LOG_COMPRESSION,
+    DEFAULT_API_LOG_MAX_SIZE,
+    DEFAULT_TRACE_BUFFER,
+    DEFAULT_API_LOG_RETENTION_DAYS,
+    DEFAULT_API_LOG_SAMPLE_RATE,
     DEFAULT_ATTACH_USERNAME,
     DEFAULT_CHAT_MODEL,
+    DEFAULT_COALESCE_WINDOW,
     DEFAULT_CONF_BASE_URL,
     DEFAULT_CONF_FUNCTIONS,
+    DEFAULT_ROUTING,
+    DEFAULT_ROUTING_TABLE,
+    DEFAULT_CONVERSATION_ROUND_TRIP_BUDGET,
+    DEFAULT_CONVERSATION_TOOL_CALL_BUDGET,
     DEFAULT_ENABLE_CONVERSATION_EVENTS,
     CONF_STREAM_ENABLED,
     DEFAULT_STREAM_ENABLED,
     DEFAULT_ENABLE_WEB_SEARCH,
     DEFAULT_HOUSE_CONTEXT,
-    DEFAULT_MAX_FUNCTION_CALLS_PER_CONVERSATION,
+    DEFAULT_HEDGE_DELAY,
+    DEFAULT_HEDGE_MODEL,
+    DEFAULT_HEDGE_REQUESTS,
+    DEFAULT_HTTP2,
+    DEFAULT_HTTP_CONNECT_TIMEOUT,
+    DEFAULT_HTTP_KEEPALIVE_EXPIRY,
+    DEFAULT_HTTP_MAX_CONNECTIONS,
+    DEFAULT_HTTP_READ_TIMEOUT,
+    DEFAULT_KEEP_WARM_INTERVAL,
+    DEFAULT_LOCAL_INTENTS,
+    DEFAULT_RESPONSE_CACHE,
+    DEFAULT_RESPONSE_CACHE_TTL,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
     DEFAULT_MAX_TOKENS,
+    DEFAULT_MAX_TOOL_ROUNDS,
     DEFAULT_MCP_SERVERS,
     DEFAULT_NAME,
     DEFAULT_PROMPT,
@@ -74,12 +130,17 @@ from .const import (
     DEFAULT_STORE_CONVERSATIONS,
     DEFAULT_SYSTEM_PROMPT,
     DEFAULT_TEMPERATURE,
+    DEFAULT_TOOL_RESULT_MAX_ITEMS,
+    DEFAULT_TOOL_RESULT_MAX_TOKENS,
+    DEFAULT_TOOL_TIMEOUT,
     DEFAULT_TOP_P,
+    DEFAULT_TURN_TIMEOUT,
     DEFAULT_USE_TOOLS,
     DEFAULT_USER_LOCATION,
     DEFAULT_VERBOSITY,
     DOMAIN,
     INTEGRATION_VERSION,
+    MAX_TRACE_BUFFER,
 )
 from . import helpers
 
@@ -88,6 +149,7 @@ _LOGGER = logging.getLogger(__name__)
 STEP_USER_DATA_SCHEMA = None  # Built dynamically to support selectors
 
 DEFAULT_CONF_FUNCTIONS_STR = yaml.dump(DEFAULT_CONF_FUNCTIONS, sort_keys=False)
+DEFAULT_ROUTING_TABLE_STR = yaml.dump(DEFAULT_ROUTING_TABLE, sort_keys=False)
 
 DEFAULT_OPTIONS = types.MappingProxyType(
     {
@@ -96,7 +158,9 @@ DEFAULT_OPTIONS = types.MappingProxyType(
         CONF_HOUSE_CONTEXT: DEFAULT_HOUSE_CONTEXT,
         CONF_CHAT_MODEL: DEFAULT_CHAT_MODEL,
         CONF_MAX_TOKENS: DEFAULT_MAX_TOKENS,
-        CONF_MAX_FUNCTION_CALLS_PER_CONVERSATION: DEFAULT_MAX_FUNCTION_CALLS_PER_CONVERSATION,
+        CONF_MAX_TOOL_ROUNDS: DEFAULT_MAX_TOOL_ROUNDS,
+        CONF_CONVERSATION_TOOL_CALL_BUDGET: DEFAULT_CONVERSATION_TOOL_CALL_BUDGET,
+        CONF_CONVERSATION_ROUND_TRIP_BUDGET: DEFAULT_CONVERSATION_ROUND_TRIP_BUDGET,
         CONF_TOP_P: DEFAULT_TOP_P,
         CONF_TEMPERATURE: DEFAULT_TEMPERATURE,
         CONF_FUNCTIONS: DEFAULT_CONF_FUNCTIONS_STR,
@@ -110,6 +174,34 @@ DEFAULT_OPTIONS = types.MappingProxyType(
         CONF_REASONING_LEVEL: DEFAULT_REASONING_LEVEL,
         CONF_VERBOSITY: DEFAULT_VERBOSITY,
         CONF_STREAM_ENABLED: DEFAULT_STREAM_ENABLED,
+        CONF_LOCAL_INTENTS: DEFAULT_LOCAL_INTENTS,
+        CONF_RESPONSE_CACHE: DEFAULT_RESPONSE_CACHE,
+        CONF_RESPONSE_CACHE_TTL: DEFAULT_RESPONSE_CACHE_TTL,
+        CONF_COALESCE_WINDOW: DEFAULT_COALESCE_WINDOW,
+        CONF_HEDGE_REQUESTS: DEFAULT_HEDGE_REQUESTS,
+        CONF_HEDGE_DELAY: DEFAULT_HEDGE_DELAY,
+        CONF_HEDGE_MODEL: DEFAULT_HEDGE_MODEL,
+        CONF_ROUTING: DEFAULT_ROUTING,
+        CONF_ROUTING_TABLE: DEFAULT_ROUTING_TABLE_STR,
+        CONF_HTTP2: DEFAULT_HTTP2,
+        CONF_HTTP_MAX_CONNECTIONS: DEFAULT_HTTP_MAX_CONNECTIONS,
+        CONF_HTTP_KEEPALIVE_EXPIRY: DEFAULT_HTTP_KEEPALIVE_EXPIRY,
+        CONF_HTTP_CONNECT_TIMEOUT: DEFAULT_HTTP_CONNECT_TIMEOUT,
+        CONF_HTTP_READ_TIMEOUT: DEFAULT_HTTP_READ_TIMEOUT,
+        CONF_KEEP_WARM_INTERVAL: DEFAULT_KEEP_WARM_INTERVAL,
+        CONF_MAX_CONCURRENT_REQUESTS: DEFAULT_MAX_CONCURRENT_REQUESTS,
+        CONF_TURN_TIMEOUT: DEFAULT_TURN_TIMEOUT,
+        CONF_TOOL_TIMEOUT: DEFAULT_TOOL_TIMEOUT,
+        CONF_TOOL_RESULT_MAX_TOKENS: DEFAULT_TOOL_RESULT_MAX_TOKENS,
+        CONF_TOOL_RESULT_MAX_ITEMS: DEFAULT_TOOL_RESULT_MAX_ITEMS,
+        CONF_API_LOG: DEFAULT_API_LOG,
+        CONF_LATENCY_SPANS: DEFAULT_LATENCY_SPANS,
+        CONF_PERFORMANCE_SENSORS: DEFAULT_PERFORMANCE_SENSORS,
+        CONF_API_LOG_COMPRESSION: DEFAULT_API_LOG_COMPRESSION,
+        CONF_API_LOG_SAMPLE_RATE: DEFAULT_API_LOG_SAMPLE_RATE,
+        CONF_API_LOG_RETENTION_DAYS: DEFAULT_API_LOG_RETENTION_DAYS,
+        CONF_API_LOG_MAX_SIZE: DEFAULT_API_LOG_MAX_SIZE,
+        CONF_TRACE_BUFFER: DEFAULT_TRACE_BUFFER,
     }
 )
 
@@ -139,6 +231,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for OpenAI Conversation."""
 
     VERSION = 1
+    MINOR_VERSION = 2
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -242,6 +335,11 @@ class OptionsFlow(config_entries.OptionsFlow):
             },
             default=DEFAULT_CHAT_MODEL,
         )] = str
+        schema[vol.Optional(
+            CONF_HEDGE_MODEL,
+            description={"suggested_value": options.get(CONF_HEDGE_MODEL, DEFAULT_HEDGE_MODEL)},
+            default=DEFAULT_HEDGE_MODEL,
+        )] = str
         schema[vol.Optional(
             CONF_MAX_TOKENS,
             description={"suggested_value": options.get(CONF_MAX_TOKENS, DEFAULT_MAX_TOKENS)},
@@ -295,6 +393,46 @@ class OptionsFlow(config_entries.OptionsFlow):
             description={"suggested_value": options.get(CONF_STREAM_ENABLED, DEFAULT_STREAM_ENABLED)},
             default=DEFAULT_STREAM_ENABLED,
         )] = BooleanSelector()
+        schema[vol.Optional(
+            CONF_LOCAL_INTENTS,
+            description={"suggested_value": options.get(CONF_LOCAL_INTENTS, DEFAULT_LOCAL_INTENTS)},
+            default=DEFAULT_LOCAL_INTENTS,
+        )] = BooleanSelector()
+        schema[vol.Optional(
+            CONF_RESPONSE_CACHE,
+            description={"suggested_value": options.get(CONF_RESPONSE_CACHE, DEFAULT_RESPONSE_CACHE)},
+            default=DEFAULT_RESPONSE_CACHE,
+        )] = BooleanSelector()
+        schema[vol.Optional(
+            CONF_HEDGE_REQUESTS,
+            description={"suggested_value": options.get(CONF_HEDGE_REQUESTS, DEFAULT_HEDGE_REQUESTS)},
+            default=DEFAULT_HEDGE_REQUESTS,
+        )] = BooleanSelector()
+        schema[vol.Optional(
+            CONF_ROUTING,
+            description={"suggested_value": options.get(CONF_ROUTING, DEFAULT_ROUTING)},
+            default=DEFAULT_ROUTING,
+        )] = BooleanSelector()
+        schema[vol.Optional(
+            CONF_HTTP2,
+            description={"suggested_value": options.get(CONF_HTTP2, DEFAULT_HTTP2)},
+            default=DEFAULT_HTTP2,
+        )] = BooleanSelector()
+        schema[vol.Optional(
+            CONF_API_LOG,
+            description={"suggested_value": options.get(CONF_API_LOG, DEFAULT_API_LOG)},
+            default=DEFAULT_API_LOG,
+        )] = BooleanSelector()
+        schema[vol.Optional(
+            CONF_LATENCY_SPANS,
+            description={"suggested_value": options.get(CONF_LATENCY_SPANS, DEFAULT_LATENCY_SPANS)},
+            default=DEFAULT_LATENCY_SPANS,
+        )] = BooleanSelector()
+        schema[vol.Optional(
+            CONF_PERFORMANCE_SENSORS,
+            description={"suggested_value": options.get(CONF_PERFORMANCE_SENSORS, DEFAULT_PERFORMANCE_SENSORS)},
+            default=DEFAULT_PERFORMANCE_SENSORS,
+        )] = BooleanSelector()
 
         # Select lists
         schema[vol.Optional(
@@ -326,6 +464,20 @@ class OptionsFlow(config_entries.OptionsFlow):
                 mode=SelectSelectorMode.DROPDOWN,
             )
         )
+        schema[vol.Optional(
+            CONF_API_LOG_COMPRESSION,
+            description={"suggested_value": options.get(CONF_API_LOG_COMPRESSION, DEFAULT_API_LOG_COMPRESSION)},
+            default=DEFAULT_API_LOG_COMPRESSION,
+        )] = SelectSelector(
+            SelectSelectorConfig(
+                options=[
+                    SelectOptionDict(value="none", label="None"),
+                    SelectOptionDict(value="gzip", label="gzip"),
+                    SelectOptionDict(value="zstd", label="zstd (needs zstandard)"),
+                ],
+                mode=SelectSelectorMode.DROPDOWN,
+            )
+        )
         # Map legacy values to Responses API supported values
         verbosity_default = options.get(CONF_VERBOSITY, DEFAULT_VERBOSITY)
         from .const import VERBOSITY_COMPAT_MAP
@@ -347,15 +499,120 @@ class OptionsFlow(config_entries.OptionsFlow):
 
         # Other single-line inputs (removed truncation threshold)
         schema[vol.Optional(
-            CONF_MAX_FUNCTION_CALLS_PER_CONVERSATION,
+            CONF_MAX_TOOL_ROUNDS,
             description={
                 "suggested_value": options.get(
-                    CONF_MAX_FUNCTION_CALLS_PER_CONVERSATION,
-                    DEFAULT_MAX_FUNCTION_CALLS_PER_CONVERSATION,
+                    CONF_MAX_TOOL_ROUNDS,
+                    DEFAULT_MAX_TOOL_ROUNDS,
                 )
             },
-            default=DEFAULT_MAX_FUNCTION_CALLS_PER_CONVERSATION,
+            default=DEFAULT_MAX_TOOL_ROUNDS,
         )] = int
+        schema[vol.Optional(
+            CONF_CONVERSATION_TOOL_CALL_BUDGET,
+            description={
+                "suggested_value": options.get(
+                    CONF_CONVERSATION_TOOL_CALL_BUDGET,
+                    DEFAULT_CONVERSATION_TOOL_CALL_BUDGET,
+                )
+            },
+            default=DEFAULT_CONVERSATION_TOOL_CALL_BUDGET,
+        )] = int
+        schema[vol.Optional(
+            CONF_CONVERSATION_ROUND_TRIP_BUDGET,
+            description={
+                "suggested_value": options.get(
+                    CONF_CONVERSATION_ROUND_TRIP_BUDGET,
+                    DEFAULT_CONVERSATION_ROUND_TRIP_BUDGET,
+                )
+            },
+            default=DEFAULT_CONVERSATION_ROUND_TRIP_BUDGET,
+        )] = int
+        schema[vol.Optional(
+            CONF_TURN_TIMEOUT,
+            description={"suggested_value": options.get(CONF_TURN_TIMEOUT, DEFAULT_TURN_TIMEOUT)},
+            default=DEFAULT_TURN_TIMEOUT,
+        )] = NumberSelector(NumberSelectorConfig(min=5, max=300, step=1, unit_of_measurement="s"))
+        schema[vol.Optional(
+            CONF_TOOL_TIMEOUT,
+            description={"suggested_value": options.get(CONF_TOOL_TIMEOUT, DEFAULT_TOOL_TIMEOUT)},
+            default=DEFAULT_TOOL_TIMEOUT,
+        )] = NumberSelector(NumberSelectorConfig(min=1, max=120, step=1, unit_of_measurement="s"))
+        schema[vol.Optional(
+            CONF_TOOL_RESULT_MAX_TOKENS,
+            description={"suggested_value": options.get(CONF_TOOL_RESULT_MAX_TOKENS, DEFAULT_TOOL_RESULT_MAX_TOKENS)},
+            default=DEFAULT_TOOL_RESULT_MAX_TOKENS,
+        )] = int
+        schema[vol.Optional(
+            CONF_TOOL_RESULT_MAX_ITEMS,
+            description={"suggested_value": options.get(CONF_TOOL_RESULT_MAX_ITEMS, DEFAULT_TOOL_RESULT_MAX_ITEMS)},
+            default=DEFAULT_TOOL_RESULT_MAX_ITEMS,
+        )] = int
+        schema[vol.Optional(
+            CONF_API_LOG_SAMPLE_RATE,
+            description={"suggested_value": options.get(CONF_API_LOG_SAMPLE_RATE, DEFAULT_API_LOG_SAMPLE_RATE)},
+            default=DEFAULT_API_LOG_SAMPLE_RATE,
+        )] = NumberSelector(NumberSelectorConfig(min=1, max=100, step=1, unit_of_measurement="%"))
+        schema[vol.Optional(
+            CONF_API_LOG_RETENTION_DAYS,
+            description={"suggested_value": options.get(CONF_API_LOG_RETENTION_DAYS, DEFAULT_API_LOG_RETENTION_DAYS)},
+            default=DEFAULT_API_LOG_RETENTION_DAYS,
+        )] = NumberSelector(NumberSelectorConfig(min=1, max=365, step=1, unit_of_measurement="d"))
+        schema[vol.Optional(
+            CONF_API_LOG_MAX_SIZE,
+            description={"suggested_value": options.get(CONF_API_LOG_MAX_SIZE, DEFAULT_API_LOG_MAX_SIZE)},
+            default=DEFAULT_API_LOG_MAX_SIZE,
+        )] = NumberSelector(NumberSelectorConfig(min=1, max=10000, step=1, unit_of_measurement="MB"))
+        schema[vol.Optional(
+            CONF_TRACE_BUFFER,
+            description={"suggested_value": options.get(CONF_TRACE_BUFFER, DEFAULT_TRACE_BUFFER)},
+            default=DEFAULT_TRACE_BUFFER,
+        )] = NumberSelector(NumberSelectorConfig(min=0, max=MAX_TRACE_BUFFER, step=10))
+        schema[vol.Optional(
+            CONF_RESPONSE_CACHE_TTL,
+            description={"suggested_value": options.get(CONF_RESPONSE_CACHE_TTL, DEFAULT_RESPONSE_CACHE_TTL)},
+            default=DEFAULT_RESPONSE_CACHE_TTL,
+        )] = NumberSelector(NumberSelectorConfig(min=10, max=3600, step=10, unit_of_measurement="s"))
+        schema[vol.Optional(
+            CONF_COALESCE_WINDOW,
+            description={"suggested_value": options.get(CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW)},
+            default=DEFAULT_COALESCE_WINDOW,
+        )] = NumberSelector(NumberSelectorConfig(min=0, max=10, step=0.5, unit_of_measurement="s"))
+        schema[vol.Optional(
+            CONF_HEDGE_DELAY,
+            description={"suggested_value": options.get(CONF_HEDGE_DELAY, DEFAULT_HEDGE_DELAY)},
+            default=DEFAULT_HEDGE_DELAY,
+        )] = NumberSelector(NumberSelectorConfig(min=0.5, max=30, step=0.5, unit_of_measurement="s"))
+        schema[vol.Optional(
+            CONF_HTTP_MAX_CONNECTIONS,
+            description={"suggested_value": options.get(CONF_HTTP_MAX_CONNECTIONS, DEFAULT_HTTP_MAX_CONNECTIONS)},
+            default=DEFAULT_HTTP_MAX_CONNECTIONS,
+        )] = int
+        schema[vol.Optional(
+            CONF_MAX_CONCURRENT_REQUESTS,
+            description={"suggested_value": options.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS)},
+            default=DEFAULT_MAX_CONCURRENT_REQUESTS,
+        )] = int
+        schema[vol.Optional(
+            CONF_HTTP_KEEPALIVE_EXPIRY,
+            description={"suggested_value": options.get(CONF_HTTP_KEEPALIVE_EXPIRY, DEFAULT_HTTP_KEEPALIVE_EXPIRY)},
+            default=DEFAULT_HTTP_KEEPALIVE_EXPIRY,
+        )] = NumberSelector(NumberSelectorConfig(min=5, max=3600, step=5, unit_of_measurement="s"))
+        schema[vol.Optional(
+            CONF_HTTP_CONNECT_TIMEOUT,
+            description={"suggested_value": options.get(CONF_HTTP_CONNECT_TIMEOUT, DEFAULT_HTTP_CONNECT_TIMEOUT)},
+            default=DEFAULT_HTTP_CONNECT_TIMEOUT,
+        )] = NumberSelector(NumberSelectorConfig(min=1, max=60, step=1, unit_of_measurement="s"))
+        schema[vol.Optional(
+            CONF_HTTP_READ_TIMEOUT,
+            description={"suggested_value": options.get(CONF_HTTP_READ_TIMEOUT, DEFAULT_HTTP_READ_TIMEOUT)},
+            default=DEFAULT_HTTP_READ_TIMEOUT,
+        )] = NumberSelector(NumberSelectorConfig(min=5, max=600, step=5, unit_of_measurement="s"))
+        schema[vol.Optional(
+            CONF_KEEP_WARM_INTERVAL,
+            description={"suggested_value": options.get(CONF_KEEP_WARM_INTERVAL, DEFAULT_KEEP_WARM_INTERVAL)},
+            default=DEFAULT_KEEP_WARM_INTERVAL,
+        )] = NumberSelector(NumberSelectorConfig(min=0, max=3600, step=5, unit_of_measurement="s"))
         default_location_str = json.dumps(
             options.get(CONF_USER_LOCATION, DEFAULT_USER_LOCATION), indent=2
         )
@@ -376,6 +633,11 @@ class OptionsFlow(config_entries.OptionsFlow):
             description={"suggested_value": options.get(CONF_MCP_SERVERS, DEFAULT_MCP_SERVERS)},
             default=DEFAULT_MCP_SERVERS,
         )] = TemplateSelector()
+        schema[vol.Optional(
+            CONF_ROUTING_TABLE,
+            description={"suggested_value": options.get(CONF_ROUTING_TABLE, DEFAULT_ROUTING_TABLE_STR)},
+            default=DEFAULT_ROUTING_TABLE_STR,
+        )] = TemplateSelector()
         system_prompt_default = options.get(CONF_SYSTEM_PROMPT, DEFAULT_SYSTEM_PROMPT)
         schema[vol.Optional(
             CONF_SYSTEM_PROMPT,
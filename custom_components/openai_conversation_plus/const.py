@@ -18,6 +18,7 @@ DEFAULT_SKIP_AUTHENTICATION = False
 
 EVENT_AUTOMATION_REGISTERED = "automation_registered_via_openai_conversation_plus"
 EVENT_CONVERSATION_FINISHED = "openai_conversation_plus.conversation.finished"
+EVENT_TOOL_BUDGET_EXHAUSTED = "openai_conversation_plus.tool_budget.exhausted"
 
 CONF_PROMPT = "prompt"
 CONF_SYSTEM_PROMPT = "system_prompt"
@@ -111,8 +112,21 @@ CONF_TOP_P = "top_p"
 DEFAULT_TOP_P = 1
 CONF_TEMPERATURE = "temperature"
 DEFAULT_TEMPERATURE = 0.5
+# Former option that was stored but never enforced; migrated into the
+# conversation tool call budget, which caps the same thing
 CONF_MAX_FUNCTION_CALLS_PER_CONVERSATION = "max_function_calls_per_conversation"
 DEFAULT_MAX_FUNCTION_CALLS_PER_CONVERSATION = 1
+# Rounds of tool calls one turn may run
+CONF_MAX_TOOL_ROUNDS = "max_tool_rounds_per_turn"
+DEFAULT_MAX_TOOL_ROUNDS = 5
+# Tool calls allowed over a whole conversation (all turns together)
+CONF_CONVERSATION_TOOL_CALL_BUDGET = "conversation_tool_call_budget"
+DEFAULT_CONVERSATION_TOOL_CALL_BUDGET = 30
+# Model round trips allowed over a whole conversation before tools are withheld
+CONF_CONVERSATION_ROUND_TRIP_BUDGET = "conversation_round_trip_budget"
+DEFAULT_CONVERSATION_ROUND_TRIP_BUDGET = 60
+# Hard cap on model round trips in one turn
+MAX_MODEL_ROUND_TRIPS = 10
 CONF_FUNCTIONS = "functions"
 DEFAULT_CONF_FUNCTIONS = [
     {
@@ -181,6 +195,17 @@ DEFAULT_USE_TOOLS = True
 # Truncation-related constants removed; ChatLog is source of truth for history
 
 SERVICE_QUERY_IMAGE = "query_image"
+SERVICE_DUMP_TRACES = "dump_traces"
+# Concurrent requests of a per-image query_image call
+DEFAULT_QUERY_IMAGE_CONCURRENCY = 4
+MAX_QUERY_IMAGE_CONCURRENCY = 16
+# Local images are downscaled to this longest edge (0 keeps the original) before upload
+DEFAULT_IMAGE_MAX_EDGE = 2048
+DEFAULT_IMAGE_QUALITY = 85
+# Seconds to wait for a camera frame
+CAMERA_IMAGE_TIMEOUT = 10
+# Differing bits of the 64-bit frame hash still treated as the same frame
+DEFAULT_FRAME_CHANGE_THRESHOLD = 6
 
 CONF_PAYLOAD_TEMPLATE = "payload_template"
 
@@ -223,6 +248,115 @@ DEFAULT_STREAM_ENABLED = True
 CONF_MCP_SERVERS = "mcp_servers"
 DEFAULT_MCP_SERVERS = ""
 
+# Local fast path for simple device commands (bypasses the model)
+CONF_LOCAL_INTENTS = "local_intents"
+DEFAULT_LOCAL_INTENTS = False
+
+# Answer cache for repeated read-only questions
+CONF_RESPONSE_CACHE = "response_cache"
+DEFAULT_RESPONSE_CACHE = False
+CONF_RESPONSE_CACHE_TTL = "response_cache_ttl"
+DEFAULT_RESPONSE_CACHE_TTL = 300
+
+# Seconds in which identical turns from one area share a single turn; 0 disables
+CONF_COALESCE_WINDOW = "coalesce_window"
+DEFAULT_COALESCE_WINDOW = 2.0
+
+# Hedged requests: a second request when the first shows no output in time
+CONF_HEDGE_REQUESTS = "hedge_requests"
+DEFAULT_HEDGE_REQUESTS = False
+CONF_HEDGE_DELAY = "hedge_delay"
+DEFAULT_HEDGE_DELAY = 2.0
+# Model of the hedged request; empty uses the chat model
+CONF_HEDGE_MODEL = "hedge_model"
+DEFAULT_HEDGE_MODEL = ""
+
+# Per-turn routing of model, reasoning, verbosity and output size
+CONF_ROUTING = "routing"
+DEFAULT_ROUTING = False
+CONF_ROUTING_TABLE = "routing_table"
+DEFAULT_ROUTING_TABLE = [
+    {
+        "name": "command",
+        "when": {"action": True, "max_words": 12},
+        "model": "gpt-5-mini",
+        "reasoning": "low",
+        "verbosity": "low",
+        "max_output_tokens": 300,
+    },
+    {
+        "name": "home_question",
+        "when": {"question": True, "tools": True, "max_words": 20},
+        "model": "gpt-5-mini",
+        "reasoning": "low",
+        "verbosity": "low",
+    },
+    {"name": "default"},
+]
+
+# HTTP connection to the OpenAI API
+CONF_HTTP2 = "http2"
+DEFAULT_HTTP2 = True
+CONF_HTTP_MAX_CONNECTIONS = "http_max_connections"
+DEFAULT_HTTP_MAX_CONNECTIONS = 10
+CONF_HTTP_KEEPALIVE_EXPIRY = "http_keepalive_expiry"
+DEFAULT_HTTP_KEEPALIVE_EXPIRY = 120
+CONF_HTTP_CONNECT_TIMEOUT = "http_connect_timeout"
+DEFAULT_HTTP_CONNECT_TIMEOUT = 5
+CONF_HTTP_READ_TIMEOUT = "http_read_timeout"
+DEFAULT_HTTP_READ_TIMEOUT = 60
+# Seconds of idle time after which a keep-warm request is sent (0 disables)
+CONF_KEEP_WARM_INTERVAL = "keep_warm_interval"
+DEFAULT_KEEP_WARM_INTERVAL = 60
+
+# Request scheduling: concurrent API requests per entry, and the circuit
+# breaker that fails requests fast after consecutive outage errors
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+CIRCUIT_BREAKER_THRESHOLD = 5
+CIRCUIT_BREAKER_COOLDOWN = 30
+
+# Turn deadline configuration (seconds)
+CONF_TURN_TIMEOUT = "turn_timeout"
+DEFAULT_TURN_TIMEOUT = 30
+CONF_TOOL_TIMEOUT = "tool_timeout"
+DEFAULT_TOOL_TIMEOUT = 10
+# Lower bound for the estimated cost of one model round trip
+MIN_MODEL_ROUND_TRIP = 1.5
+
+# Tool result size governor
+CONF_TOOL_RESULT_MAX_TOKENS = "tool_result_max_tokens"
+DEFAULT_TOOL_RESULT_MAX_TOKENS = 2000
+CONF_TOOL_RESULT_MAX_ITEMS = "tool_result_max_items"
+DEFAULT_TOOL_RESULT_MAX_ITEMS = 50
+DEFAULT_TOOL_RESULT_MAX_DEPTH = 6
+
+# Debug log of API requests and responses, written as JSON Lines segments
+CONF_API_LOG = "api_log"
+DEFAULT_API_LOG = False
+CONF_API_LOG_COMPRESSION = "api_log_compression"
+DEFAULT_API_LOG_COMPRESSION = "gzip"
+# Percentage of turns that are logged
+CONF_API_LOG_SAMPLE_RATE = "api_log_sample_rate"
+DEFAULT_API_LOG_SAMPLE_RATE = 100
+CONF_API_LOG_RETENTION_DAYS = "api_log_retention_days"
+DEFAULT_API_LOG_RETENTION_DAYS = 7
+# Megabytes of log segments kept
+CONF_API_LOG_MAX_SIZE = "api_log_max_size"
+DEFAULT_API_LOG_MAX_SIZE = 100
+
+# Recent turn traces kept in memory for the dump_traces service (0 turns tracing off)
+CONF_TRACE_BUFFER = "trace_buffer"
+DEFAULT_TRACE_BUFFER = 50
+MAX_TRACE_BUFFER = 500
+
+# Time the phases of every turn and keep their latency percentiles
+CONF_LATENCY_SPANS = "latency_spans"
+DEFAULT_LATENCY_SPANS = True
+# Sensors of turn latency, token usage, tool calls and queue depth
+CONF_PERFORMANCE_SENSORS = "performance_sensors"
+DEFAULT_PERFORMANCE_SENSORS = False
+
 # Entity exposure limits
 EXPOSED_ENTITIES_PROMPT_MAX = 500  # Maximum number of entities to include in prompt
 
@@ -231,3 +365,7 @@ EXPOSED_ENTITIES_PROMPT_MAX = 500  # Maximum number of entities to include in pr
 
 # hass.data key for agent, used by tests
 DATA_AGENT = "agent"
+# hass.data key of the model capability cache shared by all entries
+DATA_CAPABILITIES = f"{DOMAIN}_capabilities"
+# hass.data key of the API key validation cache shared by all entries
+DATA_CREDENTIALS = f"{DOMAIN}_credentials"
@@ -1,93 +1,125 @@
 from __future__ import annotations
 
+from contextlib import AbstractAsyncContextManager, nullcontext
 from typing import Any, Literal
 import json
 import logging
 import os
-from datetime import datetime
-from pathlib import Path
+import time
 
 from homeassistant.components import conversation
 from homeassistant.components.homeassistant.exposed_entities import (
+    async_listen_entity_updates,
     async_should_expose,
 )
 from homeassistant.components.conversation import AssistantContent
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import MATCH_ALL
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_STATE_CHANGED, MATCH_ALL
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
-from homeassistant.helpers import entity_registry as er, template
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+    template,
+)
 
 from openai import AsyncOpenAI
 from openai._exceptions import OpenAIError
 
 from .const import (
     DOMAIN,
+    CONF_BASE_URL,
     CONF_CHAT_MODEL,
+    CONF_COALESCE_WINDOW,
+    CONF_CONVERSATION_ROUND_TRIP_BUDGET,
+    CONF_CONVERSATION_TOOL_CALL_BUDGET,
+    CONF_ENABLE_CONVERSATION_EVENTS,
+    CONF_HEDGE_DELAY,
+    CONF_HEDGE_MODEL,
+    CONF_HEDGE_REQUESTS,
     CONF_HOUSE_CONTEXT,
+    CONF_LATENCY_SPANS,
+    CONF_LOCAL_INTENTS,
+    CONF_MAX_TOOL_ROUNDS,
     CONF_PROMPT,
+    CONF_RESPONSE_CACHE,
+    CONF_RESPONSE_CACHE_TTL,
+    CONF_ROUTING,
+    CONF_ROUTING_TABLE,
     CONF_STORE_CONVERSATIONS,
     CONF_SYSTEM_PROMPT,
+    CONF_TOOL_TIMEOUT,
+    CONF_TURN_TIMEOUT,
     DEFAULT_CHAT_MODEL,
+    DEFAULT_COALESCE_WINDOW,
+    DEFAULT_CONVERSATION_ROUND_TRIP_BUDGET,
+    DEFAULT_CONVERSATION_TOOL_CALL_BUDGET,
+    DEFAULT_ENABLE_CONVERSATION_EVENTS,
+    DEFAULT_HEDGE_DELAY,
+    DEFAULT_HEDGE_MODEL,
+    DEFAULT_HEDGE_REQUESTS,
     DEFAULT_HOUSE_CONTEXT,
+    DEFAULT_LATENCY_SPANS,
+    DEFAULT_LOCAL_INTENTS,
+    DEFAULT_MAX_TOOL_ROUNDS,
     DEFAULT_PROMPT,
+    DEFAULT_RESPONSE_CACHE,
+    DEFAULT_RESPONSE_CACHE_TTL,
+    DEFAULT_ROUTING,
     DEFAULT_STORE_CONVERSATIONS,
     DEFAULT_SYSTEM_PROMPT,
+    DEFAULT_TOOL_TIMEOUT,
+    DEFAULT_TURN_TIMEOUT,
+    DATA_CAPABILITIES,
+    EVENT_CONVERSATION_FINISHED,
+    EVENT_TOOL_BUDGET_EXHAUSTED,
     INTEGRATION_VERSION,
+    MAX_MODEL_ROUND_TRIPS,
+    MIN_MODEL_ROUND_TRIP,
+)
+from .api_log import TurnLog
+from .budget import ToolBudgetTracker, TurnToolBudget
+from .capabilities import MAX_CAPABILITY_RETRIES, CapabilityCache
+from .coalesce import TurnCoalescer
+from .deadline import TurnDeadline
+from .exceptions import CircuitOpen, SchedulerBusy, ToolTimeout, TurnTimeout
+from .hedging import HedgedStream, HedgePolicy, HedgeStats, async_hedge, hedge_kwargs, is_output_event
+from .keywords import detect_action
+from .local_intents import EntityIndex, confirmation, log_match, match_local_intent
+from .log_utils import lazy_json, lazy_preview, log_turn_summary
+from .response_cache import (
+    CacheKey,
+    ResponseCache,
+    entities_read,
+    log_lookup,
+    make_key,
+    mentioned_entities,
 )
+from .router import Route, RouterStats, TurnFeatures, choose_route
+from .scheduler import Priority
+from .spans import DISABLED_SPANS, TurnSpans
+from .tool_calls import TurnToolCalls
+from .tool_results import ResultLimits, wrap_tool_result
+from .traces import TurnTrace, ref
 
 _LOGGER = logging.getLogger(__name__)
 
 
-def _should_force_execute_services(text: str) -> bool:
+def _should_force_execute_services(text: str, language: str | None = None) -> bool:
     """Detect if user input contains action keywords that should trigger execute_services.
     
     Returns True if the user text contains command keywords like turn on/off, open, close, etc.
+    Keywords are matched on word boundaries using the tables in ``keywords/``; questions are
+    never treated as commands.
     """
     try:
-        t = (text or "").strip().lower()
-        if not t:
-            return False
-        
-        # Swedish and English action keywords
-        keywords = [
-            # Swedish
-            "släck", "tänd", "stäng av", "sätt på", "starta", "stoppa",
-            "dimma", "höj", "sänk", "aktivera", "deaktivera", "öppna", "stäng",
-            "sätt", "ställ in", "ändra", "justera", "pausa", "spela",
-            # English
-            "turn off", "turn on", "switch off", "switch on", "open", "close",
-            "start", "stop", "dim", "brighten", "raise", "lower", "activate",
-            "deactivate", "set", "adjust", "change", "pause", "play",
-        ]
-        
-        return any(k in t for k in keywords)
+        return detect_action(text, language).force
     except Exception as e:
         _LOGGER.debug("[v%s] Error detecting action keywords: %s", INTEGRATION_VERSION, e)
         return False
 
 
-def _save_api_log(hass: HomeAssistant, log_type: str, data: dict) -> None:
-    """Save API request/response to log file for debugging."""
-    try:
-        # Create logs directory in Home Assistant config directory
-        logs_dir = Path(hass.config.path("custom_components", "openai_conversation_plus", "logs"))
-        logs_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Create timestamped filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-        filename = f"{timestamp}_{log_type}.json"
-        filepath = logs_dir / filename
-        
-        # Save the data
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False, default=str)
-        
-        _LOGGER.info("[v%s] Saved %s log to: %s", INTEGRATION_VERSION, log_type, filepath)
-    except Exception as e:
-        _LOGGER.error("[v%s] Failed to save API log: %s", INTEGRATION_VERSION, e)
-
-
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -101,17 +133,94 @@ class OpenAIConversationEntity(
 ):
     # Enable streaming per HA pattern; we'll stream deltas when possible
     _attr_supports_streaming = True
+    # Tuning counters change on every turn; keep them out of the recorder
+    _unrecorded_attributes = frozenset(
+        {
+            "response_cache",
+            "coalescing",
+            "routing",
+            "hedging",
+            "api_log",
+            "traces",
+            "scheduler",
+            "connection",
+        }
+    )
 
     def __init__(self, entry: ConfigEntry) -> None:
         self.entry = entry
+        self._tool_budgets = ToolBudgetTracker()
+        self._response_cache = ResponseCache(
+            entry.options.get(CONF_RESPONSE_CACHE_TTL, DEFAULT_RESPONSE_CACHE_TTL)
+        )
+        self._hedge_stats = HedgeStats()
+        self._router_stats = RouterStats()
+        self._coalescer: TurnCoalescer[conversation.ConversationResult] = TurnCoalescer()
+        # Names of exposed entities and areas for local intents, per language
+        self._entity_indexes: dict[str, EntityIndex] = {}
 
     @property
     def supported_languages(self) -> list[str] | Literal["*"]:
         return MATCH_ALL
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Expose answer cache, coalescing, routing, hedging, API log, trace, scheduler and connection counters for tuning."""
+        attributes: dict[str, Any] = {}
+        if self.entry.options.get(CONF_RESPONSE_CACHE, DEFAULT_RESPONSE_CACHE):
+            attributes["response_cache"] = {
+                **self._response_cache.stats.as_dict(),
+                "size": len(self._response_cache),
+            }
+        if self._coalescer.stats.joined:
+            attributes["coalescing"] = self._coalescer.stats.as_dict()
+        if self._router_stats.routes:
+            attributes["routing"] = self._router_stats.as_dict()
+        if self._hedge_stats.requests:
+            attributes["hedging"] = self._hedge_stats.as_dict()
+        data = self.hass.data.get(DOMAIN, {}).get(self.entry.entry_id, {})
+        if data.get("api_log") is not None and data["api_log"].settings.enabled:
+            attributes["api_log"] = data["api_log"].stats.as_dict()
+        if data.get("traces") is not None and data["traces"].enabled:
+            attributes["traces"] = data["traces"].as_dict()
+        if data.get("scheduler") is not None:
+            attributes["scheduler"] = data["scheduler"].as_dict()
+        if data.get("http") is not None:
+            attributes["connection"] = data["http"].stats.as_dict()
+        return attributes or None
+
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
         conversation.async_set_agent(self.hass, self.entry, self)
+        self.async_on_remove(
+            self.hass.bus.async_listen(
+                EVENT_STATE_CHANGED,
+                self._async_invalidate_cached_answers,
+                event_filter=self._is_cached_entity_event,
+            )
+        )
+        for event_type in (er.EVENT_ENTITY_REGISTRY_UPDATED, ar.EVENT_AREA_REGISTRY_UPDATED):
+            self.async_on_remove(self.hass.bus.async_listen(event_type, self._async_drop_entity_indexes))
+        self.async_on_remove(
+            async_listen_entity_updates(self.hass, conversation.DOMAIN, self._async_drop_entity_indexes)
+        )
+
+    @callback
+    def _is_cached_entity_event(self, event_data: dict[str, Any]) -> bool:
+        """Return True if a state change affects a cached answer."""
+        return self._response_cache.tracks(event_data["entity_id"])
+
+    @callback
+    def _async_invalidate_cached_answers(self, event: Event) -> None:
+        """Drop cached answers that depend on a changed entity."""
+        entity_id = event.data["entity_id"]
+        dropped = self._response_cache.invalidate_entity(entity_id)
+        _LOGGER.debug("[v%s] %s changed, dropped %d cached answer(s)", INTEGRATION_VERSION, entity_id, dropped)
+
+    @callback
+    def _async_drop_entity_indexes(self, _event: Event | None = None) -> None:
+        """Rebuild the local intent names after entities, areas or exposure changed."""
+        self._entity_indexes.clear()
 
     async def async_will_remove_from_hass(self) -> None:
         conversation.async_unset_agent(self.hass, self.entry)
@@ -122,8 +231,107 @@ class OpenAIConversationEntity(
         user_input: conversation.ConversationInput,
         chat_log: conversation.ChatLog,
     ) -> conversation.ConversationResult:
+        trace = self._start_trace(user_input, chat_log)
+        spans = self._start_spans()
+        try:
+            result = await self._async_coalesce_turn(user_input, chat_log, trace, spans)
+        except Exception as err:
+            if trace is not None:
+                trace.outcome = "error"
+                trace.add_error(err)
+            raise
+        finally:
+            latency = self._finish_turn(trace, spans)
+
+        if self.entry.options.get(CONF_ENABLE_CONVERSATION_EVENTS, DEFAULT_ENABLE_CONVERSATION_EVENTS):
+            self.hass.bus.async_fire(
+                EVENT_CONVERSATION_FINISHED,
+                {
+                    "agent_id": user_input.agent_id,
+                    "conversation_id": result.conversation_id,
+                    "response": result.response.as_dict(),
+                    "latency_ms": latency,
+                },
+            )
+        return result
+
+    async def _async_coalesce_turn(
+        self,
+        user_input: conversation.ConversationInput,
+        chat_log: conversation.ChatLog,
+        trace: TurnTrace | None,
+        spans: TurnSpans,
+    ) -> conversation.ConversationResult:
+        # Satellites in one area that heard the same command share one turn
+        window = float(self.entry.options.get(CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW))
+        area_id = self._device_area_id(user_input.device_id) if window > 0 else None
+        if not area_id or not self._is_first_user_turn(chat_log):
+            return await self._async_handle_turn(user_input, chat_log, trace, spans)
+
+        result, shared = await self._coalescer.run(
+            make_key(user_input.text, user_input.language, area_id),
+            window,
+            lambda: self._async_handle_turn(user_input, chat_log, trace, spans),
+        )
+        if not shared:
+            return result
+        if trace is not None:
+            trace.outcome = "coalesced"
+        speech = result.response.speech.get("plain", {}).get("speech", "")
+        chat_log.async_add_assistant_content_without_tools(
+            AssistantContent(agent_id=user_input.agent_id, content=speech)
+        )
+        return conversation.async_get_result_from_chat_log(user_input, chat_log)
+
+    async def _async_handle_turn(
+        self,
+        user_input: conversation.ConversationInput,
+        chat_log: conversation.ChatLog,
+        trace: TurnTrace | None = None,
+        spans: TurnSpans = DISABLED_SPANS,
+    ) -> conversation.ConversationResult:
+        turn_started = time.monotonic()
         opts = self.entry.options
         client: AsyncOpenAI = self.entry.runtime_data  # type: ignore[attr-defined]
+        deadline = TurnDeadline(
+            opts.get(CONF_TURN_TIMEOUT, DEFAULT_TURN_TIMEOUT),
+            opts.get(CONF_TOOL_TIMEOUT, DEFAULT_TOOL_TIMEOUT),
+            MIN_MODEL_ROUND_TRIP,
+        )
+        conversation_id = getattr(user_input, "conversation_id", None) or getattr(chat_log, "conversation_id", None)
+        budget = self._tool_budgets.start_turn(
+            conversation_id,
+            opts.get(CONF_MAX_TOOL_ROUNDS, DEFAULT_MAX_TOOL_ROUNDS),
+            opts.get(CONF_CONVERSATION_TOOL_CALL_BUDGET, DEFAULT_CONVERSATION_TOOL_CALL_BUDGET),
+            opts.get(CONF_CONVERSATION_ROUND_TRIP_BUDGET, DEFAULT_CONVERSATION_ROUND_TRIP_BUDGET),
+        )
+
+        # Simple, unambiguous device commands are executed without the model
+        if opts.get(CONF_LOCAL_INTENTS, DEFAULT_LOCAL_INTENTS):
+            local_result = await self._async_try_local_intent(user_input, chat_log)
+            if local_result is not None:
+                if trace is not None:
+                    trace.outcome = "local_intent"
+                return local_result
+
+        # Repeated read-only questions are answered from the cache
+        cache_key: CacheKey | None = None
+        if opts.get(CONF_RESPONSE_CACHE, DEFAULT_RESPONSE_CACHE):
+            self._response_cache.ttl = float(opts.get(CONF_RESPONSE_CACHE_TTL, DEFAULT_RESPONSE_CACHE_TTL))
+            if self._is_first_user_turn(chat_log) and not detect_action(user_input.text, user_input.language).force:
+                cache_key = make_key(user_input.text, user_input.language, self._device_area_id(user_input.device_id))
+                cached = self._response_cache.get(cache_key)
+                log_lookup(cache_key, cached, self._response_cache.stats)
+                if cached is not None:
+                    if trace is not None:
+                        trace.outcome = "cache"
+                    chat_log.async_add_assistant_content_without_tools(
+                        AssistantContent(agent_id=user_input.agent_id, content=cached.answer)
+                    )
+                    return conversation.async_get_result_from_chat_log(user_input, chat_log)
+        elif len(self._response_cache):
+            self._response_cache.clear()
+        turn_calls = TurnToolCalls(self._tool_is_read_only)
 
         # Provide LLM context and tools from HA to the model
         system_prompt_template = (
@@ -141,6 +349,7 @@ class OpenAIConversationEntity(
 
         try:
             # Render the prompt template without entities
+            started = spans.start()
             template_context = {
                 "ha_name": self.hass.config.location_name or "Home",
                 "current_device_id": getattr(user_input, "device_id", None),
@@ -161,16 +370,19 @@ class OpenAIConversationEntity(
                 parse_result=False,
                 strict=False,
             )
+            spans.end("render_prompt", started)
             
             # For new conversations (empty chat log), append entities directly
             # This avoids template size limits and ensures entities are always included
             is_new_conversation = len(chat_log.content) == 0
-            _LOGGER.info("[v%s] Conversation state: new=%s, chat_log_length=%d", 
+            _LOGGER.debug("[v%s] Conversation state: new=%s, chat_log_length=%d", 
                         INTEGRATION_VERSION, is_new_conversation, len(chat_log.content))
             
             if is_new_conversation:
+                started = spans.start()
                 exposed = self._get_exposed_entities()
-                _LOGGER.info("[v%s] Fetched %d exposed entities for new conversation", 
+                spans.end("exposed_entities", started)
+                _LOGGER.debug("[v%s] Fetched %d exposed entities for new conversation", 
                             INTEGRATION_VERSION, len(exposed) if exposed else 0)
                 
                 if exposed:
@@ -179,7 +391,7 @@ class OpenAIConversationEntity(
                     limited_exposed = exposed[:EXPOSED_ENTITIES_PROMPT_MAX]
                     entities_json = json.dumps(limited_exposed, ensure_ascii=False)
                     rendered_house_context = f"{rendered_house_context}\n\nAvailable entities:\n{entities_json}"
-                    _LOGGER.info(
+                    _LOGGER.debug(
                         "[v%s] Appended %d entities to developer prompt (limited from %d)",
                         INTEGRATION_VERSION,
                         len(limited_exposed),
@@ -188,16 +400,22 @@ class OpenAIConversationEntity(
                 else:
                     _LOGGER.warning("[v%s] No exposed entities found for conversation", INTEGRATION_VERSION)
             
+            started = spans.start()
             await chat_log.async_provide_llm_data(
                 user_input.as_llm_context(DOMAIN),
                 opts.get("llm_hass_api"),
                 rendered_system_prompt,
                 user_input.extra_system_prompt,
             )
+            spans.end("llm_api", started)
         except conversation.ConverseError as err:
+            if trace is not None:
+                trace.outcome = "error"
+                trace.add_error(err)
             return err.as_conversation_result()
 
         # Convert HA LLM API tools to Responses API tools
+        started = spans.start()
         tools: list[dict[str, Any]] | None = None
         if chat_log.llm_api:
             tools = []
@@ -228,7 +446,7 @@ class OpenAIConversationEntity(
         from . import get_functions_from_options
         user_functions = get_functions_from_options(opts)
         
-        _LOGGER.info(
+        _LOGGER.debug(
             "[v%s] Loading user-defined functions from options: %d found",
             INTEGRATION_VERSION,
             len(user_functions) if user_functions else 0
@@ -276,7 +494,7 @@ class OpenAIConversationEntity(
                         "parameters": params
                     }
                     tools.append(tool)
-                    _LOGGER.info(
+                    _LOGGER.debug(
                         "[v%s]   - Added function: %s",
                         INTEGRATION_VERSION,
                         func_spec.get("name")
@@ -289,11 +507,12 @@ class OpenAIConversationEntity(
             if tools is None:
                 tools = []
             tools.extend(mcp_tools)
-            _LOGGER.info(
+            _LOGGER.debug(
                 "[v%s] Added %d MCP tools to conversation",
                 INTEGRATION_VERSION,
                 len(mcp_tools)
             )
+        spans.end("build_tools", started)
 
         # Build Responses API input from chat log
         # Use the flat message format per Responses API spec
@@ -357,7 +576,7 @@ class OpenAIConversationEntity(
                 last_user_text = text or last_user_text
             
         msgs = base_messages + msgs
-        _LOGGER.info("[v%s] Built %d messages from chat log (including %d base prompts)", INTEGRATION_VERSION, len(msgs), len(base_messages))
+        _LOGGER.debug("[v%s] Built %d messages from chat log (including %d base prompts)", INTEGRATION_VERSION, len(msgs), len(base_messages))
 
         # Prepare minimal retry payload (user text only) in case we must re-issue the request
         conversation_items: list[dict[str, str]] = []
@@ -368,8 +587,9 @@ class OpenAIConversationEntity(
             _LOGGER.warning("[v%s] No user text available for retry payload; forcing empty input", INTEGRATION_VERSION)
             conversation_items.append({"role": "user", "content": ""})
 
-        model = opts.get(CONF_CHAT_MODEL, DEFAULT_CHAT_MODEL)
-        max_tokens = opts.get("max_tokens", 150)
+        route = self._route_turn(user_input) if opts.get(CONF_ROUTING, DEFAULT_ROUTING) else None
+        model = (route and route.model) or opts.get(CONF_CHAT_MODEL, DEFAULT_CHAT_MODEL)
+        max_tokens = (route and route.max_output_tokens) or opts.get("max_tokens", 150)
         
         kwargs: dict[str, Any] = {
             "model": model,
@@ -382,8 +602,8 @@ class OpenAIConversationEntity(
         # Add reasoning and verbosity for GPT-5 models
         from .const import GPT5_MODELS, VERBOSITY_COMPAT_MAP
         if model in GPT5_MODELS:
-            reasoning_level = opts.get("reasoning_level", "medium")
-            verbosity = opts.get("verbosity", "medium")
+            reasoning_level = (route and route.reasoning) or opts.get("reasoning_level", "medium")
+            verbosity = (route and route.verbosity) or opts.get("verbosity", "medium")
             # Map legacy verbosity values
             mapped_verbosity = VERBOSITY_COMPAT_MAP.get(verbosity, verbosity)
             
@@ -392,7 +612,7 @@ class OpenAIConversationEntity(
                 "verbosity": mapped_verbosity,
                 "format": {"type": "text"}
             }
-            _LOGGER.info(
+            _LOGGER.debug(
                 "[v%s] GPT-5 settings: reasoning=%s, verbosity=%s",
                 INTEGRATION_VERSION,
                 reasoning_level,
@@ -423,11 +643,11 @@ class OpenAIConversationEntity(
                     user_input_text = last_msg.get("content", "")
             
             # Check if we should force execute_services tool
-            should_force = has_execute_services and _should_force_execute_services(user_input_text)
+            should_force = has_execute_services and _should_force_execute_services(user_input_text, user_input.language)
             
             if should_force:
                 kwargs["tool_choice"] = {"type": "function", "function": {"name": "execute_services"}}
-                _LOGGER.info(
+                _LOGGER.debug(
                     "[v%s] Detected action command in user input, forcing tool_choice to execute_services",
                     INTEGRATION_VERSION
                 )
@@ -438,7 +658,7 @@ class OpenAIConversationEntity(
             from .const import CONF_STREAM_ENABLED, DEFAULT_STREAM_ENABLED
             stream_enabled = opts.get(CONF_STREAM_ENABLED, DEFAULT_STREAM_ENABLED)
             kwargs["stream"] = bool(stream_enabled)
-            _LOGGER.info(
+            _LOGGER.debug(
                 "[v%s] Sending %d tools to OpenAI (stream=%s, tool_choice=%s)",
                 INTEGRATION_VERSION,
                 len(tools),
@@ -454,7 +674,7 @@ class OpenAIConversationEntity(
             )
 
         # Enhanced final logging before sending to OpenAI
-        _LOGGER.info(
+        _LOGGER.debug(
             "[v%s] Final kwargs summary - model=%s, stream=%s, parallel_tool_calls=%s, tools=%d, tool_choice=%s",
             INTEGRATION_VERSION,
             kwargs.get("model"),
@@ -463,20 +683,44 @@ class OpenAIConversationEntity(
             len(kwargs.get("tools", [])),
             kwargs.get("tool_choice", "none")
         )
-        _LOGGER.debug("[v%s] Complete kwargs being sent to Responses API: %s", INTEGRATION_VERSION, json.dumps(kwargs, default=str))
+        _LOGGER.debug("[v%s] Complete kwargs being sent to Responses API: %s", INTEGRATION_VERSION, lazy_json(kwargs))
         
-        # Save API request to log file for debugging
-        _save_api_log(self.hass, "request", {
-            "timestamp": datetime.now().isoformat(),
-            "kwargs": kwargs,
-            "tools_count": len(kwargs.get("tools", [])),
-            "messages_count": len(msgs),
-            "has_llm_api": chat_log.llm_api is not None,
-        })
+        # Queue the API request for the debug log
+        turn_log = self._start_api_log_turn()
+        if turn_log is not None:
+            turn_log.write("request", {
+                "kwargs": dict(kwargs),
+                "tools_count": len(kwargs.get("tools", [])),
+                "messages_count": len(msgs),
+                "has_llm_api": chat_log.llm_api is not None,
+            })
         
-        # Use streaming only if enabled
-        use_streaming = kwargs.get("stream", True)
+        if budget.shape_request(kwargs):
+            _LOGGER.debug("[v%s] Tool budget already spent for this conversation, requesting text-only answer", INTEGRATION_VERSION)
+
+        # Leave out what this endpoint is known to reject instead of retrying every turn
+        capabilities = self._capabilities()
+        capability_key = CapabilityCache.key(self.entry.data.get(CONF_BASE_URL), model)
+        capabilities.shape(capability_key, kwargs)
+
+        # Use streaming only if enabled and accepted by the endpoint
+        use_streaming = kwargs.get("stream", True) and capabilities.get(capability_key).streaming
+        hedge_policy = self._hedge_policy()
+        if trace is not None:
+            trace.request = {
+                "model": model,
+                "route": route.name if route is not None else None,
+                "stream": bool(use_streaming),
+                "tools": len(kwargs.get("tools", [])),
+                "tool_choice": kwargs.get("tool_choice", "none") if isinstance(kwargs.get("tool_choice"), str) else "forced",
+                "messages": len(msgs),
+            }
+            trace.input = msgs
+            if turn_log is not None:
+                trace.refs["api_log"] = turn_log.turn_id
+        spans.add("prepare", (time.monotonic() - turn_started) * 1000)
         
+        stream_started = spans.start()
         try:
             # Create a delta stream in the chat log
             stream_obj = getattr(chat_log, "async_add_delta_content_stream", None)
@@ -490,10 +734,15 @@ class OpenAIConversationEntity(
                     if stream_ctx is None:
                         raise RuntimeError("Responses streaming not available")
 
-                    async with client.responses.stream(**kwargs) as resp_stream:
+                    async with deadline.limit_request(), self._request_slot(), HedgedStream(
+                        client.responses.stream, kwargs, hedge_policy, self._hedge_stats
+                    ) as resp_stream:
                         pending_tool_calls: dict[str, dict[str, Any]] = {}  # Track by item_id
+                        first_byte: float | None = None
                         
                         async for event in resp_stream:
+                            if first_byte is None and is_output_event(event):
+                                first_byte = spans.end("ttfb", stream_started)
                             etype = getattr(event, "type", "")
                             _LOGGER.debug("[v%s] Streaming event: %s", INTEGRATION_VERSION, etype)
                             
@@ -537,77 +786,51 @@ class OpenAIConversationEntity(
                                     
                                     tool_name = tool_call["name"]
                                     
-                                    if tool_name:
-                                        _LOGGER.info("[v%s] Executing streaming tool call: %s", INTEGRATION_VERSION, tool_name)
+                                    if tool_name and not budget.allow_call():
+                                        _LOGGER.debug("[v%s] Tool budget exhausted, skipping streaming tool call: %s", INTEGRATION_VERSION, tool_name)
+                                    elif tool_name:
+                                        _LOGGER.debug("[v%s] Executing streaming tool call: %s", INTEGRATION_VERSION, tool_name)
                                         
                                         try:
                                             args = json.loads(tool_call["arguments"])
                                         except json.JSONDecodeError:
                                             args = {}
                                         
-                                        # Find and execute the tool
-                                        from . import get_functions_from_options
-                                        functions = get_functions_from_options(opts)
-                                        fn_def = next((f for f in functions if f["spec"]["name"] == tool_name), None)
-                                        
-                                        if fn_def:
-                                            try:
-                                                from .helpers import get_function_executor
-                                                executor = get_function_executor(fn_def["function"]["type"])
-                                                result = await executor.execute(
-                                                    self.hass,
-                                                    fn_def["function"],
-                                                    args,
-                                                    user_input,
-                                                    self._get_exposed_entities(),
-                                                )
-                                                _LOGGER.info("[v%s] Executed streaming tool: %s - result: %s", INTEGRATION_VERSION, tool_name, str(result)[:100])
-                                            except Exception as e:
-                                                _LOGGER.error("[v%s] Failed to execute streaming tool %s: %s", INTEGRATION_VERSION, tool_name, e)
-                                        else:
-                                            # Check if it's a Home Assistant LLM API tool
-                                            if chat_log.llm_api:
-                                                try:
-                                                    from homeassistant.helpers import llm
-                                                    tool_input = llm.ToolInput(
-                                                        tool_name=tool_name,
-                                                        tool_args=args,
-                                                        platform=DOMAIN,
-                                                        context=user_input.context,
-                                                        user_prompt=user_input.text,
-                                                        language=user_input.language,
-                                                        assistant=conversation.DOMAIN,
-                                                        device_id=user_input.device_id,
-                                                    )
-                                                    result = await chat_log.llm_api.async_call_tool(tool_input)
-                                                    _LOGGER.info("[v%s] Executed streaming HA LLM API tool: %s", INTEGRATION_VERSION, tool_name)
-                                                except Exception as e:
-                                                    _LOGGER.error("[v%s] Failed to execute streaming HA LLM API tool %s: %s", INTEGRATION_VERSION, tool_name, e)
-                                            else:
-                                                _LOGGER.warning("[v%s] No matching tool found for streaming call: %s", INTEGRATION_VERSION, tool_name)
+                                        result_data = await self._async_call_tool(
+                                            tool_name, args, user_input, chat_log, deadline, turn_calls, trace, spans
+                                        )
+                                        _LOGGER.debug("[v%s] Executed streaming tool: %s - result: %s", INTEGRATION_VERSION, tool_name, lazy_preview(result_data))
                         # Final response
                         final = await resp_stream.get_final_response()
+                        budget.record_round_trip()
+                        spans.end("stream", first_byte or stream_started)
+                        if trace is not None:
+                            trace.add_response(final)
+                        if budget.tool_calls:
+                            budget.finish_round()
+                        if budget.denied_calls:
+                            self._report_tool_budget_exhausted(conversation_id, budget)
                         
-                        # Save streaming response to log file
-                        _save_api_log(self.hass, "streaming_response", {
-                            "timestamp": datetime.now().isoformat(),
-                            "response": {
-                                "id": getattr(final, "id", None),
-                                "model": getattr(final, "model", None),
-                        "output": [
-                            {
-                                "type": getattr(item, "type", None),
-                                "id": getattr(item, "id", None),
-                                "content": getattr(item, "content", None) if getattr(item, "type", "") == "message" else None,
-                                "name": getattr(item, "name", None) if getattr(item, "type", "") == "tool" else None,
-                                "arguments": getattr(item, "arguments", None) if getattr(item, "type", "") == "tool" else None,
-                            }
-                            for item in (final.output if hasattr(final, "output") else [])
-                        ],
-                                "usage": getattr(final, "usage", None),
-                            },
-                            "pending_tool_calls": pending_tool_calls,
-                        })
+                        # Queue the streaming response for the debug log
+                        if turn_log is not None:
+                            turn_log.write("streaming_response", {
+                                "response": {
+                                    "id": getattr(final, "id", None),
+                                    "model": getattr(final, "model", None),
+                                    "output": [
+                                        {
+                                            "type": getattr(item, "type", None),
+                                            "id": getattr(item, "id", None),
+                                            "content": getattr(item, "content", None) if getattr(item, "type", "") == "message" else None,
+                                            "name": getattr(item, "name", None) if getattr(item, "type", "") == "tool" else None,
+                                            "arguments": getattr(item, "arguments", None) if getattr(item, "type", "") == "tool" else None,
+                                        }
+                                        for item in (final.output if hasattr(final, "output") else [])
+                                    ],
+                                    "usage": getattr(final, "usage", None),
+                                },
+                                "pending_tool_calls": pending_tool_calls,
+                            })
                         
                         # Parse streaming final response using same logic as non-streaming
                         out = ""
@@ -635,64 +858,79 @@ class OpenAIConversationEntity(
                         await delta_stream.async_end()
             else:
                 raise RuntimeError("ChatLog delta stream not available")
+        except (CircuitOpen, SchedulerBusy, TurnTimeout):
+            # A non-streaming retry would be refused the same way, or has no time left
+            raise
         except Exception as stream_error:
             _LOGGER.warning("[v%s] Streaming failed: %s, falling back to non-streaming", INTEGRATION_VERSION, stream_error)
-            # Non-streaming fallback with function execution loop
-            max_iterations = 10
+            spans.end("stream_failed", stream_started)
+            if trace is not None:
+                trace.add_error(stream_error)
+                trace.fallbacks.append("non_streaming")
+            capabilities.learn(capability_key, kwargs, stream_error)
+            # Non-streaming fallback with function execution loop: one round trip per
+            # tool round, plus the forced execute_services retry and the final answer
+            max_iterations = min(MAX_MODEL_ROUND_TRIPS, budget.max_tool_rounds + 2)
             
             # Reuse the same logic for forcing execute_services
             has_execute_services = any((
                 isinstance(tool, dict) and tool.get("type") == "function" and tool.get("name") == "execute_services"
             ) for tool in (tools or []))
-            want_force = has_execute_services and _should_force_execute_services(last_user_text)
+            want_force = has_execute_services and _should_force_execute_services(last_user_text, user_input.language)
             forced_once = False
             
+            loop_started = spans.start()
             for iteration in range(max_iterations):
                 _LOGGER.debug("[v%s] Non-streaming iteration %d/%d", INTEGRATION_VERSION, iteration + 1, max_iterations)
+                if iteration and not deadline.can_afford_round_trip():
+                    _LOGGER.warning(
+                        "[v%s] Turn budget nearly spent (%.1fs left), skipping iteration %d",
+                        INTEGRATION_VERSION,
+                        deadline.remaining,
+                        iteration + 1,
+                    )
+                    break
                 
                 kwargs.pop("stream", None)
                 kwargs["stream"] = False
 
                 if isinstance(kwargs.get("tool_choice"), dict):
                     kwargs.pop("tool_choice", None)
+                # Budget spent: this round trip must produce the final answer
+                budget.shape_request(kwargs)
 
-                try:
-                    final = await client.responses.create(**kwargs)
-                except TypeError:
-                    # Remove potentially unsupported fields just in case
-                    kwargs.pop("response_format", None)
-                    kwargs.pop("text", None)
-                    kwargs.pop("reasoning", None)
-                    final = await client.responses.create(**kwargs)
-                except OpenAIError as e:
-                    if "tools" in str(e):
-                        # Retry without tools if the provider rejects tool schema
-                        kwargs.pop("tools", None)
-                        kwargs.pop("tool_choice", None)
-                        final = await client.responses.create(**kwargs)
-                    else:
-                        raise
+                round_trip_started = time.monotonic()
+                # Tools may have been restored for the forced execute_services retry
+                capabilities.shape(capability_key, kwargs)
+                final = await deadline.run_request(
+                    self._async_send_request(client, kwargs, hedge_policy, capabilities, capability_key)
+                )
+                deadline.record_round_trip(time.monotonic() - round_trip_started)
+                budget.record_round_trip()
+                spans.add("model", (time.monotonic() - round_trip_started) * 1000)
+                if trace is not None:
+                    trace.add_response(final)
                 
-                # Save non-streaming response to log file
-                _save_api_log(self.hass, f"non_streaming_response_iter_{iteration + 1}", {
-                    "timestamp": datetime.now().isoformat(),
-                    "iteration": iteration + 1,
-                    "response": {
-                        "id": getattr(final, "id", None),
-                        "model": getattr(final, "model", None),
-                        "output": [
-                            {
-                                "type": getattr(item, "type", None),
-                                "id": getattr(item, "id", None),
-                                "content": getattr(item, "content", None) if getattr(item, "type", "") == "message" else None,
-                                "name": getattr(item, "name", None) if getattr(item, "type", "") == "tool" else None,
-                                "arguments": getattr(item, "arguments", None) if getattr(item, "type", "") == "tool" else None,
-                            }
-                            for item in (final.output if hasattr(final, "output") else [])
-                        ],
-                        "usage": getattr(final, "usage", None),
-                    },
-                })
+                # Queue the non-streaming response for the debug log
+                if turn_log is not None:
+                    turn_log.write(f"non_streaming_response_iter_{iteration + 1}", {
+                        "iteration": iteration + 1,
+                        "response": {
+                            "id": getattr(final, "id", None),
+                            "model": getattr(final, "model", None),
+                            "output": [
+                                {
+                                    "type": getattr(item, "type", None),
+                                    "id": getattr(item, "id", None),
+                                    "content": getattr(item, "content", None) if getattr(item, "type", "") == "message" else None,
+                                    "name": getattr(item, "name", None) if getattr(item, "type", "") == "tool" else None,
+                                    "arguments": getattr(item, "arguments", None) if getattr(item, "type", "") == "tool" else None,
+                                }
+                                for item in (final.output if hasattr(final, "output") else [])
+                            ],
+                            "usage": getattr(final, "usage", None),
+                        },
+                    })
                 
                 # Extract tool calls from response.output
                 tool_calls = []
@@ -703,8 +941,8 @@ class OpenAIConversationEntity(
                 
                 if not tool_calls:
                     # Optional fallback: force the execute_services tool once for imperative requests
-                    if want_force and not forced_once:
-                        _LOGGER.info("[v%s] No tool calls returned; forcing tool_choice to execute_services and retrying", INTEGRATION_VERSION)
+                    if want_force and not forced_once and not budget.exhausted:
+                        _LOGGER.debug("[v%s] No tool calls returned; forcing tool_choice to execute_services and retrying", INTEGRATION_VERSION)
                         kwargs.pop("tools", None)
                         # Reconstruct tools into kwargs in case they were removed earlier on retry
                         if tools is not None:
@@ -722,21 +960,26 @@ class OpenAIConversationEntity(
                     _LOGGER.debug("[v%s] No tool calls in iteration %d, finishing", INTEGRATION_VERSION, iteration + 1)
                     break
                 
+                if budget.exhausted and kwargs.get("tool_choice") == "none":
+                    # The model still asked for tools after the final text-only request
+                    _LOGGER.warning("[v%s] Model requested tools after the tool budget was spent, finishing", INTEGRATION_VERSION)
+                    break
+
                 # Execute all tool calls and collect outputs
-                _LOGGER.info("[v%s] Executing %d tool calls in iteration %d", INTEGRATION_VERSION, len(tool_calls), iteration + 1)
+                _LOGGER.debug("[v%s] Executing %d tool calls in iteration %d", INTEGRATION_VERSION, len(tool_calls), iteration + 1)
                 
-                # Save tool calls to log
-                _save_api_log(self.hass, f"tool_calls_iter_{iteration + 1}", {
-                    "timestamp": datetime.now().isoformat(),
-                    "iteration": iteration + 1,
-                    "tool_calls": [
-                        {
-                            "name": getattr(tc, "name", None),
-                            "arguments": getattr(tc, "arguments", None),
-                        }
-                        for tc in tool_calls
-                    ],
-                })
+                # Queue the tool calls for the debug log
+                if turn_log is not None:
+                    turn_log.write(f"tool_calls_iter_{iteration + 1}", {
+                        "iteration": iteration + 1,
+                        "tool_calls": [
+                            {
+                                "name": getattr(tc, "name", None),
+                                "arguments": getattr(tc, "arguments", None),
+                            }
+                            for tc in tool_calls
+                        ],
+                    })
                 
                 tool_results = []
                 
@@ -749,55 +992,19 @@ class OpenAIConversationEntity(
                             _LOGGER.warning("[v%s] Invalid tool call: missing name", INTEGRATION_VERSION)
                             continue
                         
-                        _LOGGER.info("[v%s] Executing tool: %s", INTEGRATION_VERSION, tool_name)
-                        
                         try:
                             arguments = json.loads(arguments_str)
                         except json.JSONDecodeError:
                             arguments = {}
                         
-                        # Find and execute the matching function
-                        from . import get_functions_from_options
-                        functions = get_functions_from_options(opts)
-                        matching_func = next((f for f in functions if f["spec"]["name"] == tool_name), None)
-                        
-                        if matching_func:
-                            from .helpers import get_function_executor
-                            executor = get_function_executor(matching_func["function"]["type"])
-                            result = await executor.execute(
-                                self.hass,
-                                matching_func["function"],
-                                arguments,
-                                user_input,
-                                self._get_exposed_entities(),
+                        if budget.allow_call():
+                            _LOGGER.debug("[v%s] Executing tool: %s", INTEGRATION_VERSION, tool_name)
+                            result_data = await self._async_call_tool(
+                                tool_name, arguments, user_input, chat_log, deadline, turn_calls, trace, spans
                             )
-                            # Wrap result in proper structure
-                            result_data = {"ok": True, "result": result} if not isinstance(result, dict) else result
-                            _LOGGER.info("[v%s] Tool %s executed successfully", INTEGRATION_VERSION, tool_name)
                         else:
-                            # Check if it's a Home Assistant LLM API tool
-                            if chat_log.llm_api:
-                                try:
-                                    from homeassistant.helpers import llm
-                                    tool_input = llm.ToolInput(
-                                        tool_name=tool_name,
-                                        tool_args=arguments,
-                                        platform=DOMAIN,
-                                        context=user_input.context,
-                                        user_prompt=user_input.text,
-                                        language=user_input.language,
-                                        assistant=conversation.DOMAIN,
-                                        device_id=user_input.device_id,
-                                    )
-                                    result = await chat_log.llm_api.async_call_tool(tool_input)
-                                    result_data = {"ok": True, "result": result}
-                                    _LOGGER.info("[v%s] HA LLM API tool %s executed successfully", INTEGRATION_VERSION, tool_name)
-                                except Exception as e:
-                                    _LOGGER.error("[v%s] Failed to execute HA LLM API tool %s: %s", INTEGRATION_VERSION, tool_name, e)
-                                    result_data = {"ok": False, "error": str(e)}
-                            else:
-                                _LOGGER.warning("[v%s] No matching tool found for: %s", INTEGRATION_VERSION, tool_name)
-                                result_data = {"ok": False, "error": f"Unknown tool: {tool_name}"}
+                            _LOGGER.debug("[v%s] Tool budget exhausted, not executing: %s", INTEGRATION_VERSION, tool_name)
+                            result_data = {"ok": False, "error": "tool call budget exhausted; answer with the information you have"}
                         
                         # Add tool result in Responses API format
                         tool_results.append({
@@ -819,18 +1026,23 @@ class OpenAIConversationEntity(
                     # No results to send back, break to avoid infinite loop
                     break
                 
-                # Save tool results to log
-                _save_api_log(self.hass, f"tool_results_iter_{iteration + 1}", {
-                    "timestamp": datetime.now().isoformat(),
-                    "iteration": iteration + 1,
-                    "tool_results": tool_results,
-                })
+                # Queue the tool results for the debug log
+                if turn_log is not None:
+                    turn_log.write(f"tool_results_iter_{iteration + 1}", {
+                        "iteration": iteration + 1,
+                        "tool_results": tool_results,
+                    })
                 
                 # Per Responses API spec: send ONLY tool results as next input
                 # The API maintains conversation state internally
                 kwargs["input"] = tool_results
+
+                budget.finish_round()
+                if budget.exhausted:
+                    self._report_tool_budget_exhausted(conversation_id, budget)
                 
                 _LOGGER.debug("[v%s] Continuing loop with %d tool results", INTEGRATION_VERSION, len(tool_results))
+            spans.end("fallback_loop", loop_started)
             
             # Parse final response text
             out = ""
@@ -855,14 +1067,18 @@ class OpenAIConversationEntity(
                 out = ""
         
         # Fallback: If the model returned JSON in output_text, try to parse and execute
-        if out and (out.strip().startswith("[") or out.strip().startswith("{")):
+        json_fallback = bool(out) and (out.strip().startswith("[") or out.strip().startswith("{"))
+        if json_fallback:
+            fallback_started = spans.start()
+            if trace is not None:
+                trace.fallbacks.append("json")
             _LOGGER.warning(
                 "[v%s] Model returned JSON in text instead of tool call - activating fallback parsing",
                 INTEGRATION_VERSION
             )
             try:
                 payload = json.loads(out)
-                _LOGGER.info(
+                _LOGGER.debug(
                     "[v%s] Successfully parsed JSON from output_text: type=%s",
                     INTEGRATION_VERSION,
                     type(payload).__name__
@@ -870,7 +1086,7 @@ class OpenAIConversationEntity(
                 
                 # Handle array format: [{"domain":"light","service":"turn_on",...}]
                 if isinstance(payload, list):
-                    _LOGGER.info(
+                    _LOGGER.debug(
                         "[v%s] Fallback: Processing array format with %d service calls",
                         INTEGRATION_VERSION,
                         len(payload)
@@ -920,7 +1136,7 @@ class OpenAIConversationEntity(
                                     self._get_exposed_entities(),
                                 )
                                 results.append(f"Executed {item['domain']}.{item['service']}")
-                                _LOGGER.info(
+                                _LOGGER.debug(
                                     "[v%s] Fallback: Successfully executed service #%d: %s.%s",
                                     INTEGRATION_VERSION,
                                     idx + 1,
@@ -945,7 +1161,7 @@ class OpenAIConversationEntity(
                     
                     if results:
                         out = "Utfört."
-                        _LOGGER.info(
+                        _LOGGER.debug(
                             "[v%s] Fallback: Completed %d service calls with %d successes",
                             INTEGRATION_VERSION,
                             len(payload),
@@ -957,7 +1173,7 @@ class OpenAIConversationEntity(
                     # Check for both "actions" and "calls" keys (different formats from OpenAI)
                     actions_list = payload.get("actions") or payload.get("calls", [])
                     if payload.get("type") == "execute_services" and isinstance(actions_list, list):
-                        _LOGGER.info(
+                        _LOGGER.debug(
                             "[v%s] Fallback: Processing execute_services object format with %d actions",
                             INTEGRATION_VERSION,
                             len(actions_list)
@@ -1029,7 +1245,7 @@ class OpenAIConversationEntity(
                                     self._get_exposed_entities(),
                                 )
                                 out = "Utfört."
-                                _LOGGER.info(
+                                _LOGGER.debug(
                                     "[v%s] Fallback: Successfully executed %d services from object format",
                                     INTEGRATION_VERSION,
                                     len(norm["execute_services"]["list"])
@@ -1069,6 +1285,21 @@ class OpenAIConversationEntity(
                     exc_info=True
                 )
                 # Keep original output on error
+            spans.end("json_fallback", fallback_started)
+
+        if (
+            cache_key is not None
+            and out
+            and not json_fallback
+            and not budget.denied_calls
+            and not deadline.timed_out_tools
+        ):
+            self._cache_answer(cache_key, out, turn_calls)
+
+        if route is not None:
+            elapsed_ms = (time.monotonic() - turn_started) * 1000
+            self._router_stats.record(route.name, elapsed_ms)
+            _LOGGER.debug("[v%s] Route %s (%s) answered in %.0f ms", INTEGRATION_VERSION, route.name, model, elapsed_ms)
 
         # Append the assistant message (final text) and return
         chat_log.async_add_assistant_content_without_tools(
@@ -1076,6 +1307,328 @@ class OpenAIConversationEntity(
         )
         return conversation.async_get_result_from_chat_log(user_input, chat_log)
 
+    async def _async_try_local_intent(
+        self,
+        user_input: conversation.ConversationInput,
+        chat_log: conversation.ChatLog,
+    ) -> conversation.ConversationResult | None:
+        """Execute a simple command locally; return None to fall through to the model."""
+        match = match_local_intent(user_input.text, self._entity_index(user_input.language))
+        log_match(user_input.text, match)
+        if match is None or not self.hass.services.has_service(match.domain, match.service):
+            return None
+        exposed = self._get_exposed_entities()
+
+        from .helpers import get_function_executor
+        executor = get_function_executor("native")
+        try:
+            results = await executor.execute(
+                self.hass,
+                {"type": "native", "name": "execute_service"},
+                match.as_service_call(),
+                user_input,
+                exposed,
+            )
+        except Exception as err:
+            _LOGGER.warning("[v%s] Local intent failed, falling back to model: %s", INTEGRATION_VERSION, err)
+            return None
+        if any(isinstance(r, dict) and r.get("error") for r in results):
+            _LOGGER.warning("[v%s] Local intent returned errors, falling back to model: %s", INTEGRATION_VERSION, results)
+            return None
+
+        chat_log.async_add_assistant_content_without_tools(
+            AssistantContent(agent_id=user_input.agent_id, content=confirmation(user_input.language))
+        )
+        return conversation.async_get_result_from_chat_log(user_input, chat_log)
+
+    def _entity_index(self, language: str | None) -> EntityIndex:
+        """Return the names of the exposed entities and areas, built once per language."""
+        key = (language or "").lower()
+        index = self._entity_indexes.get(key)
+        if index is None:
+            index = EntityIndex(language)
+            for entity in self._get_exposed_entities():
+                index.add_entity(entity["entity_id"], [entity["name"], *entity["aliases"]])
+            for area in ar.async_get(self.hass).async_list_areas():
+                index.add_area(area.id, [area.name, *(getattr(area, "aliases", None) or [])])
+            self._entity_indexes[key] = index
+        return index
+
+    def _route_turn(self, user_input: conversation.ConversationInput) -> Route:
+        """Choose the request settings of a turn from the routing table."""
+        text = user_input.text or ""
+        mentions_entity = bool(mentioned_entities([text], self._get_exposed_entities()))
+        features = TurnFeatures.from_text(text, user_input.language, mentions_entity)
+        route = choose_route(self.entry.options.get(CONF_ROUTING_TABLE) or "", features)
+        _LOGGER.debug(
+            "[v%s] Routed turn to %s: model=%s, reasoning=%s, verbosity=%s, max_output_tokens=%s, features=%s",
+            INTEGRATION_VERSION,
+            route.name,
+            route.model or "configured",
+            route.reasoning or "configured",
+            route.verbosity or "configured",
+            route.max_output_tokens or "configured",
+            features.as_dict(),
+        )
+        return route
+
+    def _capabilities(self) -> CapabilityCache:
+        """Return the shared capability cache, or a throwaway one before it is loaded."""
+        return self.hass.data.get(DATA_CAPABILITIES) or CapabilityCache()
+
+    async def _async_send_request(
+        self,
+        client: AsyncOpenAI,
+        kwargs: dict[str, Any],
+        hedge_policy: HedgePolicy | None,
+        capabilities: CapabilityCache,
+        capability_key: tuple[str, str],
+    ) -> Any:
+        """Send a non-streaming request, retrying without what the endpoint rejects."""
+        for _ in range(MAX_CAPABILITY_RETRIES):
+            try:
+                async with self._request_slot():
+                    return await self._async_create_response(client, kwargs, hedge_policy)
+            except (TypeError, OpenAIError) as err:
+                if not capabilities.learn(capability_key, kwargs, err):
+                    raise
+        async with self._request_slot():
+            return await self._async_create_response(client, kwargs, hedge_policy)
+
+    def _start_trace(
+        self, user_input: conversation.ConversationInput, chat_log: conversation.ChatLog
+    ) -> TurnTrace | None:
+        """Return the trace of this turn, or None if no trace, sensor or INFO log needs it."""
+        data = self.hass.data.get(DOMAIN, {}).get(self.entry.entry_id, {})
+        traces = data.get("traces")
+        if (
+            data.get("metrics") is None
+            and (traces is None or not traces.enabled)
+            and not _LOGGER.isEnabledFor(logging.INFO)
+        ):
+            return None
+        return TurnTrace(getattr(user_input, "conversation_id", None) or getattr(chat_log, "conversation_id", None))
+
+    def _start_spans(self) -> TurnSpans:
+        """Return the latency spans of this turn, doing nothing if spans and the performance sensors are off."""
+        if not self.entry.options.get(CONF_LATENCY_SPANS, DEFAULT_LATENCY_SPANS):
+            # The latency sensors are fed from the spans
+            data = self.hass.data.get(DOMAIN, {}).get(self.entry.entry_id, {})
+            if data.get("metrics") is None:
+                return DISABLED_SPANS
+        return TurnSpans()
+
+    def _finish_turn(self, trace: TurnTrace | None, spans: TurnSpans) -> dict[str, float]:
+        """Count the phase latencies and metrics of a finished turn, keep and log its trace and return the latencies."""
+        latency = spans.finish()
+        data = self.hass.data.get(DOMAIN, {}).get(self.entry.entry_id, {})
+        if latency and data.get("latency") is not None:
+            data["latency"].record(latency)
+        if trace is not None:
+            trace.timings = latency
+            if data.get("traces") is not None:
+                data["traces"].add(trace)
+            if data.get("metrics") is not None:
+                data["metrics"].record(trace)
+            log_turn_summary(_LOGGER, trace)
+        return latency
+
+    def _start_api_log_turn(self) -> TurnLog | None:
+        """Return the debug log of this turn, or None if the turn is not logged."""
+        api_log = self.hass.data.get(DOMAIN, {}).get(self.entry.entry_id, {}).get("api_log")
+        return api_log.start_turn() if api_log is not None else None
+
+    def _request_slot(self) -> AbstractAsyncContextManager[None]:
+        """Return the scheduler slot a conversation request is sent in."""
+        scheduler = self.hass.data.get(DOMAIN, {}).get(self.entry.entry_id, {}).get("scheduler")
+        if scheduler is None:
+            return nullcontext()
+        return scheduler.slot(Priority.INTERACTIVE)
+
+    def _hedge_policy(self) -> HedgePolicy | None:
+        """Return the hedging policy from the options, or None when disabled."""
+        opts = self.entry.options
+        if not opts.get(CONF_HEDGE_REQUESTS, DEFAULT_HEDGE_REQUESTS):
+            return None
+        return HedgePolicy(
+            float(opts.get(CONF_HEDGE_DELAY, DEFAULT_HEDGE_DELAY)),
+            (opts.get(CONF_HEDGE_MODEL, DEFAULT_HEDGE_MODEL) or "").strip() or None,
+        )
+
+    async def _async_create_response(
+        self, client: AsyncOpenAI, kwargs: dict[str, Any], hedge_policy: HedgePolicy | None
+    ) -> Any:
+        """Send a non-streaming request, hedged if a policy is given."""
+        if hedge_policy is None:
+            return await client.responses.create(**kwargs)
+        return await async_hedge(
+            lambda: client.responses.create(**kwargs),
+            lambda: client.responses.create(**hedge_kwargs(kwargs, hedge_policy.model)),
+            hedge_policy,
+            self._hedge_stats,
+        )
+
+    @staticmethod
+    def _is_first_user_turn(chat_log: conversation.ChatLog) -> bool:
+        """Return True if the chat log holds no earlier user messages."""
+        return sum(1 for c in chat_log.content if getattr(c, "role", None) == "user") <= 1
+
+    def _device_area_id(self, device_id: str | None) -> str | None:
+        """Return the area of the device the request came from."""
+        if not device_id:
+            return None
+        device = dr.async_get(self.hass).async_get(device_id)
+        return device.area_id if device else None
+
+    def _cache_answer(
+        self,
+        key: CacheKey,
+        answer: str,
+        turn_calls: TurnToolCalls,
+    ) -> None:
+        """Cache the answer of a turn that only read named entities."""
+        from . import get_functions_from_options
+        from .helpers import is_read_only_tool
+
+        functions = get_functions_from_options(self.entry.options)
+        for call in turn_calls.records:
+            if not call.ok or not is_read_only_tool(call.name, functions):
+                _LOGGER.debug("[v%s] Not caching answer: %s %s", INTEGRATION_VERSION, call.name, "failed" if not call.ok else "may change state")
+                return
+
+        entity_ids = entities_read(turn_calls.records)
+        if entity_ids is None:
+            _LOGGER.debug("[v%s] Not caching answer for %r: the entities it depends on are not known", INTEGRATION_VERSION, key[0])
+            return
+        entity_ids = {e for e in entity_ids if self.hass.states.get(e) is not None}
+        if self._response_cache.put(key, answer, entity_ids, [call.name for call in turn_calls.records]):
+            _LOGGER.debug("[v%s] Cached answer for %r, depends on %s", INTEGRATION_VERSION, key[0], sorted(entity_ids))
+        else:
+            _LOGGER.debug("[v%s] Not caching answer for %r: no entities to track", INTEGRATION_VERSION, key[0])
+
+    def _report_tool_budget_exhausted(self, conversation_id: str | None, budget: TurnToolBudget) -> None:
+        """Log and announce that a turn ran out of tool budget."""
+        runaway = self._tool_budgets.report_exhausted(conversation_id, budget)
+        self.hass.bus.async_fire(
+            EVENT_TOOL_BUDGET_EXHAUSTED,
+            {
+                "conversation_id": conversation_id,
+                "tool_rounds": budget.tool_rounds,
+                "tool_calls": budget.tool_calls,
+                "denied_calls": budget.denied_calls,
+                "conversation_tool_calls": budget.usage.tool_calls,
+                "conversation_round_trips": budget.usage.round_trips,
+                "exhaustions": budget.usage.exhaustions,
+                "runaway": runaway,
+            },
+        )
+
+    async def _async_call_tool(
+        self,
+        tool_name: str,
+        arguments: dict[str, Any],
+        user_input: conversation.ConversationInput,
+        chat_log: conversation.ChatLog,
+        deadline: TurnDeadline,
+        turn_calls: TurnToolCalls | None = None,
+        trace: TurnTrace | None = None,
+        spans: TurnSpans = DISABLED_SPANS,
+    ) -> dict[str, Any]:
+        """Execute one tool call within the turn deadline and return its result payload.
+
+        Read-only calls repeating an earlier one since the last state change,
+        and state-changing calls repeating the last one, are not executed again.
+        """
+        started = time.monotonic()
+        # Referenced before running, as executors may add to the arguments
+        arguments_ref = ref(arguments) if trace is not None else None
+        if turn_calls is None:
+            result = await self._async_run_tool(tool_name, arguments, user_input, chat_log, deadline)
+        else:
+            key = turn_calls.key(tool_name, arguments)
+            result = turn_calls.reuse(key)
+            if result is None:
+                result = await self._async_run_tool(tool_name, arguments, user_input, chat_log, deadline)
+                turn_calls.record(key, tool_name, arguments, result)
+
+        elapsed_ms = (time.monotonic() - started) * 1000
+        spans.add("tools", elapsed_ms)
+        if trace is not None:
+            trace.add_tool_call(tool_name, arguments_ref, result, elapsed_ms)
+        return result
+
+    def _tool_is_read_only(self, tool_name: str) -> bool:
+        """Return True if a tool the model may call only reads state."""
+        from . import get_functions_from_options
+        from .helpers import is_read_only_tool
+
+        return is_read_only_tool(tool_name, get_functions_from_options(self.entry.options))
+
+    async def _async_run_tool(
+        self,
+        tool_name: str,
+        arguments: dict[str, Any],
+        user_input: conversation.ConversationInput,
+        chat_log: conversation.ChatLog,
+        deadline: TurnDeadline,
+    ) -> dict[str, Any]:
+        """Run a tool and build the payload sent back to the model."""
+        from . import get_functions_from_options
+        functions = get_functions_from_options(self.entry.options)
+        matching_func = next((f for f in functions if f["spec"]["name"] == tool_name), None)
+
+        try:
+            if matching_func:
+                from .helpers import get_function_executor
+                executor = get_function_executor(matching_func["function"]["type"])
+                result = await deadline.run_tool(
+                    tool_name,
+                    executor.execute(
+                        self.hass,
+                        matching_func["function"],
+                        arguments,
+                        user_input,
+                        self._get_exposed_entities(),
+                    ),
+                    matching_func.get("timeout"),
+                )
+                _LOGGER.debug("[v%s] Tool %s executed successfully", INTEGRATION_VERSION, tool_name)
+                # Wrap result in proper structure, trimmed to the configured size
+                return wrap_tool_result(
+                    tool_name, result, ResultLimits.from_options(self.entry.options, matching_func)
+                )
+
+            # Check if it's a Home Assistant LLM API tool
+            if chat_log.llm_api:
+                from homeassistant.helpers import llm
+                tool_input = llm.ToolInput(
+                    tool_name=tool_name,
+                    tool_args=arguments,
+                    platform=DOMAIN,
+                    context=user_input.context,
+                    user_prompt=user_input.text,
+                    language=user_input.language,
+                    assistant=conversation.DOMAIN,
+                    device_id=user_input.device_id,
+                )
+                result = await deadline.run_tool(
+                    tool_name, chat_log.llm_api.async_call_tool(tool_input)
+                )
+                _LOGGER.debug("[v%s] HA LLM API tool %s executed successfully", INTEGRATION_VERSION, tool_name)
+                return wrap_tool_result(
+                    tool_name,
+                    {"ok": True, "result": result},
+                    ResultLimits.from_options(self.entry.options),
+                )
+        except ToolTimeout as err:
+            return {"ok": False, "error": "timeout", "message": str(err)}
+        except Exception as e:
+            _LOGGER.error("[v%s] Failed to execute tool %s: %s", INTEGRATION_VERSION, tool_name, e)
+            return {"ok": False, "error": str(e)}
+
+        _LOGGER.warning("[v%s] No matching tool found for: %s", INTEGRATION_VERSION, tool_name)
+        return {"ok": False, "error": f"Unknown tool: {tool_name}"}
+
     def _get_exposed_entities(self) -> list[dict[str, Any]]:
         try:
             entry_id = getattr(self.entry, "entry_id", None)
@@ -1084,7 +1637,7 @@ class OpenAIConversationEntity(
                 s for s in all_states if async_should_expose(self.hass, entry_id, s.entity_id)
             ]
             if not states:
-                _LOGGER.info(
+                _LOGGER.debug(
                     "[v%s] No entities exposed for conversation agent; falling back to all (%d)",
                     INTEGRATION_VERSION,
                     len(all_states),
@@ -1107,7 +1660,7 @@ class OpenAIConversationEntity(
                     )
                 except Exception:  # noqa: BLE001
                     continue
-            _LOGGER.info(
+            _LOGGER.debug(
                 "[v%s] Exposed entities prepared for conversation: %d / %d",
                 INTEGRATION_VERSION,
                 len(states),
@@ -0,0 +1,153 @@
+"""API key validation in the background, cached between restarts.
+
+Setting up an entry no longer waits for a request to the API. The key is
+validated after setup, at most once per validity period, and a rejected key
+raises a repair issue instead of failing the setup.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_API_KEY
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import issue_registry as ir
+from homeassistant.helpers.storage import Store
+from openai import AsyncOpenAI
+from openai._exceptions import AuthenticationError
+
+from . import helpers
+from .const import (
+    CONF_API_VERSION,
+    CONF_BASE_URL,
+    CONF_ORGANIZATION,
+    CONF_SKIP_AUTHENTICATION,
+    DEFAULT_SKIP_AUTHENTICATION,
+    DOMAIN,
+    INTEGRATION_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.credentials"
+STORAGE_VERSION = 1
+# Seconds to batch validation results before writing them
+SAVE_DELAY = 10
+# Seconds a successful validation is trusted
+VALIDATION_TTL = 24 * 3600
+
+ISSUE_INVALID_API_KEY = "invalid_api_key"
+
+
+def key_hash(api_key: str, base_url: str | None) -> str:
+    """Return the hash a validated key and endpoint are stored under."""
+    return hashlib.sha256(f"{(base_url or '').rstrip('/')}\n{api_key}".encode()).hexdigest()
+
+
+def issue_id(entry: ConfigEntry) -> str:
+    """Return the id of the invalid key repair issue of an entry."""
+    return f"{ISSUE_INVALID_API_KEY}_{entry.entry_id}"
+
+
+class ValidationCache:
+    """When each key was last accepted, by key hash; keys themselves are not stored."""
+
+    def __init__(
+        self,
+        store: Store | None = None,
+        data: dict[str, Any] | None = None,
+        ttl: float = VALIDATION_TTL,
+    ) -> None:
+        """Initialize the cache from stored data."""
+        self._store = store
+        self.ttl = ttl
+        self._validated: dict[str, float] = dict((data or {}).get("validated", {}))
+
+    def is_valid(self, key: str, now: float | None = None) -> bool:
+        """Return True if the key was accepted within the validity period."""
+        now = time.time() if now is None else now
+        validated = self._validated.get(key)
+        return validated is not None and 0 <= now - validated < self.ttl
+
+    def remember(self, key: str, now: float | None = None) -> None:
+        """Record that the key was accepted."""
+        self._validated[key] = time.time() if now is None else now
+        self._async_schedule_save()
+
+    def forget(self, key: str) -> None:
+        """Drop the key, so it is validated again at the next setup."""
+        if self._validated.pop(key, None) is not None:
+            self._async_schedule_save()
+
+    def as_data(self) -> dict[str, Any]:
+        """Return the data to store."""
+        return {"validated": dict(self._validated)}
+
+    def _async_schedule_save(self) -> None:
+        if self._store is not None:
+            self._store.async_delay_save(self.as_data, SAVE_DELAY)
+
+
+async def async_load_validation_cache(hass: HomeAssistant) -> ValidationCache:
+    """Load the validations done before the last restart."""
+    store: Store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+    return ValidationCache(store, await store.async_load())
+
+
+async def async_validate_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    cache: ValidationCache,
+    client: AsyncOpenAI | None = None,
+) -> bool | None:
+    """Validate the API key of an entry unless it was accepted recently.
+
+    Returns True if the key is valid, False if it was rejected and None if
+    it could not be checked. A rejected key raises a repair issue, which is
+    removed again once the key is accepted.
+    """
+    if entry.data.get(CONF_SKIP_AUTHENTICATION, DEFAULT_SKIP_AUTHENTICATION):
+        return None
+    key = key_hash(entry.data[CONF_API_KEY], entry.data.get(CONF_BASE_URL))
+    if cache.is_valid(key):
+        _LOGGER.debug("[v%s] API key was validated recently, not checking it again", INTEGRATION_VERSION)
+        return True
+
+    try:
+        await helpers.validate_authentication(
+            hass=hass,
+            api_key=entry.data[CONF_API_KEY],
+            base_url=entry.data.get(CONF_BASE_URL),
+            api_version=entry.data.get(CONF_API_VERSION),
+            organization=entry.data.get(CONF_ORGANIZATION),
+            client=client,
+        )
+    except AuthenticationError as err:
+        _LOGGER.error("[v%s] Invalid API key: %s", INTEGRATION_VERSION, err)
+        cache.forget(key)
+        ir.async_create_issue(
+            hass,
+            DOMAIN,
+            issue_id(entry),
+            is_fixable=False,
+            severity=ir.IssueSeverity.ERROR,
+            translation_key=ISSUE_INVALID_API_KEY,
+            translation_placeholders={"title": entry.title},
+        )
+        return False
+    except Exception as err:
+        _LOGGER.warning(
+            "[v%s] Could not validate the API key, trying again at the next start: %s",
+            INTEGRATION_VERSION,
+            err,
+        )
+        return None
+
+    cache.remember(key)
+    ir.async_delete_issue(hass, DOMAIN, issue_id(entry))
+    _LOGGER.debug("[v%s] API key validated", INTEGRATION_VERSION)
+    return True
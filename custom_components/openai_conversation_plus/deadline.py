@@ -0,0 +1,113 @@
+"""Per-turn deadline tracking for OpenAI Conversation Plus."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator, Awaitable
+from contextlib import asynccontextmanager
+from typing import Any
+
+from .const import INTEGRATION_VERSION
+from .exceptions import ToolTimeout, TurnTimeout
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TurnDeadline:
+    """Track the time budget of a single conversation turn.
+
+    The deadline caps how long model requests and tool executors may run
+    and decides whether another model round trip still fits in the
+    remaining budget. Round trip
+    cost is estimated from the slowest round trip observed during the turn,
+    never lower than ``min_round_trip``.
+    """
+
+    def __init__(
+        self,
+        budget: float,
+        default_tool_timeout: float,
+        min_round_trip: float,
+    ) -> None:
+        """Initialize the deadline."""
+        self.budget = float(budget)
+        self.default_tool_timeout = float(default_tool_timeout)
+        self.min_round_trip = float(min_round_trip)
+        self._started = time.monotonic()
+        self._round_trip_estimate = self.min_round_trip
+        self.timed_out_tools: list[str] = []
+
+    @property
+    def elapsed(self) -> float:
+        """Return seconds spent in the turn so far."""
+        return time.monotonic() - self._started
+
+    @property
+    def remaining(self) -> float:
+        """Return seconds left in the turn budget (never negative)."""
+        return max(0.0, self.budget - self.elapsed)
+
+    @property
+    def expired(self) -> bool:
+        """Return True if the turn budget is spent."""
+        return self.remaining <= 0
+
+    def record_round_trip(self, duration: float) -> None:
+        """Record the duration of a model round trip."""
+        self._round_trip_estimate = max(self._round_trip_estimate, duration)
+
+    def can_afford_round_trip(self) -> bool:
+        """Return True if another model round trip fits in the budget."""
+        return self.remaining >= self._round_trip_estimate
+
+    def tool_timeout(self, declared: float | None = None) -> float:
+        """Return the timeout for a tool call, capped by the remaining budget."""
+        timeout = self.default_tool_timeout if declared is None else float(declared)
+        return max(0.0, min(timeout, self.remaining))
+
+    async def run_tool(
+        self, tool_name: str, awaitable: Awaitable[Any], declared: float | None = None
+    ) -> Any:
+        """Await a tool executor, cancelling it when it runs past its timeout."""
+        timeout = self.tool_timeout(declared)
+        try:
+            return await asyncio.wait_for(awaitable, timeout=timeout)
+        except asyncio.TimeoutError as err:
+            self.timed_out_tools.append(tool_name)
+            _LOGGER.warning(
+                "[v%s] Tool %s cancelled after %.1fs (turn remaining: %.1fs)",
+                INTEGRATION_VERSION,
+                tool_name,
+                timeout,
+                self.remaining,
+            )
+            raise ToolTimeout(tool_name, timeout) from err
+
+    async def run_request(self, awaitable: Awaitable[Any]) -> Any:
+        """Await a model request, cancelling it when the turn budget runs out."""
+        timeout = self.remaining
+        try:
+            return await asyncio.wait_for(awaitable, timeout=timeout)
+        except asyncio.TimeoutError as err:
+            raise self._request_timed_out(timeout) from err
+
+    @asynccontextmanager
+    async def limit_request(self) -> AsyncIterator[None]:
+        """Bound a streamed model request, tools run during the stream included, by the turn budget."""
+        timeout = self.remaining
+        try:
+            async with asyncio.timeout(timeout):
+                yield
+        except asyncio.TimeoutError as err:
+            raise self._request_timed_out(timeout) from err
+
+    def _request_timed_out(self, timeout: float) -> TurnTimeout:
+        _LOGGER.warning(
+            "[v%s] Model request cancelled after %.1fs, turn budget of %.1fs spent",
+            INTEGRATION_VERSION,
+            timeout,
+            self.budget,
+        )
+        return TurnTimeout(timeout)
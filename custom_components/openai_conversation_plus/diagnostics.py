@@ -0,0 +1,35 @@
+"""Diagnostics support for OpenAI Conversation Plus."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_API_KEY
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_FUNCTIONS, CONF_MCP_SERVERS, CONF_USER_LOCATION, DOMAIN, INTEGRATION_VERSION
+
+# Functions may hold REST headers, passwords and bearer tokens; diagnostics end up in public issues
+TO_REDACT = {CONF_API_KEY, CONF_FUNCTIONS, CONF_MCP_SERVERS, CONF_USER_LOCATION}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return the options, turn latency percentiles and request counters of an entry."""
+    data = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
+    diagnostics: dict[str, Any] = {
+        "version": INTEGRATION_VERSION,
+        "options": async_redact_data(dict(entry.options), TO_REDACT),
+    }
+    if data.get("latency") is not None:
+        diagnostics["latency"] = data["latency"].as_dict()
+    if data.get("traces") is not None:
+        diagnostics["traces"] = data["traces"].as_dict()
+    if data.get("api_log") is not None:
+        diagnostics["api_log"] = data["api_log"].stats.as_dict()
+    if data.get("scheduler") is not None:
+        diagnostics["scheduler"] = data["scheduler"].as_dict()
+    if data.get("http") is not None:
+        diagnostics["connection"] = data["http"].stats.as_dict()
+    return diagnostics
@@ -133,3 +133,69 @@ class InvalidFunction(HomeAssistantError):
     def __str__(self) -> str:
         """Return string representation."""
         return f"failed to validate function `{self.function_name}` ({self.__cause__})"
+
+
+class ToolTimeout(HomeAssistantError):
+    """When a tool call did not finish within its time limit."""
+
+    def __init__(self, tool_name: str, timeout: float) -> None:
+        """Initialize error."""
+        super().__init__(
+            self,
+            f"tool `{tool_name}` timed out after {timeout:.1f}s",
+        )
+        self.tool_name = tool_name
+        self.timeout = timeout
+
+    def __str__(self) -> str:
+        """Return string representation."""
+        return f"tool `{self.tool_name}` timed out after {self.timeout:.1f}s"
+
+
+class TurnTimeout(HomeAssistantError):
+    """When a model request did not finish within the turn's time budget."""
+
+    def __init__(self, timeout: float) -> None:
+        """Initialize error."""
+        super().__init__(
+            self,
+            f"model request timed out after {timeout:.1f}s",
+        )
+        self.timeout = timeout
+
+    def __str__(self) -> str:
+        """Return string representation."""
+        return f"no answer from the model within the turn's time budget ({self.timeout:.1f}s)"
+
+
+class SchedulerBusy(HomeAssistantError):
+    """When the request queue of a priority class is full."""
+
+    def __init__(self, priority: str, queued: int) -> None:
+        """Initialize error."""
+        super().__init__(
+            self,
+            f"too many queued {priority} requests ({queued})",
+        )
+        self.priority = priority
+        self.queued = queued
+
+    def __str__(self) -> str:
+        """Return string representation."""
+        return f"too many queued {self.priority} requests ({self.queued}), try again later"
+
+
+class CircuitOpen(HomeAssistantError):
+    """When requests fail fast because the API is failing."""
+
+    def __init__(self, retry_in: float) -> None:
+        """Initialize error."""
+        super().__init__(
+            self,
+            f"OpenAI API unavailable, retrying in {retry_in:.0f}s",
+        )
+        self.retry_in = retry_in
+
+    def __str__(self) -> str:
+        """Return string representation."""
+        return f"OpenAI API is failing, not sending requests for {self.retry_in:.0f}s"
@@ -0,0 +1,108 @@
+"""Skip vision requests for frames that have not changed.
+
+The hash of every analysed frame is kept with the answer it got. When the
+same sources are queried again with the same prompt and model and every
+new frame is within a few bits of the analysed one, the previous answer is
+returned instead of calling the API.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from .images import hash_distance
+
+# Distinct source, prompt and model combinations remembered
+MAX_GATED_QUERIES = 128
+# Sources whose skip counters are kept
+MAX_GATED_SOURCES = 256
+
+GateKey = tuple[str, str, tuple[str, ...]]
+
+
+@dataclass
+class SourceStats:
+    """How often queries of one source were skipped."""
+
+    checks: int = 0
+    skips: int = 0
+
+    @property
+    def skip_rate(self) -> float:
+        """Return the share of checks answered from the last analysis."""
+        return self.skips / self.checks if self.checks else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters for service responses."""
+        return {"checks": self.checks, "skips": self.skips, "skip_rate": round(self.skip_rate, 3)}
+
+
+@dataclass
+class _Analysed:
+    fingerprints: tuple[int, ...]
+    result: dict[str, Any]
+
+
+class FrameGate:
+    """Answers of the last analysed frames, keyed on sources, prompt and model."""
+
+    def __init__(self, max_entries: int = MAX_GATED_QUERIES, max_sources: int = MAX_GATED_SOURCES) -> None:
+        """Initialize the gate."""
+        self.max_entries = max_entries
+        self.max_sources = max_sources
+        self.sources: OrderedDict[str, SourceStats] = OrderedDict()
+        self._analysed: OrderedDict[GateKey, _Analysed] = OrderedDict()
+
+    @staticmethod
+    def key(model: str, prompt: str, sources: Sequence[str]) -> GateKey:
+        """Return the key of a query."""
+        return (model, prompt, tuple(sources))
+
+    def check(
+        self,
+        key: GateKey,
+        fingerprints: Sequence[int | None],
+        threshold: int,
+    ) -> tuple[dict[str, Any], int] | None:
+        """Return the previous answer and the largest distance if no frame changed.
+
+        Sources without a fingerprint, such as remote URLs, are never skipped.
+        """
+        analysed = self._analysed.get(key)
+        distance: int | None = None
+        if (
+            analysed is not None
+            and None not in fingerprints
+            and len(fingerprints) == len(analysed.fingerprints)
+        ):
+            distance = max(
+                hash_distance(new, old) for new, old in zip(fingerprints, analysed.fingerprints)
+            )
+        skipped = distance is not None and distance <= threshold
+        for source in key[2]:
+            stats = self.sources.setdefault(source, SourceStats())
+            self.sources.move_to_end(source)
+            stats.checks += 1
+            stats.skips += skipped
+        while len(self.sources) > self.max_sources:
+            self.sources.popitem(last=False)
+        if not skipped:
+            return None
+        self._analysed.move_to_end(key)
+        return analysed.result, distance
+
+    def remember(self, key: GateKey, fingerprints: Sequence[int | None], result: dict[str, Any]) -> None:
+        """Store the answer of an analysed frame; sources without a fingerprint are not stored."""
+        if None in fingerprints:
+            return
+        self._analysed[key] = _Analysed(tuple(fingerprints), result)
+        self._analysed.move_to_end(key)
+        while len(self._analysed) > self.max_entries:
+            self._analysed.popitem(last=False)
+
+    def stats(self, sources: Sequence[str]) -> dict[str, Any]:
+        """Return the skip counters of the given sources."""
+        return {source: self.sources[source].as_dict() for source in sources if source in self.sources}
@@ -0,0 +1,256 @@
+"""Hedged model requests.
+
+When a request has produced no output after a delay a second, identical
+request is sent, optionally to a faster model. Whichever produces output
+first is used and the other is cancelled, which closes its connection so
+the API stops generating for it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from .const import GPT5_MODELS, INTEGRATION_VERSION
+
+_LOGGER = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Stream events sent before the model produces anything
+_PRELUDE_EVENTS = frozenset({"response.created", "response.in_progress", "response.queued"})
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """When to send a hedged request and to which model."""
+
+    delay: float
+    model: str | None = None
+
+
+@dataclass
+class HedgeStats:
+    """How often hedged requests were sent and won."""
+
+    requests: int = 0
+    fired: int = 0
+    won: int = 0
+
+    @property
+    def fire_rate(self) -> float:
+        """Return the share of requests that needed a hedged request."""
+        return self.fired / self.requests if self.requests else 0.0
+
+    @property
+    def win_rate(self) -> float:
+        """Return the share of hedged requests that answered first."""
+        return self.won / self.fired if self.fired else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters for diagnostics."""
+        return {
+            "requests": self.requests,
+            "fired": self.fired,
+            "won": self.won,
+            "fire_rate": round(self.fire_rate, 3),
+            "win_rate": round(self.win_rate, 3),
+        }
+
+
+def hedge_kwargs(kwargs: dict[str, Any], model: str | None) -> dict[str, Any]:
+    """Return request arguments for the hedged request.
+
+    Reasoning and verbosity are dropped when the hedge model does not
+    support them.
+    """
+    hedged = dict(kwargs)
+    if not model or model == kwargs.get("model"):
+        return hedged
+    hedged["model"] = model
+    if model not in GPT5_MODELS:
+        hedged.pop("reasoning", None)
+        text = hedged.get("text")
+        if isinstance(text, dict) and "verbosity" in text:
+            hedged["text"] = {key: value for key, value in text.items() if key != "verbosity"}
+    return hedged
+
+
+def is_output_event(event: Any) -> bool:
+    """Return True for a stream event that carries model output."""
+    etype = getattr(event, "type", "")
+    if etype in _PRELUDE_EVENTS or etype.startswith("response.reasoning"):
+        return False
+    if etype in ("response.output_item.added", "response.output_item.done"):
+        # Reasoning models announce their reasoning item long before any output
+        return getattr(getattr(event, "item", None), "type", "") != "reasoning"
+    return True
+
+
+async def async_hedge(
+    primary: Callable[[], Awaitable[T]],
+    hedge: Callable[[], Awaitable[T]],
+    policy: HedgePolicy,
+    stats: HedgeStats,
+    discard: Callable[[T], Awaitable[None]] | None = None,
+) -> T:
+    """Return the result of `primary`, or of `hedge` if that finishes first.
+
+    `hedge` is only started when `primary` has not finished within the
+    policy's delay. If `primary` fails after that, the hedged request is
+    awaited instead. A result that lost the race is passed to `discard`.
+    """
+    stats.requests += 1
+    started = time.monotonic()
+    first = asyncio.ensure_future(primary())
+    done, _ = await asyncio.wait({first}, timeout=policy.delay)
+    if done:
+        return first.result()
+
+    stats.fired += 1
+    second = asyncio.ensure_future(hedge())
+    _LOGGER.debug(
+        "[v%s] No output after %.1fs, sending hedged request%s",
+        INTEGRATION_VERSION,
+        policy.delay,
+        f" to {policy.model}" if policy.model else "",
+    )
+    pending = {first, second}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            winner = next((task for task in (first, second) if task in done and _succeeded(task)), None)
+            if winner is None:
+                continue
+            if winner is second:
+                stats.won += 1
+            _LOGGER.debug(
+                "[v%s] %s request answered first after %.0f ms",
+                INTEGRATION_VERSION,
+                "Hedged" if winner is second else "Original",
+                (time.monotonic() - started) * 1000,
+            )
+            for task in (first, second):
+                if task is not winner:
+                    await _async_discard(task, discard)
+            return winner.result()
+    except BaseException:
+        for task in (first, second):
+            await _async_discard(task, discard)
+        raise
+    # Both failed; report the original request's error
+    second.exception()
+    return first.result()
+
+
+def _succeeded(task: asyncio.Future) -> bool:
+    return not task.cancelled() and task.exception() is None
+
+
+async def _async_discard(task: asyncio.Future, discard: Callable[[Any], Awaitable[None]] | None) -> None:
+    if not task.done():
+        task.cancel()
+        with contextlib.suppress(BaseException):
+            await task
+        return
+    if discard is not None and _succeeded(task):
+        await discard(task.result())
+    elif not task.cancelled():
+        task.exception()  # retrieved so it is not logged as never retrieved
+
+
+class StartedStream:
+    """A response stream that has produced its first output.
+
+    Iterating yields the events read so far followed by the rest of the
+    stream. Everything else, such as `get_final_response`, is delegated.
+    """
+
+    def __init__(self, manager: Any) -> None:
+        """Wrap a stream manager as returned by `client.responses.stream`."""
+        self._manager = manager
+        self._stream: Any = None
+        self._iterator: AsyncIterator[Any] | None = None
+        self._buffered: list[Any] = []
+
+    async def async_start(self) -> StartedStream:
+        """Open the stream and read up to its first output event."""
+        try:
+            self._stream = await self._manager.__aenter__()
+            self._iterator = aiter(self._stream)
+            while True:
+                try:
+                    event = await anext(self._iterator)
+                except StopAsyncIteration:
+                    return self
+                self._buffered.append(event)
+                if is_output_event(event):
+                    return self
+        except BaseException:
+            await self.async_close()
+            raise
+
+    async def async_close(self) -> None:
+        """Close the stream and its connection."""
+        manager, self._manager = self._manager, None
+        if manager is not None and self._stream is not None:
+            await manager.__aexit__(None, None, None)
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        buffered, self._buffered = self._buffered, []
+        for event in buffered:
+            yield event
+        if self._iterator is None:
+            return
+        async for event in self._iterator:
+            yield event
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
+
+
+class HedgedStream:
+    """Async context manager around `client.responses.stream` with hedging.
+
+    Without a policy it behaves like the plain stream manager.
+    """
+
+    def __init__(
+        self,
+        open_stream: Callable[..., Any],
+        kwargs: dict[str, Any],
+        policy: HedgePolicy | None,
+        stats: HedgeStats,
+    ) -> None:
+        """Initialize the stream; `open_stream` is `client.responses.stream`."""
+        self._open_stream = open_stream
+        self._kwargs = kwargs
+        self._policy = policy
+        self._stats = stats
+        self._started: StartedStream | None = None
+
+    async def __aenter__(self) -> StartedStream:
+        def start(kwargs: dict[str, Any]) -> Callable[[], Awaitable[StartedStream]]:
+            return lambda: StartedStream(self._open_stream(**kwargs)).async_start()
+
+        primary = start(self._kwargs)
+        if self._policy is None:
+            self._started = await primary()
+        else:
+            self._started = await async_hedge(
+                primary,
+                start(hedge_kwargs(self._kwargs, self._policy.model)),
+                self._policy,
+                self._stats,
+                discard=StartedStream.async_close,
+            )
+        return self._started
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        if self._started is not None:
+            await self._started.async_close()
@@ -1,29 +1,17 @@
 import logging
 import os
 import re
-import sqlite3
+import sys
 import time
 from abc import ABC, abstractmethod
 from datetime import timedelta
-from functools import partial
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from urllib import parse
 
 import homeassistant.util.dt as dt_util
 import voluptuous as vol
 import yaml
-from bs4 import BeautifulSoup
-from homeassistant.components import (
-    automation,
-    conversation,
-    energy,
-    recorder,
-    rest,
-    scrape,
-)
-from homeassistant.components.automation.config import _async_validate_config_item
-from homeassistant.components.script.config import SCRIPT_ENTITY_SCHEMA
-from homeassistant.config import AUTOMATION_CONFIG_PATH
+from homeassistant.components import conversation
 from homeassistant.const import (
     CONF_ATTRIBUTE,
     CONF_METHOD,
@@ -40,6 +28,7 @@ from homeassistant.core import HomeAssistant, State
 from homeassistant.exceptions import HomeAssistantError, ServiceNotFound
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.httpx_client import get_async_client
+from homeassistant.helpers.importlib import async_import_module
 from homeassistant.helpers.script import Script
 from homeassistant.helpers.template import Template
 from openai import AsyncAzureOpenAI, AsyncOpenAI
@@ -54,6 +43,9 @@ from .exceptions import (
     NativeNotFound,
 )
 
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -61,12 +53,95 @@ AZURE_DOMAIN_PATTERN = r"\.(openai\.azure\.com|azure-api\.net)"
 
 
 def get_function_executor(value: str):
-    function_executor = FUNCTION_EXECUTORS.get(value)
+    function_executor = _LOADED_EXECUTORS.get(value)
     if function_executor is None:
-        raise FunctionNotFound(value)
+        executor_class = FUNCTION_EXECUTORS.get(value)
+        if executor_class is None:
+            raise FunctionNotFound(value)
+        if not all(module in sys.modules for module in FUNCTION_EXECUTOR_IMPORTS.get(value, ())):
+            _LOGGER.debug("[v%s] Loading %s function executor in the event loop", INTEGRATION_VERSION, value)
+        function_executor = _LOADED_EXECUTORS[value] = executor_class()
     return function_executor
 
 
+async def async_load_function_executors(hass: HomeAssistant, function_types) -> None:
+    """Import the modules of function executors in the executor, then create them.
+
+    Executors are otherwise created on first use; loading them ahead keeps
+    the imports of rest, scrape and the like out of the event loop.
+    """
+    for function_type in set(function_types) - set(_LOADED_EXECUTORS):
+        if function_type not in FUNCTION_EXECUTORS:
+            continue
+        for module in FUNCTION_EXECUTOR_IMPORTS.get(function_type, ()):
+            await async_import_module(hass, module)
+        get_function_executor(function_type)
+
+
+def function_types(functions) -> set[str]:
+    """Return the executor types used by function configs, including composite steps."""
+    types: set[str] = set()
+    for function in functions or []:
+        if not isinstance(function, dict):
+            continue
+        function_type = function.get("type")
+        if function_type:
+            types.add(function_type)
+        if function_type == "composite":
+            types |= function_types(function.get("sequence"))
+    return types
+
+
+# Native functions and executor types that only read state
+READ_ONLY_NATIVE_FUNCTIONS = {
+    "get_history",
+    "get_energy",
+    "get_statistics",
+    "get_user_from_user_id",
+}
+READ_ONLY_FUNCTION_TYPES = {"template", "scrape", "sqlite"}
+# Home Assistant LLM API tools that only read state
+READ_ONLY_LLM_TOOLS = {"GetLiveContext", "GetDateTime"}
+
+
+def is_read_only_function(function: dict[str, Any]) -> bool:
+    """Return True if running a function config cannot change any state.
+
+    Scripts and unknown natives are assumed to change state; rest functions
+    are read-only only for GET requests; composites are read-only when all
+    of their steps are.
+    """
+    function_type = function.get("type")
+    if function_type in READ_ONLY_FUNCTION_TYPES:
+        return True
+    if function_type == "native":
+        return function.get("name") in READ_ONLY_NATIVE_FUNCTIONS
+    if function_type == "rest":
+        return str(function.get(CONF_METHOD, "GET")).upper() == "GET"
+    if function_type == "composite":
+        return all(is_read_only_function(step) for step in function.get("sequence", []))
+    return False
+
+
+def is_read_only_setting(function_setting: dict[str, Any]) -> bool:
+    """Return True if a configured function only reads state.
+
+    An explicit `read_only` key next to `spec` and `function` overrides the
+    classification derived from the function type.
+    """
+    if function_setting.get("read_only") is not None:
+        return bool(function_setting["read_only"])
+    return is_read_only_function(function_setting.get("function") or {})
+
+
+def is_read_only_tool(tool_name: str, functions: list[dict[str, Any]]) -> bool:
+    """Return True if a tool the model may call only reads state."""
+    setting = next((f for f in functions if f["spec"]["name"] == tool_name), None)
+    if setting is not None:
+        return is_read_only_setting(setting)
+    return tool_name in READ_ONLY_LLM_TOOLS
+
+
 def is_azure(base_url: str):
     if base_url and re.search(AZURE_DOMAIN_PATTERN, base_url):
         return True
@@ -105,6 +180,8 @@ def _convert_to_template(settings, template_keys, hass, parents: list[str]):
 
 
 def _get_rest_data(hass, rest_config, arguments):
+    from homeassistant.components import rest
+
     rest_config.setdefault(CONF_METHOD, rest.const.DEFAULT_METHOD)
     rest_config.setdefault(CONF_VERIFY_SSL, rest.const.DEFAULT_VERIFY_SSL)
     rest_config.setdefault(CONF_TIMEOUT, rest.data.DEFAULT_TIMEOUT)
@@ -134,11 +211,13 @@ async def validate_authentication(
     api_version: str,
     organization: str = None,
     skip_authentication=False,
+    client: AsyncOpenAI | None = None,
 ) -> None:
+    """Raise if the API key is rejected; `client` reuses an existing client."""
     if skip_authentication:
         return
 
-    if is_azure(base_url):
+    if client is None and is_azure(base_url):
         client = AsyncAzureOpenAI(
             api_key=api_key,
             azure_endpoint=base_url,
@@ -146,7 +225,7 @@ async def validate_authentication(
             organization=organization,
             http_client=get_async_client(hass),
         )
-    else:
+    elif client is None:
         client = AsyncOpenAI(
             api_key=api_key,
             base_url=base_url,
@@ -154,7 +233,7 @@ async def validate_authentication(
             http_client=get_async_client(hass),
         )
 
-    await hass.async_add_executor_job(partial(client.models.list, timeout=10))
+    await client.models.list(timeout=10)
 
 
 class FunctionExecutor(ABC):
@@ -168,7 +247,7 @@ class FunctionExecutor(ABC):
             return self.data_schema(arguments)
         except vol.error.Error as e:
             function_type = next(
-                (key for key, value in FUNCTION_EXECUTORS.items() if value == self),
+                (key for key, value in FUNCTION_EXECUTORS.items() if isinstance(self, value)),
                 None,
             )
             raise InvalidFunction(function_type) from e
@@ -327,7 +406,7 @@ class NativeFunctionExecutor(FunctionExecutor):
         # Auto-wrap single service call to list format if needed
         # This handles cases where the model sends direct service call instead of wrapped in list
         if "list" not in arguments and "domain" in arguments and "service" in arguments:
-            _LOGGER.info(
+            _LOGGER.debug(
                 "[v%s] Auto-wrapping single service call to list format (domain=%s, service=%s)",
                 INTEGRATION_VERSION,
                 arguments.get("domain"),
@@ -352,6 +431,10 @@ class NativeFunctionExecutor(FunctionExecutor):
         user_input: conversation.ConversationInput,
         exposed_entities,
     ):
+        from homeassistant.components import automation
+        from homeassistant.components.automation.config import _async_validate_config_item
+        from homeassistant.config import AUTOMATION_CONFIG_PATH
+
         automation_config = yaml.safe_load(arguments["automation_config"])
         config = {"id": str(round(time.time() * 1000))}
         if isinstance(automation_config, list):
@@ -406,6 +489,7 @@ class NativeFunctionExecutor(FunctionExecutor):
 
         self.validate_entity_ids(hass, entity_ids, exposed_entities)
 
+        recorder = await async_import_module(hass, "homeassistant.components.recorder")
         with recorder.util.session_scope(hass=hass, read_only=True) as session:
             result = await recorder.get_instance(hass).async_add_executor_job(
                 recorder.history.get_significant_states_with_session,
@@ -431,7 +515,8 @@ class NativeFunctionExecutor(FunctionExecutor):
         user_input: conversation.ConversationInput,
         exposed_entities,
     ):
-        energy_manager: energy.data.EnergyManager = await energy.async_get_manager(hass)
+        energy = await async_import_module(hass, "homeassistant.components.energy")
+        energy_manager = await energy.async_get_manager(hass)
         return energy_manager.data
 
     async def get_user_from_user_id(
@@ -457,6 +542,7 @@ class NativeFunctionExecutor(FunctionExecutor):
         start_time = dt_util.as_utc(dt_util.parse_datetime(arguments["start_time"]))
         end_time = dt_util.as_utc(dt_util.parse_datetime(arguments["end_time"]))
 
+        recorder = await async_import_module(hass, "homeassistant.components.recorder")
         return await recorder.get_instance(hass).async_add_executor_job(
             recorder.statistics.statistics_during_period,
             hass,
@@ -487,6 +573,8 @@ class NativeFunctionExecutor(FunctionExecutor):
 class ScriptFunctionExecutor(FunctionExecutor):
     def __init__(self) -> None:
         """initialize script function"""
+        from homeassistant.components.script.config import SCRIPT_ENTITY_SCHEMA
+
         super().__init__(SCRIPT_ENTITY_SCHEMA)
 
     async def execute(
@@ -541,6 +629,8 @@ class TemplateFunctionExecutor(FunctionExecutor):
 class RestFunctionExecutor(FunctionExecutor):
     def __init__(self) -> None:
         """initialize Rest function"""
+        from homeassistant.components import rest
+
         super().__init__(
             vol.Schema(rest.RESOURCE_SCHEMA).extend(
                 {
@@ -576,6 +666,8 @@ class RestFunctionExecutor(FunctionExecutor):
 class ScrapeFunctionExecutor(FunctionExecutor):
     def __init__(self) -> None:
         """initialize Scrape function"""
+        from homeassistant.components import scrape
+
         super().__init__(
             scrape.COMBINED_SCHEMA.extend(
                 {
@@ -593,6 +685,8 @@ class ScrapeFunctionExecutor(FunctionExecutor):
         user_input: conversation.ConversationInput,
         exposed_entities,
     ):
+        from homeassistant.components import scrape
+
         config = function
         rest_data = _get_rest_data(hass, config, arguments)
         coordinator = scrape.coordinator.ScrapeCoordinator(
@@ -625,7 +719,7 @@ class ScrapeFunctionExecutor(FunctionExecutor):
 
     def _async_update_from_rest_data(
         self,
-        data: BeautifulSoup,
+        data: "BeautifulSoup",
         sensor_config: dict[str, Any],
         arguments: dict[str, Any],
     ) -> None:
@@ -640,8 +734,10 @@ class ScrapeFunctionExecutor(FunctionExecutor):
 
         return value
 
-    def _extract_value(self, data: BeautifulSoup, sensor_config: dict[str, Any]) -> Any:
+    def _extract_value(self, data: "BeautifulSoup", sensor_config: dict[str, Any]) -> Any:
         """Parse the html extraction in the executor."""
+        from homeassistant.components import scrape
+
         value: str | list[str] | None
         select = sensor_config[scrape.const.CONF_SELECT]
         index = sensor_config.get(scrape.const.CONF_INDEX, 0)
@@ -741,7 +837,9 @@ class SqliteFunctionExecutor(FunctionExecutor):
         raise HomeAssistantError(msg)
 
     def get_default_db_url(self, hass: HomeAssistant) -> str:
-        db_file_path = os.path.join(hass.config.config_dir, recorder.DEFAULT_DB_FILE)
+        from homeassistant.components.recorder import DEFAULT_DB_FILE
+
+        db_file_path = os.path.join(hass.config.config_dir, DEFAULT_DB_FILE)
         return f"file:{db_file_path}?mode=ro"
 
     def set_url_read_only(self, url: str) -> str:
@@ -777,7 +875,9 @@ class SqliteFunctionExecutor(FunctionExecutor):
         template_arguments.update(arguments)
 
         q = Template(query, hass).async_render(template_arguments)
-        _LOGGER.info("[v%s] Rendered query: %s", INTEGRATION_VERSION, q)
+        _LOGGER.debug("[v%s] Rendered query: %s", INTEGRATION_VERSION, q)
+
+        import sqlite3
 
         with sqlite3.connect(db_url, uri=True) as conn:
             cursor = conn.cursor().execute(q)
@@ -791,12 +891,21 @@ class SqliteFunctionExecutor(FunctionExecutor):
             return [dict(zip(names, row, strict=False)) for row in rows]
 
 
-FUNCTION_EXECUTORS: dict[str, FunctionExecutor] = {
-    "native": NativeFunctionExecutor(),
-    "script": ScriptFunctionExecutor(),
-    "template": TemplateFunctionExecutor(),
-    "rest": RestFunctionExecutor(),
-    "scrape": ScrapeFunctionExecutor(),
-    "composite": CompositeFunctionExecutor(),
-    "sqlite": SqliteFunctionExecutor(),
+FUNCTION_EXECUTORS: dict[str, type[FunctionExecutor]] = {
+    "native": NativeFunctionExecutor,
+    "script": ScriptFunctionExecutor,
+    "template": TemplateFunctionExecutor,
+    "rest": RestFunctionExecutor,
+    "scrape": ScrapeFunctionExecutor,
+    "composite": CompositeFunctionExecutor,
+    "sqlite": SqliteFunctionExecutor,
+}
+# Modules each executor imports when it is created, loaded ahead in the executor
+FUNCTION_EXECUTOR_IMPORTS: dict[str, tuple[str, ...]] = {
+    "script": ("homeassistant.components.script.config",),
+    "rest": ("homeassistant.components.rest",),
+    "scrape": ("homeassistant.components.scrape", "bs4"),
+    "sqlite": ("sqlite3", "homeassistant.components.recorder"),
 }
+# Executors created so far, by type
+_LOADED_EXECUTORS: dict[str, FunctionExecutor] = {}
@@ -0,0 +1,251 @@
+"""Dedicated, pre-warmed HTTP client for the OpenAI connection."""
+
+from __future__ import annotations
+
+import importlib.util
+import logging
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any
+
+import httpx
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.httpx_client import SERVER_SOFTWARE, USER_AGENT
+from homeassistant.util.ssl import get_default_context
+
+from .const import (
+    CONF_HTTP2,
+    CONF_HTTP_CONNECT_TIMEOUT,
+    CONF_HTTP_KEEPALIVE_EXPIRY,
+    CONF_HTTP_MAX_CONNECTIONS,
+    CONF_HTTP_READ_TIMEOUT,
+    CONF_KEEP_WARM_INTERVAL,
+    DEFAULT_HTTP2,
+    DEFAULT_HTTP_CONNECT_TIMEOUT,
+    DEFAULT_HTTP_KEEPALIVE_EXPIRY,
+    DEFAULT_HTTP_MAX_CONNECTIONS,
+    DEFAULT_HTTP_READ_TIMEOUT,
+    DEFAULT_KEEP_WARM_INTERVAL,
+    INTEGRATION_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Time allowed to write a request body and to wait for a free pool connection
+WRITE_TIMEOUT = 10.0
+POOL_TIMEOUT = 10.0
+# Keep-warm requests sent in a row without other traffic before keep-warm pauses
+MAX_IDLE_PINGS = 15
+
+
+def h2_available() -> bool:
+    """Return True if the optional `h2` package needed for HTTP/2 is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+@dataclass(frozen=True)
+class HttpClientSettings:
+    """Connection settings of the OpenAI HTTP client."""
+
+    http2: bool = DEFAULT_HTTP2
+    max_connections: int = DEFAULT_HTTP_MAX_CONNECTIONS
+    keepalive_expiry: float = DEFAULT_HTTP_KEEPALIVE_EXPIRY
+    connect_timeout: float = DEFAULT_HTTP_CONNECT_TIMEOUT
+    read_timeout: float = DEFAULT_HTTP_READ_TIMEOUT
+    keep_warm_interval: float = DEFAULT_KEEP_WARM_INTERVAL
+
+    @classmethod
+    def from_options(cls, options) -> HttpClientSettings:
+        """Build settings from integration options."""
+        return cls(
+            http2=bool(options.get(CONF_HTTP2, DEFAULT_HTTP2)),
+            max_connections=max(1, int(options.get(CONF_HTTP_MAX_CONNECTIONS, DEFAULT_HTTP_MAX_CONNECTIONS))),
+            keepalive_expiry=float(options.get(CONF_HTTP_KEEPALIVE_EXPIRY, DEFAULT_HTTP_KEEPALIVE_EXPIRY)),
+            connect_timeout=float(options.get(CONF_HTTP_CONNECT_TIMEOUT, DEFAULT_HTTP_CONNECT_TIMEOUT)),
+            read_timeout=float(options.get(CONF_HTTP_READ_TIMEOUT, DEFAULT_HTTP_READ_TIMEOUT)),
+            keep_warm_interval=float(options.get(CONF_KEEP_WARM_INTERVAL, DEFAULT_KEEP_WARM_INTERVAL)),
+        )
+
+    @property
+    def limits(self) -> httpx.Limits:
+        """Return the connection pool limits."""
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    @property
+    def timeout(self) -> httpx.Timeout:
+        """Return the per-phase timeouts.
+
+        The read timeout bounds both the wait for the first response byte and
+        each later gap between chunks of a streamed response.
+        """
+        return httpx.Timeout(
+            connect=self.connect_timeout,
+            read=self.read_timeout,
+            write=WRITE_TIMEOUT,
+            pool=POOL_TIMEOUT,
+        )
+
+
+@dataclass
+class ConnectionStats:
+    """Connection reuse counters of the OpenAI HTTP client."""
+
+    requests: int = 0
+    new_connections: int = 0
+    pings: int = 0
+    failed_pings: int = 0
+    last_connect_ms: float | None = None
+    http_versions: dict[str, int] = field(default_factory=dict)
+    last_activity: float = 0.0
+
+    @property
+    def reused(self) -> int:
+        """Return the number of requests sent on an already open connection."""
+        return max(0, self.requests - self.new_connections)
+
+    @property
+    def reuse_rate(self) -> float:
+        """Return the share of requests that reused a connection."""
+        return self.reused / self.requests if self.requests else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters for diagnostics."""
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused": self.reused,
+            "reuse_rate": round(self.reuse_rate, 3),
+            "pings": self.pings,
+            "failed_pings": self.failed_pings,
+            "last_connect_ms": self.last_connect_ms,
+            "http_versions": dict(self.http_versions),
+        }
+
+
+class OpenAIHttpClient:
+    """HTTP client owned by one config entry.
+
+    Unlike Home Assistant's shared client it has its own pool limits,
+    timeouts and HTTP/2 multiplexing. When idle for a keep-warm interval a
+    cheap request is sent so the next conversation turn finds an open
+    connection instead of paying DNS, TCP and TLS setup. After
+    `MAX_IDLE_PINGS` such requests without any other traffic keep-warm
+    pauses until the next request.
+    """
+
+    def __init__(self, hass: HomeAssistant, settings: HttpClientSettings, http2: bool) -> None:
+        """Create the client; `http2` is False when the `h2` package is missing."""
+        self.hass = hass
+        self.settings = settings
+        self.stats = ConnectionStats()
+        self._connect_started: float | None = None
+        self._unsub_keep_warm: Callable[[], None] | None = None
+        self._ping: Callable[[], Awaitable[Any]] | None = None
+        self._pinging = False
+        self._idle_pings = 0
+        self._response_listeners: list[Callable[[int, Mapping[str, str]], None]] = []
+        # Home Assistant's client factory fixes the pool limits, so build the client here
+        self.client = httpx.AsyncClient(
+            verify=get_default_context(),
+            headers={USER_AGENT: SERVER_SOFTWARE},
+            http2=http2,
+            limits=settings.limits,
+            timeout=settings.timeout,
+            event_hooks={"request": [self._on_request], "response": [self._on_response]},
+        )
+
+    async def _on_request(self, request: httpx.Request) -> None:
+        self.stats.requests += 1
+        self.stats.last_activity = time.monotonic()
+        if not self._pinging:
+            self._idle_pings = 0
+        request.extensions["trace"] = self._trace
+
+    async def _on_response(self, response: httpx.Response) -> None:
+        version = response.http_version
+        self.stats.http_versions[version] = self.stats.http_versions.get(version, 0) + 1
+        for listener in self._response_listeners:
+            listener(response.status_code, response.headers)
+
+    @callback
+    def async_add_response_listener(self, listener: Callable[[int, Mapping[str, str]], None]) -> None:
+        """Call `listener` with the status and headers of every response."""
+        self._response_listeners.append(listener)
+
+    async def _trace(self, event_name: str, info: dict[str, Any]) -> None:
+        """Count new connections and time their TCP and TLS setup."""
+        if event_name == "connection.connect_tcp.started":
+            self.stats.new_connections += 1
+            self._connect_started = time.monotonic()
+        elif event_name in ("connection.connect_tcp.complete", "connection.start_tls.complete") and self._connect_started:
+            # Plain connections end at TCP setup, TLS connections after the handshake
+            self.stats.last_connect_ms = round((time.monotonic() - self._connect_started) * 1000, 1)
+            if event_name == "connection.start_tls.complete":
+                self._connect_started = None
+
+    @callback
+    def async_start_keep_warm(self, ping: Callable[[], Awaitable[Any]]) -> None:
+        """Warm a connection now and keep one open while idle."""
+        self._ping = ping
+        self.hass.async_create_background_task(self._async_ping(), "openai_conversation_plus keep-warm")
+        interval = self.settings.keep_warm_interval
+        if interval <= 0:
+            return
+        self._unsub_keep_warm = async_track_time_interval(
+            self.hass, self._async_keep_warm, timedelta(seconds=interval), cancel_on_shutdown=True
+        )
+
+    async def _async_keep_warm(self, _now: Any) -> None:
+        # Requests from conversation turns keep the pool warm on their own
+        idle = time.monotonic() - self.stats.last_activity
+        if idle >= self.settings.keep_warm_interval * 0.9 and self._idle_pings < MAX_IDLE_PINGS:
+            await self._async_ping()
+
+    async def _async_ping(self) -> None:
+        if self._ping is None:
+            return
+        self.stats.pings += 1
+        self._idle_pings += 1
+        self._pinging = True
+        started = time.monotonic()
+        try:
+            await self._ping()
+        except Exception as err:  # noqa: BLE001
+            # Any HTTP answer leaves the connection open; only log the failure
+            self.stats.failed_pings += 1
+            _LOGGER.debug("[v%s] Keep-warm request failed: %s", INTEGRATION_VERSION, err)
+        finally:
+            self._pinging = False
+        _LOGGER.debug(
+            "[v%s] Keep-warm request took %.0f ms, connection stats: %s",
+            INTEGRATION_VERSION,
+            (time.monotonic() - started) * 1000,
+            self.stats.as_dict(),
+        )
+
+    async def async_close(self) -> None:
+        """Stop the keep-warm timer and close all connections."""
+        if self._unsub_keep_warm is not None:
+            self._unsub_keep_warm()
+            self._unsub_keep_warm = None
+        await self.client.aclose()
+
+
+async def async_create_http_client(hass: HomeAssistant, options) -> OpenAIHttpClient:
+    """Create the HTTP client for a config entry from its options."""
+    settings = HttpClientSettings.from_options(options)
+    http2 = settings.http2
+    if http2 and not await hass.async_add_executor_job(h2_available):
+        _LOGGER.warning(
+            "[v%s] HTTP/2 requested but the h2 package is not installed, using HTTP/1.1",
+            INTEGRATION_VERSION,
+        )
+        http2 = False
+    return OpenAIHttpClient(hass, settings, http2)
@@ -0,0 +1,236 @@
+"""Image preparation for vision requests.
+
+Everything here does file IO or image decoding and must run in an executor.
+"""
+
+from __future__ import annotations
+
+import base64
+import io
+import logging
+import mimetypes
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import BinaryIO, Union
+
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import DEFAULT_IMAGE_MAX_EDGE, DEFAULT_IMAGE_QUALITY, INTEGRATION_VERSION
+
+_LOGGER = logging.getLogger(__name__)
+
+# Raw bytes per base64 chunk; a multiple of 3 so chunks encode without padding
+CHUNK_SIZE = 3 * 64 * 1024
+# Total size of encoded images kept in memory
+MAX_CACHE_BYTES = 32 * 1024 * 1024
+# Side of the difference hash grid; 8 gives a 64-bit hash
+HASH_SIZE = 8
+
+
+@dataclass(frozen=True)
+class ImageOptions:
+    """How images are prepared before upload."""
+
+    max_edge: int = DEFAULT_IMAGE_MAX_EDGE
+    quality: int = DEFAULT_IMAGE_QUALITY
+
+
+@dataclass(frozen=True)
+class PreparedImage:
+    """An image ready for upload."""
+
+    data_url: str
+    fingerprint: int | None = None
+
+
+def b64encode_stream(stream: BinaryIO, prefix: str = "") -> str:
+    """Base64-encode a stream chunk by chunk.
+
+    Only one chunk of raw bytes is read at a time and the encoded text is
+    written into a single buffer, so the raw image is never held in full.
+    The encoded text exists twice only while the buffer is turned into the
+    returned string.
+    """
+    with io.StringIO() as encoded:
+        encoded.write(prefix)
+        while chunk := stream.read(CHUNK_SIZE):
+            encoded.write(base64.b64encode(chunk).decode("ascii"))
+        return encoded.getvalue()
+
+
+ImageSource = Union[str, BinaryIO]
+
+
+def _downscale(source: ImageSource, options: ImageOptions) -> io.BytesIO | None:
+    """Return the image re-encoded as JPEG within max_edge, or None to send it as is."""
+    try:
+        from PIL import Image
+    except ImportError:
+        _LOGGER.debug("[v%s] Pillow not installed, sending images without resizing", INTEGRATION_VERSION)
+        return None
+
+    try:
+        with Image.open(source) as image:
+            if max(image.size) <= options.max_edge:
+                return None
+            # Let the JPEG decoder skip detail that would be scaled away anyway
+            image.draft("RGB", (options.max_edge, options.max_edge))
+            image = image.convert("RGB")
+            image.thumbnail((options.max_edge, options.max_edge))
+            buffer = io.BytesIO()
+            image.save(buffer, format="JPEG", quality=options.quality, optimize=True)
+    except (OSError, ValueError, Image.DecompressionBombError) as err:
+        # Let the model judge an image Pillow cannot read, as before resizing existed
+        _LOGGER.debug("[v%s] Cannot resize image, sending it as is: %s", INTEGRATION_VERSION, err)
+        return None
+    buffer.seek(0)
+    return buffer
+
+
+class ImageCache:
+    """Encoded images keyed on path, modification time, size and options.
+
+    Safe to use from several executor threads at once.
+    """
+
+    def __init__(self, max_bytes: int = MAX_CACHE_BYTES) -> None:
+        """Initialize the cache."""
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size = 0
+        self._entries: OrderedDict[tuple, PreparedImage] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> PreparedImage | None:
+        """Return a cached image."""
+        with self._lock:
+            prepared = self._entries.get(key)
+            if prepared is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return prepared
+
+    def put(self, key: tuple, prepared: PreparedImage) -> None:
+        """Cache an image, evicting the least recently used ones over the size limit."""
+        if len(prepared.data_url) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous.data_url)
+            self._entries[key] = prepared
+            self._size += len(prepared.data_url)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.data_url)
+
+
+def frame_hash(source: ImageSource) -> int | None:
+    """Return a 64-bit difference hash of an image, or None if it cannot be decoded.
+
+    The image is reduced to 9x8 grey pixels and each bit records whether a
+    pixel is brighter than its left neighbour, so small changes in light or
+    noise flip few bits while a changed scene flips many.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+
+    try:
+        with Image.open(source) as image:
+            image.draft("L", (HASH_SIZE * 8, HASH_SIZE * 8))
+            small = image.convert("L").resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.BILINEAR)
+            pixels = small.tobytes()
+    except (OSError, ValueError, Image.DecompressionBombError) as err:
+        # An undecodable image is still sent, it just never counts as unchanged
+        _LOGGER.debug("[v%s] Cannot hash image: %s", INTEGRATION_VERSION, err)
+        return None
+
+    try:
+        import numpy as np
+    except ImportError:
+        value = 0
+        for row in range(HASH_SIZE):
+            line = pixels[row * (HASH_SIZE + 1):(row + 1) * (HASH_SIZE + 1)]
+            for left, right in zip(line, line[1:]):
+                value = (value << 1) | (right > left)
+        return value
+
+    grid = np.frombuffer(pixels, dtype=np.uint8).reshape(HASH_SIZE, HASH_SIZE + 1)
+    bits = np.packbits(grid[:, 1:] > grid[:, :-1])
+    return int.from_bytes(bits.tobytes(), "big")
+
+
+def hash_distance(first: int, second: int) -> int:
+    """Return the number of differing bits of two frame hashes."""
+    return bin(first ^ second).count("1")
+
+
+def prepare_image(
+    path: str,
+    options: ImageOptions,
+    cache: ImageCache | None = None,
+    fingerprint: bool = False,
+) -> PreparedImage:
+    """Return a local image as a base64 data URL, downscaled if configured.
+
+    With `fingerprint` the frame hash is computed as well. Blocking; run in
+    an executor.
+    """
+    mime_type, _ = mimetypes.guess_type(path)
+    if mime_type is None or not mime_type.startswith("image"):
+        raise HomeAssistantError(f"`{path}` is not an image")
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError as err:
+        raise HomeAssistantError(f"`{path}` does not exist") from err
+
+    key = (path, stat.st_mtime_ns, stat.st_size, options)
+    prepared = cache.get(key) if cache is not None else None
+    if prepared is None:
+        buffer = _downscale(path, options) if options.max_edge > 0 else None
+        if buffer is not None:
+            data_url = b64encode_stream(buffer, "data:image/jpeg;base64,")
+            _LOGGER.debug(
+                "[v%s] Downscaled %s from %d to %d bytes",
+                INTEGRATION_VERSION,
+                path,
+                stat.st_size,
+                buffer.getbuffer().nbytes,
+            )
+        else:
+            with open(path, "rb") as image_file:
+                data_url = b64encode_stream(image_file, f"data:{mime_type};base64,")
+        prepared = PreparedImage(data_url, frame_hash(path) if fingerprint else None)
+    elif fingerprint and prepared.fingerprint is None:
+        prepared = PreparedImage(prepared.data_url, frame_hash(path))
+    else:
+        return prepared
+
+    if cache is not None:
+        cache.put(key, prepared)
+    return prepared
+
+
+def encode_image_bytes(
+    content: bytes,
+    content_type: str,
+    options: ImageOptions,
+    fingerprint: bool = False,
+) -> PreparedImage:
+    """Return an in-memory image, such as a camera frame, as a base64 data URL.
+
+    Blocking; run in an executor.
+    """
+    buffer = _downscale(io.BytesIO(content), options) if options.max_edge > 0 else None
+    if buffer is not None:
+        data_url = b64encode_stream(buffer, "data:image/jpeg;base64,")
+    else:
+        data_url = b64encode_stream(io.BytesIO(content), f"data:{content_type};base64,")
+    return PreparedImage(data_url, frame_hash(io.BytesIO(content)) if fingerprint else None)
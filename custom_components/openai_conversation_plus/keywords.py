@@ -0,0 +1,155 @@
+"""Compiled action-keyword matching for forcing execute_services.
+
+The per-language tables in `keywords/` also name the verbs local intents
+handle; those verbs count as action keywords too.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .const import INTEGRATION_VERSION
+
+_LOGGER = logging.getLogger(__name__)
+
+KEYWORDS_DIR = Path(__file__).parent / "keywords"
+
+
+@dataclass(frozen=True)
+class ActionDecision:
+    """Outcome of action-keyword detection."""
+
+    force: bool
+    reason: str
+    keyword: str | None = None
+
+
+def _phrase_pattern(phrases: list[str], anchored: bool = False) -> re.Pattern[str] | None:
+    """Compile phrases into one case-insensitive regex with word boundaries."""
+    if not phrases:
+        return None
+    # Longest first so multi-word phrases win over their prefixes
+    alternation = "|".join(
+        r"\s+".join(re.escape(word) for word in phrase.split())
+        for phrase in sorted(set(phrases), key=len, reverse=True)
+    )
+    prefix = r"^\s*" if anchored else r"(?<!\w)"
+    return re.compile(rf"{prefix}(?:{alternation})(?!\w)", re.IGNORECASE)
+
+
+class KeywordMatcher:
+    """Action/question matcher for one language."""
+
+    def __init__(
+        self,
+        actions: list[str],
+        questions: list[str],
+        requests: list[str],
+        auxiliaries: list[str] | None = None,
+    ) -> None:
+        """Compile the keyword tables.
+
+        Auxiliaries start a question unless an action keyword follows them
+        directly, as in "do turn off the lights".
+        """
+        self._actions = _phrase_pattern(actions)
+        self._leading_action = _phrase_pattern(actions, anchored=True)
+        self._questions = _phrase_pattern([*questions, *(auxiliaries or ())], anchored=True)
+        self._requests = _phrase_pattern(requests, anchored=True)
+        self._auxiliaries = {word.lower() for word in auxiliaries or ()}
+
+    def decide(self, text: str) -> ActionDecision:
+        """Decide whether the text is a device command."""
+        t = (text or "").strip()
+        if not t:
+            return ActionDecision(False, "empty input")
+        polite_request = bool(self._requests and self._requests.search(t))
+        if not polite_request:
+            if self._questions and (question := self._questions.search(t)) and not self._emphatic(t, question):
+                return ActionDecision(False, "question word", question.group(0).strip())
+            if t.endswith("?"):
+                return ActionDecision(False, "question mark")
+        if self._actions and (action := self._actions.search(t)):
+            return ActionDecision(True, "action keyword", action.group(0))
+        return ActionDecision(False, "no action keyword")
+
+    def _emphatic(self, text: str, question: re.Match[str]) -> bool:
+        """Return True if a matched auxiliary is followed directly by an action keyword."""
+        if question.group(0).strip().lower() not in self._auxiliaries or self._leading_action is None:
+            return False
+        return bool(self._leading_action.match(text[question.end():]))
+
+
+def _load_tables() -> dict[str, dict[str, Any]]:
+    """Load the per-language keyword tables shipped with the integration."""
+    tables: dict[str, dict[str, Any]] = {}
+    for path in sorted(KEYWORDS_DIR.glob("*.json")):
+        try:
+            tables[path.stem] = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as err:
+            _LOGGER.warning("[v%s] Failed to load keyword table %s: %s", INTEGRATION_VERSION, path.name, err)
+    return tables
+
+
+def _intent_verbs(table: dict[str, Any]) -> dict[str, tuple[str, str | None]]:
+    """Return the local intent verbs of a table with their action and domain hint."""
+    verbs: dict[str, tuple[str, str | None]] = {}
+    for key, hint in (("intents", None), ("light_intents", "light")):
+        for action, phrases in (table.get(key) or {}).items():
+            for phrase in phrases:
+                verbs[phrase] = (action, hint)
+    return verbs
+
+
+def _actions(table: dict[str, Any]) -> list[str]:
+    return [*table.get("actions", []), *_intent_verbs(table)]
+
+
+def _build_matchers(tables: dict[str, dict[str, Any]]) -> dict[str, KeywordMatcher]:
+    matchers = {
+        language: KeywordMatcher(
+            _actions(table),
+            table.get("questions", []),
+            table.get("requests", []),
+            table.get("auxiliaries", []),
+        )
+        for language, table in tables.items()
+    }
+    # Used when the language is unknown or has no table of its own
+    matchers[""] = KeywordMatcher(
+        [k for table in tables.values() for k in _actions(table)],
+        [k for table in tables.values() for k in table.get("questions", [])],
+        [k for table in tables.values() for k in table.get("requests", [])],
+        [k for table in tables.values() for k in table.get("auxiliaries", [])],
+    )
+    return matchers
+
+
+# Loaded at import time so no file IO happens on the event loop
+_TABLES = _load_tables()
+_MATCHERS = _build_matchers(_TABLES)
+# Imperative verb -> (action, domain hint) of every language, for local intents
+INTENT_VERBS: dict[str, tuple[str, str | None]] = {
+    verb: intent for table in _TABLES.values() for verb, intent in _intent_verbs(table).items()
+}
+
+
+def detect_action(text: str, language: str | None = None) -> ActionDecision:
+    """Detect whether the user asked for a device action."""
+    key = (language or "").split("-")[0].lower()
+    matcher = _MATCHERS.get(key) or _MATCHERS[""]
+    decision = matcher.decide(text)
+    _LOGGER.debug(
+        "[v%s] Action keyword decision (language=%s): force=%s, reason=%s, keyword=%s",
+        INTEGRATION_VERSION,
+        key or "any",
+        decision.force,
+        decision.reason,
+        decision.keyword,
+    )
+    return decision
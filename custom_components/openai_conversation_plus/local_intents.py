@@ -0,0 +1,219 @@
+"""Local fast-path intent matching for simple device commands."""
+
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any
+
+from .const import INTEGRATION_VERSION
+from .keywords import INTENT_VERBS
+
+_LOGGER = logging.getLogger(__name__)
+
+# Verbs from the keyword tables, longest first so "sätt på" wins over "sätt"
+_VERBS = sorted(INTENT_VERBS, key=len, reverse=True)
+
+# Words that may surround the target name without changing its meaning
+FILLER_WORDS = {
+    "the", "a", "all", "in", "please", "to",
+    "i", "på", "alla", "till", "tack", "snälla",
+}
+# Nouns that mean "the lights" when combined with an area
+LIGHT_NOUNS = {
+    "light", "lights", "lamp", "lamps",
+    "lampan", "lamporna", "ljuset", "lyset", "belysningen",
+}
+# Swedish definite-form suffixes ("kök" -> "köket")
+SV_DEFINITE_SUFFIXES = ("et", "en", "n", "t")
+
+ON_OFF_DOMAINS = {"light", "switch", "fan", "input_boolean"}
+# Domains a light verb ("tänd"/"släck") may control
+LIGHT_VERB_DOMAINS = {"light", "switch"}
+
+CONFIRMATIONS = {
+    "sv": "Utfört.",
+    "en": "Done.",
+}
+
+_VALUE_RE = re.compile(r"(\d{1,3})\s*(?:%|procent|percent)")
+_PUNCT_RE = re.compile(r"[^\w\s%]")
+
+
+def normalize(text: str) -> str:
+    """Lower-case and strip punctuation and surplus whitespace."""
+    return " ".join(_PUNCT_RE.sub(" ", (text or "").lower()).split())
+
+
+@dataclass
+class LocalIntentMatch:
+    """A command that can be executed without the model."""
+
+    domain: str
+    service: str
+    target: dict[str, Any]
+    service_data: dict[str, Any] = field(default_factory=dict)
+
+    def as_service_call(self) -> dict[str, Any]:
+        """Return the arguments for the native execute_service function."""
+        return {
+            "list": [
+                {
+                    "domain": self.domain,
+                    "service": self.service,
+                    "target": self.target,
+                    "service_data": dict(self.service_data),
+                }
+            ]
+        }
+
+
+class EntityIndex:
+    """Lookup of normalized entity/area names to targets."""
+
+    def __init__(self, language: str | None = None) -> None:
+        """Initialize the index."""
+        self._swedish = (language or "").lower().startswith("sv")
+        self._entities: dict[str, set[str]] = {}
+        self._areas: dict[str, set[str]] = {}
+
+    def _keys(self, name: str) -> list[str]:
+        key = normalize(name)
+        if not key:
+            return []
+        keys = [key]
+        if self._swedish:
+            keys.extend(key + suffix for suffix in SV_DEFINITE_SUFFIXES)
+        return keys
+
+    def add_entity(self, entity_id: str, names: list[str]) -> None:
+        """Index an entity under its name and aliases."""
+        for name in names:
+            for key in self._keys(name):
+                self._entities.setdefault(key, set()).add(entity_id)
+
+    def add_area(self, area_id: str, names: list[str]) -> None:
+        """Index an area under its name and aliases."""
+        for name in names:
+            for key in self._keys(name):
+                self._areas.setdefault(key, set()).add(area_id)
+
+    def entity(self, phrase: str) -> str | None:
+        """Return the single entity matching a phrase, if unambiguous."""
+        found = self._entities.get(phrase)
+        return next(iter(found)) if found and len(found) == 1 else None
+
+    def area(self, phrase: str) -> str | None:
+        """Return the single area matching a phrase, if unambiguous."""
+        found = self._areas.get(phrase)
+        return next(iter(found)) if found and len(found) == 1 else None
+
+
+def _split_verb(text: str) -> tuple[str, str | None, str] | None:
+    for verb in _VERBS:
+        if text == verb or text.startswith(verb + " "):
+            action, hint = INTENT_VERBS[verb]
+            return action, hint, text[len(verb):].strip()
+    return None
+
+
+def _strip_fillers(words: list[str]) -> list[str]:
+    while words and words[0] in FILLER_WORDS:
+        words = words[1:]
+    while words and words[-1] in FILLER_WORDS:
+        words = words[:-1]
+    return words
+
+
+def _service_for(
+    action: str, domain: str, value: int | None
+) -> tuple[str, dict[str, Any]] | None:
+    if value is not None:
+        # "tänd köket 50%" and "open the garage door 50%" set a level too
+        if action in ("set_level", "turn_on") and domain == "light":
+            return "turn_on", {"brightness_pct": value}
+        if action in ("set_level", "open") and domain == "cover":
+            return "set_cover_position", {"position": value}
+        # Never drop a value the service would ignore
+        return None
+    if action in ("turn_on", "turn_off") and domain in ON_OFF_DOMAINS:
+        return action, {}
+    if action == "open" and domain == "cover":
+        return "open_cover", {}
+    if action == "close" and domain == "cover":
+        return "close_cover", {}
+    return None
+
+
+def match_local_intent(text: str, index: EntityIndex) -> LocalIntentMatch | None:
+    """Match an utterance to an unambiguous device command.
+
+    Only plain imperative commands are handled: a known verb first, then an
+    entity or area name, optionally a percentage. Anything else (questions,
+    several targets, unknown names, ambiguous names) returns None so the
+    turn falls through to the model.
+    """
+    normalized = normalize(text)
+    split = _split_verb(normalized)
+    if split is None:
+        return None
+    action, hint, rest = split
+
+    value = None
+    value_match = _VALUE_RE.search(rest)
+    if value_match:
+        value = int(value_match.group(1))
+        if value > 100:
+            return None
+        rest = (rest[: value_match.start()] + rest[value_match.end():]).strip()
+    elif action == "set_level":
+        return None
+
+    words = _strip_fillers(rest.split())
+    if not words or {"och", "and"} & set(words):
+        return None
+    phrase = " ".join(words)
+
+    entity_id = index.entity(phrase)
+    if entity_id:
+        domain = entity_id.split(".", 1)[0]
+        if hint == "light" and domain not in LIGHT_VERB_DOMAINS:
+            return None
+        service = _service_for(action, domain, value)
+        if service is None:
+            return None
+        return LocalIntentMatch(domain, service[0], {"entity_id": entity_id}, service[1])
+
+    # Area commands need to know which kind of device is meant
+    area_words = _strip_fillers([w for w in words if w not in LIGHT_NOUNS])
+    mentions_lights = any(w in LIGHT_NOUNS for w in words)
+    if hint != "light" and not mentions_lights:
+        return None
+    area_id = index.area(" ".join(area_words)) if area_words else None
+    if area_id is None:
+        return None
+    service = _service_for(action, "light", value)
+    if service is None:
+        return None
+    return LocalIntentMatch("light", service[0], {"area_id": [area_id]}, service[1])
+
+
+def confirmation(language: str | None) -> str:
+    """Return the short local confirmation for a language."""
+    return CONFIRMATIONS.get((language or "en").split("-")[0].lower(), CONFIRMATIONS["en"])
+
+
+def log_match(text: str, match: LocalIntentMatch | None) -> None:
+    """Log the outcome of local intent matching."""
+    if match is None:
+        _LOGGER.debug("[v%s] No local intent for %r, using model", INTEGRATION_VERSION, text)
+    else:
+        _LOGGER.debug(
+            "[v%s] Local intent %s.%s %s %s",
+            INTEGRATION_VERSION,
+            match.domain,
+            match.service,
+            match.target,
+            match.service_data,
+        )
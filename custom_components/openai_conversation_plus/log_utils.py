@@ -0,0 +1,110 @@
+"""Logging that costs nothing for records that are not emitted.
+
+Payloads passed to log calls are wrapped so they are only serialized when
+a handler formats the record: `lazy_json` and `lazy_preview` are cheap to
+create and do their work in `__str__`. At INFO, a turn logs a single
+summary record; its fields are also attached to the record as
+`extra={"turn": {...}}` for structured handlers.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import TYPE_CHECKING, Any
+
+from .const import INTEGRATION_VERSION
+
+if TYPE_CHECKING:
+    from .traces import TurnTrace
+
+PREVIEW_LENGTH = 100
+
+
+class _LazyJson:
+    """A value serialized as JSON only when formatted."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def __str__(self) -> str:
+        try:
+            return json.dumps(self.value, ensure_ascii=False, default=str)
+        except (TypeError, ValueError) as err:
+            return f"<unserializable: {err}>"
+
+
+class _LazyPreview:
+    """The start of a value's text, built only when formatted."""
+
+    __slots__ = ("value", "length")
+
+    def __init__(self, value: Any, length: int) -> None:
+        self.value = value
+        self.length = length
+
+    def __str__(self) -> str:
+        text = str(self.value)
+        return text if len(text) <= self.length else f"{text[:self.length]}..."
+
+
+def lazy_json(value: Any) -> Any:
+    """Return a log argument that serializes `value` as JSON if the record is emitted."""
+    return _LazyJson(value)
+
+
+def lazy_preview(value: Any, length: int = PREVIEW_LENGTH) -> Any:
+    """Return a log argument that shortens the text of `value` if the record is emitted."""
+    return _LazyPreview(value, length)
+
+
+def turn_summary(trace: TurnTrace) -> dict[str, Any]:
+    """Return the fields of the summary record of a turn."""
+    request = trace.request
+    fields: dict[str, Any] = {
+        "outcome": trace.outcome,
+        "conversation_id": trace.conversation_id,
+        "ms": trace.timings.get("total"),
+        "model": request.get("model"),
+        "route": request.get("route"),
+        "stream": request.get("stream"),
+        "tools": request.get("tools"),
+        "messages": request.get("messages"),
+        "tool_calls": [call["name"] for call in trace.tool_calls],
+        "tool_failures": sum(1 for call in trace.tool_calls if "error" in call),
+        "ttfb_ms": trace.timings.get("ttfb"),
+        **trace.usage,
+        "fallbacks": trace.fallbacks,
+        "errors": len(trace.errors),
+    }
+    return {key: value for key, value in fields.items() if not _is_empty(value)}
+
+
+def _is_empty(value: Any) -> bool:
+    # Flags are kept when False; missing values, empty lists and zero counts are dropped
+    return value is None or value == [] or (type(value) is int and value == 0)
+
+
+class _KeyValues:
+    """Summary fields formatted as key=value pairs only when formatted."""
+
+    __slots__ = ("fields",)
+
+    def __init__(self, fields: dict[str, Any]) -> None:
+        self.fields = fields
+
+    def __str__(self) -> str:
+        return " ".join(
+            f"{key}={','.join(map(str, value)) if isinstance(value, list) else value}"
+            for key, value in self.fields.items()
+        )
+
+
+def log_turn_summary(logger: logging.Logger, trace: TurnTrace) -> None:
+    """Log the one INFO record of a finished turn."""
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    fields = turn_summary(trace)
+    logger.info("[v%s] Turn %s: %s", INTEGRATION_VERSION, trace.trace_id, _KeyValues(fields), extra={"turn": fields})
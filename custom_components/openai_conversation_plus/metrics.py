@@ -0,0 +1,122 @@
+"""Rolling performance aggregates of an entry, read by its sensors.
+
+Finished turns are counted here as they end, at constant cost. Latency
+percentiles cover the last one to two hours, token counts the last hour,
+and tool and fallback counters grow from startup. Sensors read the
+aggregates on their own, throttled schedule.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import TYPE_CHECKING
+
+from .spans import LatencyHistogram
+
+if TYPE_CHECKING:
+    from .traces import TurnTrace
+
+# Seconds summed by the per-hour counters and covered by each latency half
+METRICS_WINDOW = 3600
+# Seconds of one bucket of the per-hour counters
+METRICS_BUCKET = 60
+
+
+class HourlyCounter:
+    """Sum of values added within the last window, in fixed buckets."""
+
+    def __init__(self, window: float = METRICS_WINDOW, bucket: float = METRICS_BUCKET) -> None:
+        """Initialize the counter."""
+        self.window = window
+        self.bucket = bucket
+        self._buckets: deque[list[float]] = deque()
+
+    def add(self, value: float, now: float) -> None:
+        """Add a value at a point in time."""
+        start = now - now % self.bucket
+        if self._buckets and self._buckets[-1][0] == start:
+            self._buckets[-1][1] += value
+        else:
+            self._buckets.append([start, value])
+        self._prune(now)
+
+    def total(self, now: float) -> float:
+        """Return the sum of the values of the last window."""
+        self._prune(now)
+        return sum(value for _, value in self._buckets)
+
+    def _prune(self, now: float) -> None:
+        while self._buckets and self._buckets[0][0] <= now - self.window:
+            self._buckets.popleft()
+
+
+class RollingHistogram:
+    """Latency histogram of the current and the previous period."""
+
+    def __init__(self, period: float = METRICS_WINDOW) -> None:
+        """Initialize the histogram."""
+        self.period = period
+        self._current = LatencyHistogram()
+        self._previous = LatencyHistogram()
+        self._rotated: float | None = None
+
+    def record(self, ms: float, now: float) -> None:
+        """Count one latency."""
+        self._rotate(now)
+        self._current.record(ms)
+
+    def percentile(self, percent: float, now: float) -> float | None:
+        """Return a percentile over the current and the previous period."""
+        self._rotate(now)
+        return LatencyHistogram.merge(self._previous, self._current).percentile(percent)
+
+    def _rotate(self, now: float) -> None:
+        if self._rotated is None:
+            self._rotated = now
+        elif now - self._rotated >= 2 * self.period:
+            self._previous, self._current = LatencyHistogram(), LatencyHistogram()
+            self._rotated = now
+        elif now - self._rotated >= self.period:
+            self._previous, self._current = self._current, LatencyHistogram()
+            self._rotated = now
+
+
+class PerformanceMetrics:
+    """Latency, token, tool and fallback aggregates of finished turns."""
+
+    def __init__(self) -> None:
+        """Initialize empty aggregates."""
+        self.latency = RollingHistogram()
+        self.first_token = RollingHistogram()
+        self.input_tokens = HourlyCounter()
+        self.output_tokens = HourlyCounter()
+        self.cached_tokens = HourlyCounter()
+        self.turns = 0
+        self.tool_calls = 0
+        self.tool_failures = 0
+        self.fallbacks = 0
+
+    def record(self, trace: TurnTrace, now: float | None = None) -> None:
+        """Count a finished turn."""
+        if now is None:
+            now = time.monotonic()
+        self.turns += 1
+        if "total" in trace.timings:
+            self.latency.record(trace.timings["total"], now)
+        if "ttfb" in trace.timings:
+            self.first_token.record(trace.timings["ttfb"], now)
+        if trace.usage:
+            self.input_tokens.add(trace.usage.get("input_tokens", 0), now)
+            self.output_tokens.add(trace.usage.get("output_tokens", 0), now)
+            self.cached_tokens.add(trace.usage.get("cached_tokens", 0), now)
+        self.tool_calls += len(trace.tool_calls)
+        self.tool_failures += sum(1 for call in trace.tool_calls if "error" in call)
+        self.fallbacks += len(trace.fallbacks)
+
+    def cache_hit_rate(self, now: float) -> float | None:
+        """Return the share of input tokens of the last hour served from the prompt cache, in percent."""
+        input_tokens = self.input_tokens.total(now)
+        if not input_tokens:
+            return None
+        return round(100 * self.cached_tokens.total(now) / input_tokens, 1)
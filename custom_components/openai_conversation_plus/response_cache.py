@@ -0,0 +1,208 @@
+"""Answer cache for repeated read-only questions."""
+
+from __future__ import annotations
+
+import logging
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from .const import INTEGRATION_VERSION
+from .local_intents import normalize
+
+_LOGGER = logging.getLogger(__name__)
+
+# Number of answers kept per agent
+MAX_CACHED_ANSWERS = 256
+
+_ENTITY_ID_RE = re.compile(r"^[a-z0-9_]+\.[a-z0-9_]+$")
+
+CacheKey = tuple[str, str, str]
+
+
+@dataclass
+class CachedAnswer:
+    """A cached answer and what it was derived from."""
+
+    answer: str
+    entity_ids: frozenset[str]
+    tools: tuple[str, ...]
+    expires: float
+
+
+@dataclass
+class CacheStats:
+    """Lookup counters of a response cache."""
+
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    invalidations: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Return the share of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters with the hit rate."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "invalidations": self.invalidations,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hit_rate, 3),
+        }
+
+
+def make_key(text: str, language: str | None, area_id: str | None) -> CacheKey:
+    """Build the cache key of an utterance."""
+    return normalize(text), (language or "").lower(), area_id or ""
+
+
+def entity_ids_in(value: Any) -> set[str]:
+    """Collect strings that look like entity ids from tool arguments."""
+    found: set[str] = set()
+    if isinstance(value, str):
+        if _ENTITY_ID_RE.match(value):
+            found.add(value)
+    elif isinstance(value, dict):
+        for item in value.values():
+            found |= entity_ids_in(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            found |= entity_ids_in(item)
+    return found
+
+
+def entities_read(calls: Iterable[Any]) -> set[str] | None:
+    """Return the entities a turn's tool calls read, or None if that is not fully known.
+
+    Exposed states reach the model through the prompt too, so an answer
+    without tool calls, or with a call that names no entity, may depend on
+    entities it never names.
+    """
+    found: set[str] = set()
+    for call in calls:
+        entity_ids = entity_ids_in(call.arguments)
+        if not entity_ids:
+            return None
+        found |= entity_ids
+    return found or None
+
+
+def mentioned_entities(texts: Iterable[str], exposed: list[dict[str, Any]]) -> set[str]:
+    """Return exposed entities whose id, name or alias occurs in any of the texts."""
+    haystacks = [f" {normalize(text)} " for text in texts if text]
+    found: set[str] = set()
+    for entity in exposed:
+        names = [entity["entity_id"], entity.get("name"), *(entity.get("aliases") or [])]
+        for name in names:
+            needle = normalize(name or "")
+            if needle and any(f" {needle} " in haystack for haystack in haystacks):
+                found.add(entity["entity_id"])
+                break
+    return found
+
+
+class ResponseCache:
+    """LRU cache of answers, invalidated by state changes and a TTL.
+
+    Each answer records the entities it was derived from; a state change of
+    any of them drops the answer. Answers without known entities are never
+    stored, since nothing could invalidate them before the TTL.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = MAX_CACHED_ANSWERS) -> None:
+        """Initialize the cache."""
+        self.ttl = float(ttl)
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._entries: OrderedDict[CacheKey, CachedAnswer] = OrderedDict()
+        self._by_entity: dict[str, set[CacheKey]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of cached answers."""
+        return len(self._entries)
+
+    def get(self, key: CacheKey, now: float | None = None) -> CachedAnswer | None:
+        """Return a fresh answer for the key, counting the lookup."""
+        now = time.monotonic() if now is None else now
+        cached = self._entries.get(key)
+        if cached is not None and cached.expires <= now:
+            self._remove(key)
+            self.stats.expirations += 1
+            cached = None
+        if cached is None:
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return cached
+
+    def put(
+        self,
+        key: CacheKey,
+        answer: str,
+        entity_ids: Iterable[str],
+        tools: Iterable[str] = (),
+        now: float | None = None,
+    ) -> bool:
+        """Store an answer; returns False if it cannot be invalidated and was skipped."""
+        entity_ids = frozenset(entity_ids)
+        if not answer or not entity_ids or self.ttl <= 0:
+            return False
+        now = time.monotonic() if now is None else now
+        self._remove(key)
+        self._entries[key] = CachedAnswer(answer, entity_ids, tuple(tools), now + self.ttl)
+        for entity_id in entity_ids:
+            self._by_entity.setdefault(entity_id, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+        self.stats.stores += 1
+        return True
+
+    def tracks(self, entity_id: str) -> bool:
+        """Return True if any cached answer depends on the entity."""
+        return entity_id in self._by_entity
+
+    def invalidate_entity(self, entity_id: str) -> int:
+        """Drop every answer that depends on the entity; returns how many."""
+        keys = self._by_entity.pop(entity_id, set())
+        for key in keys:
+            self._remove(key)
+        self.stats.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop all answers."""
+        self._entries.clear()
+        self._by_entity.clear()
+
+    def _remove(self, key: CacheKey) -> None:
+        cached = self._entries.pop(key, None)
+        if cached is None:
+            return
+        for entity_id in cached.entity_ids:
+            keys = self._by_entity.get(entity_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_entity[entity_id]
+
+
+def log_lookup(key: CacheKey, cached: CachedAnswer | None, stats: CacheStats) -> None:
+    """Log a cache lookup with the running hit rate."""
+    _LOGGER.debug(
+        "[v%s] Response cache %s for %r (hit rate %.0f%% of %d lookups)",
+        INTEGRATION_VERSION,
+        "hit" if cached else "miss",
+        key[0],
+        stats.hit_rate * 100,
+        stats.hits + stats.misses,
+    )
@@ -0,0 +1,164 @@
+"""Per-turn routing of the model, reasoning effort and output size.
+
+A route table, ordered and first match wins, maps cheap features of the
+utterance to request settings. This lets short device commands go to a
+fast model with little reasoning while open questions keep the configured
+model.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+import yaml
+
+from .const import DEFAULT_ROUTING_TABLE, INTEGRATION_VERSION
+from .keywords import detect_action
+
+_LOGGER = logging.getLogger(__name__)
+
+# Conditions a route may test
+MATCH_KEYS = ("action", "question", "tools", "min_words", "max_words")
+
+_QUESTION_REASONS = ("question word", "question mark")
+
+
+@dataclass(frozen=True)
+class TurnFeatures:
+    """What the router knows about an utterance."""
+
+    action: bool
+    question: bool
+    words: int
+    tools: bool
+
+    @classmethod
+    def from_text(cls, text: str, language: str | None, mentions_entity: bool = False) -> TurnFeatures:
+        """Classify an utterance; `mentions_entity` tells if it names an exposed entity."""
+        decision = detect_action(text, language)
+        return cls(
+            action=decision.force,
+            question=decision.reason in _QUESTION_REASONS,
+            words=len((text or "").split()),
+            tools=decision.force or mentions_entity,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the features for logging."""
+        return {"action": self.action, "question": self.question, "words": self.words, "tools": self.tools}
+
+
+@dataclass(frozen=True)
+class Route:
+    """Request settings for turns matching its conditions; None keeps the configured value."""
+
+    name: str
+    when: tuple[tuple[str, Any], ...] = ()
+    model: str | None = None
+    reasoning: str | None = None
+    verbosity: str | None = None
+    max_output_tokens: int | None = None
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any], index: int) -> Route:
+        """Build a route from one entry of the routing table."""
+        when = config.get("when") or {}
+        if not isinstance(when, dict):
+            raise ValueError(f"route {index + 1}: `when` must be a mapping")
+        unknown = set(when) - set(MATCH_KEYS)
+        if unknown:
+            raise ValueError(f"route {index + 1}: unknown conditions {sorted(unknown)}")
+        max_output_tokens = config.get("max_output_tokens")
+        return cls(
+            name=str(config.get("name") or f"route_{index + 1}"),
+            when=tuple(sorted(when.items())),
+            model=config.get("model") or None,
+            reasoning=config.get("reasoning") or None,
+            verbosity=config.get("verbosity") or None,
+            max_output_tokens=int(max_output_tokens) if max_output_tokens else None,
+        )
+
+    def matches(self, features: TurnFeatures) -> bool:
+        """Return True if every condition holds for the features."""
+        for key, expected in self.when:
+            if key == "min_words":
+                if features.words < int(expected):
+                    return False
+            elif key == "max_words":
+                if features.words > int(expected):
+                    return False
+            elif getattr(features, key) != bool(expected):
+                return False
+        return True
+
+
+# Used when no route matches or the table is invalid
+CONFIGURED_ROUTE = Route("configured")
+
+
+@lru_cache(maxsize=8)
+def parse_routes(raw: str) -> tuple[Route, ...]:
+    """Parse a YAML routing table; raises ValueError if it is invalid."""
+    try:
+        data = yaml.safe_load(raw) if raw and raw.strip() else DEFAULT_ROUTING_TABLE
+    except yaml.YAMLError as err:
+        raise ValueError(f"invalid YAML: {err}") from err
+    if not isinstance(data, list) or not all(isinstance(item, dict) for item in data):
+        raise ValueError("the routing table must be a list of routes")
+    return tuple(Route.from_config(item, index) for index, item in enumerate(data))
+
+
+def choose_route(raw: str, features: TurnFeatures) -> Route:
+    """Return the first route of the table matching the features."""
+    try:
+        routes = parse_routes(raw)
+    except ValueError as err:
+        _LOGGER.warning("[v%s] Ignoring routing table: %s", INTEGRATION_VERSION, err)
+        return CONFIGURED_ROUTE
+    return next((route for route in routes if route.matches(features)), CONFIGURED_ROUTE)
+
+
+@dataclass
+class RouteStats:
+    """Turn latency of one route."""
+
+    turns: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_ms: float = 0.0
+
+    @property
+    def mean_ms(self) -> float:
+        """Return the mean turn latency."""
+        return self.total_ms / self.turns if self.turns else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters for diagnostics."""
+        return {
+            "turns": self.turns,
+            "mean_ms": round(self.mean_ms),
+            "max_ms": round(self.max_ms),
+            "last_ms": round(self.last_ms),
+        }
+
+
+@dataclass
+class RouterStats:
+    """Turn latency per route."""
+
+    routes: dict[str, RouteStats] = field(default_factory=dict)
+
+    def record(self, route: str, elapsed_ms: float) -> None:
+        """Record the latency of a finished turn."""
+        stats = self.routes.setdefault(route, RouteStats())
+        stats.turns += 1
+        stats.total_ms += elapsed_ms
+        stats.max_ms = max(stats.max_ms, elapsed_ms)
+        stats.last_ms = elapsed_ms
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters of every route."""
+        return {name: stats.as_dict() for name, stats in self.routes.items()}
@@ -0,0 +1,412 @@
+"""Rate-limit-aware scheduling of API requests for one config entry.
+
+Requests wait in one bounded queue per priority class and are sent while
+the entry has a free concurrency slot and rate limit left. The limit is
+tracked as token buckets fed by the `x-ratelimit-*` headers of every
+response. Lower classes must leave a share of the bucket to higher ones,
+so bulk AI tasks or image queries cannot starve voice commands. A circuit
+breaker fails requests fast while the API is down instead of letting each
+one wait for its own timeout.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import re
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any
+
+from .const import (
+    CIRCUIT_BREAKER_COOLDOWN,
+    CIRCUIT_BREAKER_THRESHOLD,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    INTEGRATION_VERSION,
+)
+from .exceptions import CircuitOpen, SchedulerBusy
+
+_LOGGER = logging.getLogger(__name__)
+
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+# Pause after a 429 that says nothing about when to retry
+DEFAULT_RETRY_AFTER = 1.0
+
+
+class Priority(IntEnum):
+    """Request classes, most urgent first."""
+
+    INTERACTIVE = 0
+    TASK = 1
+    BACKGROUND = 2
+
+
+# Share of the rate limit a class must leave for more urgent ones
+RESERVED_SHARE = {Priority.INTERACTIVE: 0.0, Priority.TASK: 0.1, Priority.BACKGROUND: 0.25}
+# Queued requests per class before new ones are rejected
+QUEUE_LIMITS = {Priority.INTERACTIVE: 8, Priority.TASK: 32, Priority.BACKGROUND: 16}
+
+
+def parse_duration(value: str | None) -> float | None:
+    """Parse a rate limit reset such as `1s`, `6m0s` or `20ms` into seconds."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_RE.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def _header_int(headers: Mapping[str, str], name: str) -> int | None:
+    try:
+        return int(headers[name])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def is_outage_error(err: BaseException) -> bool:
+    """Return True for errors that mean the API is failing rather than the request."""
+    status = getattr(err, "status_code", None)
+    if status is not None:
+        return status >= 500
+    return isinstance(err, (TimeoutError, ConnectionError)) or type(err).__name__ in (
+        "APIConnectionError",
+        "APITimeoutError",
+    )
+
+
+class TokenBucket:
+    """A rate limit as last reported by the API, refilled in between reports."""
+
+    def __init__(self) -> None:
+        """Initialize an empty bucket; unknown limits do not restrict anything."""
+        self.capacity: int | None = None
+        self._tokens = 0.0
+        self._refill_rate = 0.0
+        self._updated = 0.0
+
+    def update(self, limit: int | None, remaining: int | None, reset: float | None, now: float) -> None:
+        """Take over the limit, remaining budget and time to full refill from response headers."""
+        if limit is None or remaining is None:
+            return
+        self.capacity = limit
+        self._tokens = float(remaining)
+        if reset and reset > 0 and remaining < limit:
+            self._refill_rate = (limit - remaining) / reset
+        elif not self._refill_rate:
+            # Limits are per minute
+            self._refill_rate = limit / 60
+        self._updated = now
+
+    def available(self, now: float) -> float:
+        """Return the budget left now."""
+        if self.capacity is None:
+            return math.inf
+        return min(self.capacity, self._tokens + (now - self._updated) * self._refill_rate)
+
+    def wait_for(self, needed: float, now: float) -> float:
+        """Return the seconds until `needed` is available."""
+        missing = needed - self.available(now)
+        if missing <= 0:
+            return 0.0
+        return missing / self._refill_rate if self._refill_rate > 0 else math.inf
+
+    def take(self, amount: float, now: float) -> None:
+        """Spend budget ahead of the next report."""
+        if self.capacity is not None:
+            self._tokens = self.available(now) - amount
+            self._updated = now
+
+    def empty(self, now: float) -> None:
+        """Mark the budget as spent, as after a 429."""
+        if self.capacity is not None:
+            self._tokens = 0.0
+            self._updated = now
+
+
+class CircuitBreaker:
+    """Opens after consecutive outage errors and lets one request probe after a cooldown."""
+
+    def __init__(self, threshold: int, cooldown: float) -> None:
+        """Initialize a closed breaker."""
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.opened = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    def retry_in(self, now: float) -> float:
+        """Return 0 if a request may be sent, else the seconds until it may."""
+        if self.state == "closed":
+            return 0.0
+        remaining = self._opened_at + self.cooldown - now
+        if remaining > 0:
+            return remaining
+        if self._probing:
+            return self.cooldown
+        self.state = "half_open"
+        return 0.0
+
+    def started(self) -> None:
+        """Note that a request was sent."""
+        if self.state == "half_open":
+            self._probing = True
+
+    def cancelled(self) -> None:
+        """Note that a request was cancelled; it says nothing about the API, so let another probe."""
+        if self.state == "half_open":
+            self._probing = False
+
+    def record(self, err: BaseException | None, now: float) -> None:
+        """Record the outcome of a request."""
+        if err is not None and not is_outage_error(err):
+            if self.state == "half_open":
+                self._probing = False
+            return
+        if err is None:
+            if self.state != "closed":
+                _LOGGER.info("[v%s] OpenAI API recovered, closing circuit", INTEGRATION_VERSION)
+            self.state = "closed"
+            self.failures = 0
+            self._probing = False
+            return
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.threshold:
+            if self.state != "open":
+                self.opened += 1
+                _LOGGER.warning(
+                    "[v%s] OpenAI API failing (%s), failing requests fast for %.0fs",
+                    INTEGRATION_VERSION,
+                    err,
+                    self.cooldown,
+                )
+            self.state = "open"
+            self._opened_at = now
+            self._probing = False
+
+
+@dataclass
+class QueueStats:
+    """Queue metrics of one priority class."""
+
+    depth: int = 0
+    max_depth: int = 0
+    started: int = 0
+    rejected: int = 0
+    failed_fast: int = 0
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+
+    @property
+    def mean_wait_ms(self) -> float:
+        """Return the mean time requests waited to be sent."""
+        return self.total_wait_ms / self.started if self.started else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for diagnostics."""
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "started": self.started,
+            "rejected": self.rejected,
+            "failed_fast": self.failed_fast,
+            "mean_wait_ms": round(self.mean_wait_ms),
+            "max_wait_ms": round(self.max_wait_ms),
+        }
+
+
+class RequestScheduler:
+    """Priority queues, rate limit and circuit breaker in front of the API."""
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        failure_threshold: int = CIRCUIT_BREAKER_THRESHOLD,
+        cooldown: float = CIRCUIT_BREAKER_COOLDOWN,
+        queue_limits: Mapping[Priority, int] = QUEUE_LIMITS,
+    ) -> None:
+        """Initialize the scheduler."""
+        self.max_concurrency = max(1, max_concurrency)
+        self.queue_limits = dict(queue_limits)
+        self.requests = TokenBucket()
+        self.tokens = TokenBucket()
+        self.breaker = CircuitBreaker(failure_threshold, cooldown)
+        self.stats = {priority: QueueStats() for priority in Priority}
+        self.in_flight = 0
+        self._paused_until = 0.0
+        self._queues: dict[Priority, deque[asyncio.Future[None]]] = {priority: deque() for priority in Priority}
+        self._timer: asyncio.TimerHandle | None = None
+
+    @property
+    def queued(self) -> int:
+        """Return the number of requests waiting for a slot."""
+        return sum(len(queue) for queue in self._queues.values())
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority) -> AsyncIterator[None]:
+        """Wait for permission to send a request and hold it while the request runs."""
+        await self._async_acquire(priority)
+        try:
+            yield
+        except BaseException as err:
+            self._release(err)
+            raise
+        self._release(None)
+
+    def observe_response(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """Update the rate limits from a response; called for every API response."""
+        now = time.monotonic()
+        self.requests.update(
+            _header_int(headers, "x-ratelimit-limit-requests"),
+            _header_int(headers, "x-ratelimit-remaining-requests"),
+            parse_duration(headers.get("x-ratelimit-reset-requests")),
+            now,
+        )
+        self.tokens.update(
+            _header_int(headers, "x-ratelimit-limit-tokens"),
+            _header_int(headers, "x-ratelimit-remaining-tokens"),
+            parse_duration(headers.get("x-ratelimit-reset-tokens")),
+            now,
+        )
+        if status_code == 429:
+            retry_after = (
+                parse_duration(headers.get("retry-after"))
+                or parse_duration(headers.get("x-ratelimit-reset-requests"))
+                or DEFAULT_RETRY_AFTER
+            )
+            self._paused_until = max(self._paused_until, now + retry_after)
+            self.requests.empty(now)
+            _LOGGER.info("[v%s] Rate limited, pausing requests for %.1fs", INTEGRATION_VERSION, retry_after)
+        self._dispatch()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return queue, rate limit and circuit metrics."""
+        now = time.monotonic()
+        return {
+            "in_flight": self.in_flight,
+            "circuit": self.breaker.state,
+            "circuit_opened": self.breaker.opened,
+            "requests_remaining": _rounded(self.requests.available(now)),
+            "tokens_remaining": _rounded(self.tokens.available(now)),
+            "queues": {priority.name.lower(): self.stats[priority].as_dict() for priority in Priority},
+        }
+
+    def _wait_time(self, priority: Priority, now: float) -> float:
+        """Return 0 if a request of the class may start now, else how long until it may."""
+        if self.in_flight >= self.max_concurrency:
+            # A finishing request dispatches the next one
+            return math.inf
+        if now < self._paused_until:
+            return self._paused_until - now
+        share = RESERVED_SHARE[priority]
+        wait = self.requests.wait_for((self.requests.capacity or 0) * share + 1, now)
+        if self.tokens.capacity:
+            wait = max(wait, self.tokens.wait_for(self.tokens.capacity * share + 1, now))
+        return wait
+
+    async def _async_acquire(self, priority: Priority) -> None:
+        stats = self.stats[priority]
+        now = time.monotonic()
+        if retry_in := self.breaker.retry_in(now):
+            stats.failed_fast += 1
+            raise CircuitOpen(retry_in)
+
+        # Requests of the same or a more urgent class that are already waiting go first
+        ahead = any(self._queues[p] for p in Priority if p <= priority)
+        if not ahead and self._wait_time(priority, now) == 0:
+            self._start(priority, 0.0, now)
+            return
+
+        queue = self._queues[priority]
+        if len(queue) >= self.queue_limits[priority]:
+            stats.rejected += 1
+            raise SchedulerBusy(priority.name.lower(), len(queue))
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        queue.append(waiter)
+        stats.depth = len(queue)
+        stats.max_depth = max(stats.max_depth, stats.depth)
+        self._dispatch()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter in queue:
+                queue.remove(waiter)
+                stats.depth = len(queue)
+            elif waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+                # Granted just before the cancellation
+                self._release(None, count=False)
+            raise
+        self._start(priority, (time.monotonic() - now) * 1000, time.monotonic(), dispatched=True)
+
+    def _start(self, priority: Priority, waited_ms: float, now: float, dispatched: bool = False) -> None:
+        if not dispatched:
+            self.in_flight += 1
+            self.requests.take(1, now)
+        self.breaker.started()
+        stats = self.stats[priority]
+        stats.started += 1
+        stats.total_wait_ms += waited_ms
+        stats.max_wait_ms = max(stats.max_wait_ms, waited_ms)
+        if waited_ms >= 1000:
+            _LOGGER.debug("[v%s] %s request waited %.0f ms", INTEGRATION_VERSION, priority.name, waited_ms)
+
+    def _release(self, err: BaseException | None, count: bool = True) -> None:
+        self.in_flight -= 1
+        if isinstance(err, asyncio.CancelledError):
+            self.breaker.cancelled()
+        elif count:
+            self.breaker.record(err, time.monotonic())
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Start queued requests in priority order while limits allow."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        now = time.monotonic()
+        for priority in Priority:
+            queue = self._queues[priority]
+            while queue:
+                if retry_in := self.breaker.retry_in(now):
+                    # Nothing will get through; fail everything waiting
+                    self._fail_all(CircuitOpen(retry_in))
+                    return
+                wait = self._wait_time(priority, now)
+                if wait > 0:
+                    if math.isfinite(wait):
+                        self._timer = asyncio.get_running_loop().call_later(wait, self._dispatch)
+                    # Less urgent classes wait behind this one
+                    return
+                waiter = queue.popleft()
+                self.stats[priority].depth = len(queue)
+                if waiter.done():
+                    continue
+                self.in_flight += 1
+                self.requests.take(1, now)
+                waiter.set_result(None)
+
+    def _fail_all(self, err: Exception) -> None:
+        for priority, queue in self._queues.items():
+            while queue:
+                waiter = queue.popleft()
+                if not waiter.done():
+                    self.stats[priority].failed_fast += 1
+                    waiter.set_exception(err)
+            self.stats[priority].depth = 0
+
+
+def _rounded(value: float) -> int | None:
+    return None if math.isinf(value) else int(value)
@@ -0,0 +1,136 @@
+"""Performance sensors of OpenAI Conversation Plus."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+from homeassistant.helpers.typing import StateType
+
+from .const import DOMAIN
+from .metrics import PerformanceMetrics
+from .scheduler import RequestScheduler
+
+# Sensors read the in-memory aggregates at this pace, not on every turn
+SCAN_INTERVAL = timedelta(seconds=60)
+PARALLEL_UPDATES = 0
+
+
+@dataclass(frozen=True, kw_only=True)
+class PerformanceSensorDescription(SensorEntityDescription):
+    """A performance sensor and how its value is read."""
+
+    value_fn: Callable[[PerformanceMetrics, RequestScheduler | None, float], StateType]
+
+
+def _latency(key: str, name: str, value_fn: Callable[..., StateType]) -> PerformanceSensorDescription:
+    return PerformanceSensorDescription(
+        key=key,
+        name=name,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        value_fn=value_fn,
+    )
+
+
+def _tokens(key: str, name: str, value_fn: Callable[..., StateType]) -> PerformanceSensorDescription:
+    return PerformanceSensorDescription(
+        key=key,
+        name=name,
+        native_unit_of_measurement="tokens",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=value_fn,
+    )
+
+
+def _counter(key: str, name: str, value_fn: Callable[..., StateType]) -> PerformanceSensorDescription:
+    return PerformanceSensorDescription(
+        key=key,
+        name=name,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=value_fn,
+    )
+
+
+SENSORS: tuple[PerformanceSensorDescription, ...] = (
+    _latency("turn_latency_p50", "Turn latency p50", lambda m, s, now: m.latency.percentile(50, now)),
+    _latency("turn_latency_p95", "Turn latency p95", lambda m, s, now: m.latency.percentile(95, now)),
+    _latency("time_to_first_token", "Time to first token", lambda m, s, now: m.first_token.percentile(50, now)),
+    _tokens("input_tokens_per_hour", "Input tokens last hour", lambda m, s, now: int(m.input_tokens.total(now))),
+    _tokens("output_tokens_per_hour", "Output tokens last hour", lambda m, s, now: int(m.output_tokens.total(now))),
+    _tokens("cached_tokens_per_hour", "Cached tokens last hour", lambda m, s, now: int(m.cached_tokens.total(now))),
+    PerformanceSensorDescription(
+        key="prompt_cache_hit_rate",
+        name="Prompt cache hit rate",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda m, s, now: m.cache_hit_rate(now),
+    ),
+    _counter("tool_calls", "Tool calls", lambda m, s, now: m.tool_calls),
+    _counter("tool_call_failures", "Tool call failures", lambda m, s, now: m.tool_failures),
+    _counter("fallback_activations", "Fallback activations", lambda m, s, now: m.fallbacks),
+    PerformanceSensorDescription(
+        key="request_queue_depth",
+        name="Request queue depth",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda m, s, now: s.queued if s is not None else None,
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddConfigEntryEntitiesCallback,
+) -> None:
+    """Set up the performance sensors if they are enabled."""
+    metrics = hass.data.get(DOMAIN, {}).get(entry.entry_id, {}).get("metrics")
+    if metrics is None:
+        return
+    async_add_entities((PerformanceSensor(entry, metrics, description) for description in SENSORS), True)
+
+
+class PerformanceSensor(SensorEntity):
+    """A sensor of the performance aggregates of an entry."""
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    entity_description: PerformanceSensorDescription
+
+    def __init__(
+        self,
+        entry: ConfigEntry,
+        metrics: PerformanceMetrics,
+        description: PerformanceSensorDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        self.entity_description = description
+        self._entry = entry
+        self._metrics = metrics
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=entry.title,
+            manufacturer="OpenAI",
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    async def async_update(self) -> None:
+        """Read the current value from the aggregates."""
+        scheduler = self.hass.data.get(DOMAIN, {}).get(self._entry.entry_id, {}).get("scheduler")
+        self._attr_native_value = self.entity_description.value_fn(self._metrics, scheduler, time.monotonic())
@@ -1,6 +1,8 @@
-import base64
+import asyncio
 import logging
-import mimetypes
+import time
+from contextlib import nullcontext
+from datetime import datetime
 from pathlib import Path
 from urllib.parse import urlparse
 
@@ -18,7 +20,24 @@ from homeassistant.helpers.typing import ConfigType
 from openai import AsyncOpenAI
 from openai._exceptions import OpenAIError
 
-from .const import DOMAIN, SERVICE_QUERY_IMAGE, GPT5_MODELS, INTEGRATION_VERSION
+from .const import (
+    CAMERA_IMAGE_TIMEOUT,
+    DEFAULT_FRAME_CHANGE_THRESHOLD,
+    DEFAULT_IMAGE_MAX_EDGE,
+    DEFAULT_IMAGE_QUALITY,
+    DEFAULT_QUERY_IMAGE_CONCURRENCY,
+    DOMAIN,
+    GPT5_MODELS,
+    INTEGRATION_VERSION,
+    MAX_QUERY_IMAGE_CONCURRENCY,
+    SERVICE_DUMP_TRACES,
+    SERVICE_QUERY_IMAGE,
+    VERBOSITY_COMPAT_MAP,
+)
+from .frame_gate import FrameGate
+from .images import ImageCache, ImageOptions, PreparedImage, encode_image_bytes, prepare_image
+from .scheduler import Priority, RequestScheduler
+from .traces import write_traces
 
 QUERY_IMAGE_SCHEMA = vol.Schema(
     {
@@ -29,10 +48,38 @@ QUERY_IMAGE_SCHEMA = vol.Schema(
         ),
         vol.Required("model", default="gpt-5"): cv.string,  # Ändra till GPT-5
         vol.Required("prompt"): cv.string,
-        vol.Required("images"): vol.All(cv.ensure_list, [{"url": cv.string}]),
+        vol.Required("images"): vol.All(
+            cv.ensure_list,
+            [{vol.Required("url"): cv.string, vol.Optional("prompt"): cv.string}],
+        ),
         vol.Optional("max_tokens", default=300): cv.positive_int,
         vol.Optional("reasoning_level", default="medium"): cv.string,  # Lägg till GPT-5 parametrar
         vol.Optional("verbosity", default="medium"): cv.string,
+        vol.Optional("per_image", default=False): cv.boolean,
+        vol.Optional("max_concurrency", default=DEFAULT_QUERY_IMAGE_CONCURRENCY): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_QUERY_IMAGE_CONCURRENCY)
+        ),
+        vol.Optional("max_edge", default=DEFAULT_IMAGE_MAX_EDGE): vol.All(
+            vol.Coerce(int), vol.Range(min=0)
+        ),
+        vol.Optional("quality", default=DEFAULT_IMAGE_QUALITY): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=95)
+        ),
+        vol.Optional("skip_unchanged", default=False): cv.boolean,
+        vol.Optional("change_threshold", default=DEFAULT_FRAME_CHANGE_THRESHOLD): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=64)
+        ),
+    }
+)
+
+DUMP_TRACES_SCHEMA = vol.Schema(
+    {
+        vol.Required("config_entry"): selector.ConfigEntrySelector(
+            {
+                "integration": DOMAIN,
+            }
+        ),
+        vol.Optional("limit"): vol.All(vol.Coerce(int), vol.Range(min=1)),
     }
 )
 
@@ -41,84 +88,95 @@ _LOGGER = logging.getLogger(__package__)
 
 async def async_setup_services(hass: HomeAssistant, config: ConfigType) -> None:
     """Set up services for the openai conversation plus component."""
+    # Repeated queries on an unchanged file reuse its encoding
+    image_cache = ImageCache()
+    # Unchanged camera frames and files reuse the answer of their last analysis
+    frame_gate = FrameGate()
 
     async def query_image(call: ServiceCall) -> ServiceResponse:
-        """Query an image using Responses API with GPT-5 support."""
-        try:
-            model = call.data["model"]
-            reasoning_level = call.data.get("reasoning_level", "medium")
+        """Query images using Responses API with GPT-5 support.
+
+        By default all images go to the model in one request. With
+        `per_image` every image is queried on its own, with its own prompt
+        if given, running at most `max_concurrency` requests at a time.
+        """
+        entry = hass.config_entries.async_get_entry(call.data["config_entry"])
+        client: AsyncOpenAI | None = getattr(entry, "runtime_data", None)
+        if client is None:
+            raise HomeAssistantError("Config entry is not loaded")
+        # Image queries run at background priority behind conversation turns
+        scheduler = hass.data.get(DOMAIN, {}).get(entry.entry_id, {}).get("scheduler")
+
+        model = call.data["model"]
+        # Använd Responses API istället för Chat Completions
+        response_kwargs = {
+            "model": model,
+            "max_output_tokens": call.data["max_tokens"],  # Responses API använder 'max_output_tokens'
+        }
+        # Lägg till GPT-5 specifika parametrar
+        if model in GPT5_MODELS:
+            response_kwargs["reasoning"] = {"effort": call.data.get("reasoning_level", "medium")}
             verbosity = call.data.get("verbosity", "medium")
-            
-            # Skapa messages för Responses API
-            messages = [
-                {
-                    "role": "user", 
-                    "content": call.data["prompt"]
-                }
-            ]
-            
-            # Lägg till bilder som attachments (GPT-5 stöd)
-            if call.data.get("images"):
-                # För GPT-5, hantera bilder som attachments
-                attachments = []
-                for image in call.data["images"]:
-                    attachments.append({
-                        "type": "image_url",
-                        "image_url": to_image_param(hass, image)
-                    })
-                messages[0]["attachments"] = attachments
-
-            _LOGGER.info("[v%s] Prompt for %s: %s", INTEGRATION_VERSION, model, messages)
-
-            # Använd Responses API istället för Chat Completions
-            response_kwargs = {
-                "model": model,
-                "input": messages,  # Responses API använder 'input'
-                "max_output_tokens": call.data["max_tokens"],  # Responses API använder 'max_output_tokens'
-            }
-            
-            # Lägg till GPT-5 specifika parametrar
-            if model in GPT5_MODELS:
-                response_kwargs["reasoning"] = {"effort": reasoning_level}
-                if verbosity:
-                    # Map legacy verbosity values
-                    from .const import VERBOSITY_COMPAT_MAP
-                    mapped_verbosity = VERBOSITY_COMPAT_MAP.get(verbosity, verbosity)
-                    response_kwargs["text"] = {"verbosity": mapped_verbosity}
-
-            _LOGGER.debug("[v%s] Full response_kwargs being sent to API: %s", INTEGRATION_VERSION, response_kwargs)
-
-            response = await AsyncOpenAI(
-                api_key=hass.data[DOMAIN][call.data["config_entry"]]["api_key"]
-            ).responses.create(**response_kwargs)
-            
-            # Extrahera text från Responses API
-            text = getattr(response, "output_text", None)
-            if not text and hasattr(response, "output") and response.output:
+            if verbosity:
+                # Map legacy verbosity values
+                response_kwargs["text"] = {"verbosity": VERBOSITY_COMPAT_MAP.get(verbosity, verbosity)}
+
+        images = call.data["images"]
+        image_options = ImageOptions(call.data["max_edge"], call.data["quality"])
+        gate = frame_gate if call.data["skip_unchanged"] else None
+        threshold = call.data["change_threshold"]
+        if not call.data["per_image"]:
+            try:
+                result = await _async_query(
+                    hass,
+                    client,
+                    response_kwargs,
+                    call.data["prompt"],
+                    images,
+                    image_options,
+                    image_cache,
+                    gate,
+                    threshold,
+                    scheduler,
+                )
+            except OpenAIError as err:
+                raise HomeAssistantError(f"Error generating image response: {err}") from err
+            _LOGGER.info("[v%s] Response %s", INTEGRATION_VERSION, result)
+            return {"model": model, **result}
+
+        semaphore = asyncio.Semaphore(call.data["max_concurrency"])
+
+        async def query_one(image: dict) -> dict:
+            async with semaphore:
+                started = time.monotonic()
                 try:
-                    first = response.output[0]
-                    parts = getattr(first, "content", []) or []
-                    texts = []
-                    for p in parts:
-                        t = getattr(getattr(p, "text", None), "value", None)
-                        if t:
-                            texts.append(t)
-                    text = "\n".join(texts) if texts else None
-                except Exception:
-                    pass
-            
-            response_dict = {
-                "content": text or "",
-                "model": model,
-                "usage": getattr(response, "usage", None)
-            }
-            
-            _LOGGER.info("[v%s] Response %s", INTEGRATION_VERSION, response_dict)
-            
-        except OpenAIError as err:
-            raise HomeAssistantError(f"Error generating image response: {err}") from err
+                    result = await _async_query(
+                        hass,
+                        client,
+                        response_kwargs,
+                        image.get("prompt", call.data["prompt"]),
+                        [image],
+                        image_options,
+                        image_cache,
+                        gate,
+                        threshold,
+                        scheduler,
+                    )
+                except (OpenAIError, HomeAssistantError) as err:
+                    _LOGGER.warning("[v%s] Image query for %s failed: %s", INTEGRATION_VERSION, image["url"], err)
+                    result = {"error": str(err), "latency_ms": _elapsed_ms(started)}
+                return {"url": image["url"], **result}
 
-        return response_dict
+        started = time.monotonic()
+        results = await asyncio.gather(*(query_one(image) for image in images))
+        _LOGGER.info(
+            "[v%s] Queried %d images in %d ms: %s",
+            INTEGRATION_VERSION,
+            len(images),
+            _elapsed_ms(started),
+            [(r["url"], r["latency_ms"]) for r in results],
+        )
+        return {"model": model, "results": results, "latency_ms": _elapsed_ms(started)}
 
     hass.services.async_register(
         DOMAIN,
@@ -128,11 +186,130 @@ async def async_setup_services(hass: HomeAssistant, config: ConfigType) -> None:
         supports_response=SupportsResponse.ONLY,
     )
 
+    async def dump_traces(call: ServiceCall) -> ServiceResponse:
+        """Write the recent turn traces of an entry to a JSON Lines file."""
+        entry_id = call.data["config_entry"]
+        traces = hass.data.get(DOMAIN, {}).get(entry_id, {}).get("traces")
+        if traces is None:
+            raise HomeAssistantError("Config entry is not loaded")
+        lines = traces.lines(call.data.get("limit"))
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = Path(hass.config.path("custom_components", DOMAIN, "logs")) / f"traces_{stamp}.jsonl"
+        try:
+            await hass.async_add_executor_job(write_traces, path, lines)
+        except OSError as err:
+            raise HomeAssistantError(f"Error writing traces: {err}") from err
+        _LOGGER.info("[v%s] Wrote %d turn traces to %s", INTEGRATION_VERSION, len(lines), path)
+        return {"path": str(path), "traces": len(lines)}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DUMP_TRACES,
+        dump_traces,
+        schema=DUMP_TRACES_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+async def _async_query(
+    hass: HomeAssistant,
+    client: AsyncOpenAI,
+    response_kwargs: dict,
+    prompt: str,
+    images: list[dict],
+    image_options: ImageOptions,
+    image_cache: ImageCache | None = None,
+    frame_gate: FrameGate | None = None,
+    change_threshold: int = DEFAULT_FRAME_CHANGE_THRESHOLD,
+    scheduler: RequestScheduler | None = None,
+) -> dict:
+    """Send one prompt with its images and return the answer and latency.
+
+    With a frame gate the previous answer is returned when no image changed
+    by more than `change_threshold` bits since it was analysed.
+    """
+    started = time.monotonic()
+    fingerprint = frame_gate is not None
+    params = await asyncio.gather(
+        *(async_to_image_param(hass, image, image_options, image_cache, fingerprint) for image in images)
+    )
+    if frame_gate is not None:
+        sources = [image["url"] for image in images]
+        gate_key = FrameGate.key(response_kwargs["model"], prompt, sources)
+        fingerprints = [param.get("fingerprint") for param in params]
+        if (hit := frame_gate.check(gate_key, fingerprints, change_threshold)) is not None:
+            previous, distance = hit
+            _LOGGER.debug(
+                "[v%s] Frames of %s unchanged (distance %d), skipping request",
+                INTEGRATION_VERSION,
+                sources,
+                distance,
+            )
+            return {
+                **previous,
+                "latency_ms": _elapsed_ms(started),
+                "frame_gate": {"skipped": True, "distance": distance, "sources": frame_gate.stats(sources)},
+            }
+
+    content: list[dict] = [{"type": "input_text", "text": prompt}]
+    for param in params:
+        content.append({"type": "input_image", "image_url": param["url"]})
+    messages = [{"role": "user", "content": content}]
+
+    _LOGGER.debug("[v%s] Prompt for %s: %s (%d images)", INTEGRATION_VERSION, response_kwargs["model"], prompt, len(images))
+    async with scheduler.slot(Priority.BACKGROUND) if scheduler is not None else nullcontext():
+        response = await client.responses.create(input=messages, **response_kwargs)
+
+    # Extrahera text från Responses API
+    text = getattr(response, "output_text", None)
+    if not text and hasattr(response, "output") and response.output:
+        try:
+            first = response.output[0]
+            parts = getattr(first, "content", []) or []
+            texts = []
+            for p in parts:
+                t = getattr(getattr(p, "text", None), "value", None)
+                if t:
+                    texts.append(t)
+            text = "\n".join(texts) if texts else None
+        except Exception:
+            pass
 
-def to_image_param(hass: HomeAssistant, image) -> dict:
-    """Convert url to base64 encoded image if local."""
+    usage = getattr(response, "usage", None)
+    result = {
+        "content": text or "",
+        "usage": usage.model_dump() if hasattr(usage, "model_dump") else usage,
+    }
+    if frame_gate is None:
+        return {**result, "latency_ms": _elapsed_ms(started)}
+    frame_gate.remember(gate_key, fingerprints, result)
+    return {
+        **result,
+        "latency_ms": _elapsed_ms(started),
+        "frame_gate": {"skipped": False, "sources": frame_gate.stats(sources)},
+    }
+
+
+def _elapsed_ms(started: float) -> int:
+    return round((time.monotonic() - started) * 1000)
+
+
+async def async_to_image_param(
+    hass: HomeAssistant,
+    image: dict,
+    options: ImageOptions,
+    cache: ImageCache | None = None,
+    fingerprint: bool = False,
+) -> dict:
+    """Convert url to base64 encoded image if local, preparing it in an executor.
+
+    With `fingerprint` local images and camera frames also get a frame hash.
+    """
     url = image["url"]
 
+    if url.startswith("camera."):
+        return _image_param(await async_camera_image(hass, url, options, fingerprint))
+
     if urlparse(url).scheme in cv.EXTERNAL_URL_PROTOCOL_SCHEMA_LIST:
         return {"url": url}
 
@@ -142,16 +319,26 @@ def to_image_param(hass: HomeAssistant, image) -> dict:
             "`allowlist_external_dirs` may need to be adjusted in "
             "`configuration.yaml`"
         )
-    if not Path(url).exists():
-        raise HomeAssistantError(f"`{url}` does not exist")
-    mime_type, _ = mimetypes.guess_type(url)
-    if mime_type is None or not mime_type.startswith("image"):
-        raise HomeAssistantError(f"`{url}` is not an image")
 
-    return {"url": f"data:{mime_type};base64,{encode_image(url)}"}
+    return _image_param(await hass.async_add_executor_job(prepare_image, url, options, cache, fingerprint))
+
 
+def _image_param(prepared: PreparedImage) -> dict:
+    return {"url": prepared.data_url, "fingerprint": prepared.fingerprint}
 
-def encode_image(image_path):
-    """Convert to base64 encoded image."""
-    with open(image_path, "rb") as image_file:
-        return base64.b64encode(image_file.read()).decode("utf-8")
+
+async def async_camera_image(
+    hass: HomeAssistant,
+    entity_id: str,
+    options: ImageOptions,
+    fingerprint: bool = False,
+) -> PreparedImage:
+    """Capture a camera frame in memory and prepare it for upload."""
+    from homeassistant.components import camera
+
+    if hass.states.get(entity_id) is None:
+        raise HomeAssistantError(f"`{entity_id}` does not exist")
+    image = await camera.async_get_image(hass, entity_id, timeout=CAMERA_IMAGE_TIMEOUT)
+    return await hass.async_add_executor_job(
+        encode_image_bytes, image.content, image.content_type, options, fingerprint
+    )
@@ -0,0 +1,186 @@
+"""Latency spans of the phases of a conversation turn and their histograms.
+
+A turn measures how long it spends rendering the prompt, collecting the
+exposed entities, building tools, waiting for the first byte, streaming,
+running tools and in the non-streaming fallback loop. Phases entered more
+than once in a turn add up. Finished turns feed per-phase histograms with
+fixed logarithmic buckets, so percentiles cost constant memory however
+many turns are recorded. With spans off, turns get a recorder that does
+nothing.
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+import time
+from typing import Any
+
+# Bucket bounds grow by this factor, bounding the error of a percentile to 15 %
+BUCKET_GROWTH = 1.15
+MIN_BUCKET_MS = 1.0
+MAX_BUCKET_MS = 600_000.0
+PERCENTILES = (50, 95, 99)
+
+_BOUNDS: tuple[float, ...] = tuple(
+    MIN_BUCKET_MS * BUCKET_GROWTH**index
+    for index in range(math.ceil(math.log(MAX_BUCKET_MS / MIN_BUCKET_MS, BUCKET_GROWTH)) + 1)
+)
+
+
+class TurnSpans:
+    """Time spent in each phase of one turn, in milliseconds."""
+
+    __slots__ = ("phases", "_started")
+
+    enabled = True
+
+    def __init__(self) -> None:
+        """Start timing the turn."""
+        self.phases: dict[str, float] = {}
+        self._started = time.perf_counter()
+
+    @staticmethod
+    def start() -> float:
+        """Return the start of a span."""
+        return time.perf_counter()
+
+    def end(self, phase: str, started: float) -> float:
+        """Add the time since `started` to a phase and return the end of the span."""
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + (now - started) * 1000
+        return now
+
+    def add(self, phase: str, ms: float) -> None:
+        """Add time measured elsewhere to a phase."""
+        self.phases[phase] = self.phases.get(phase, 0.0) + ms
+
+    def finish(self) -> dict[str, float]:
+        """Record the total time of the turn and return all phases, rounded."""
+        self.end("total", self._started)
+        return self.as_dict()
+
+    def as_dict(self) -> dict[str, float]:
+        """Return the phases, rounded to a tenth of a millisecond."""
+        return {phase: round(ms, 1) for phase, ms in self.phases.items()}
+
+
+class _DisabledSpans(TurnSpans):
+    """Spans of a turn that is not timed."""
+
+    __slots__ = ()
+
+    enabled = False
+
+    def __init__(self) -> None:
+        """Initialize without a start time."""
+        self.phases = {}
+        self._started = 0.0
+
+    @staticmethod
+    def start() -> float:
+        """Return a start that is never used."""
+        return 0.0
+
+    def end(self, phase: str, started: float) -> float:
+        """Do nothing."""
+        return 0.0
+
+    def add(self, phase: str, ms: float) -> None:
+        """Do nothing."""
+
+    def finish(self) -> dict[str, float]:
+        """Return no phases."""
+        return {}
+
+
+# Shared by all untimed turns; it never holds any phases
+DISABLED_SPANS: TurnSpans = _DisabledSpans()
+
+
+class LatencyHistogram:
+    """Counts of latencies in fixed logarithmic buckets."""
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.counts = [0] * (len(_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @classmethod
+    def merge(cls, *histograms: LatencyHistogram) -> LatencyHistogram:
+        """Return a histogram of the latencies counted by all given histograms."""
+        merged = cls()
+        for histogram in histograms:
+            merged.counts = [a + b for a, b in zip(merged.counts, histogram.counts)]
+            merged.count += histogram.count
+            merged.total += histogram.total
+            merged.max = max(merged.max, histogram.max)
+        return merged
+
+    def record(self, ms: float) -> None:
+        """Count one latency."""
+        self.counts[bisect.bisect_left(_BOUNDS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def percentile(self, percent: float) -> float | None:
+        """Return the upper bound of the bucket holding the percentile, or None if empty."""
+        if not self.count:
+            return None
+        rank = math.ceil(self.count * percent / 100)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(_BOUNDS[index], self.max) if index < len(_BOUNDS) else self.max
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the count, mean, percentiles and maximum."""
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 1) if self.count else None,
+            **{f"p{percent}": _round(self.percentile(percent)) for percent in PERCENTILES},
+            "max": round(self.max, 1),
+        }
+
+
+def _round(value: float | None) -> float | None:
+    return None if value is None else round(value, 1)
+
+
+class PhaseHistograms:
+    """Latency histograms of every phase, fed by finished turns."""
+
+    def __init__(self) -> None:
+        """Initialize without phases."""
+        self.phases: dict[str, LatencyHistogram] = {}
+        self.turns = 0
+
+    def record(self, phases: dict[str, float]) -> None:
+        """Count the phases of a finished turn."""
+        if not phases:
+            return
+        self.turns += 1
+        for phase, ms in phases.items():
+            histogram = self.phases.get(phase)
+            if histogram is None:
+                histogram = self.phases[phase] = LatencyHistogram()
+            histogram.record(ms)
+
+    def get(self, phase: str) -> LatencyHistogram | None:
+        """Return the histogram of a phase."""
+        return self.phases.get(phase)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the percentiles of every phase, slowest total first."""
+        return {
+            "turns": self.turns,
+            "phases": {
+                phase: histogram.as_dict()
+                for phase, histogram in sorted(self.phases.items(), key=lambda item: -item[1].total)
+            },
+        }
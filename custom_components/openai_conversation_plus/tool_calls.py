@@ -0,0 +1,101 @@
+"""Per-turn record and deduplication of tool calls."""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from .const import INTEGRATION_VERSION
+
+_LOGGER = logging.getLogger(__name__)
+
+DUPLICATE_RESULT = {
+    "ok": True,
+    "duplicate": True,
+    "result": "duplicate, already executed earlier in this turn",
+}
+
+
+def canonical_arguments(arguments: Any) -> str:
+    """Serialize tool arguments so equal arguments give equal strings."""
+    return json.dumps(arguments, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+@dataclass
+class ToolCallRecord:
+    """A tool call executed in the current turn."""
+
+    name: str
+    arguments: dict[str, Any]
+    result: dict[str, Any]
+
+    @property
+    def ok(self) -> bool:
+        """Return True unless the result reports a failure."""
+        return self.result.get("ok") is not False
+
+
+class TurnToolCalls:
+    """Tool calls of one turn, keyed by name and canonical arguments.
+
+    A repeated read-only call gets the result of the first one, until a
+    state-changing call runs and may have changed what it read. A
+    state-changing call is not executed again only if it repeats the most
+    recent state-changing call, so on, off, on still ends on. Failed calls
+    are not remembered, so the model may retry them.
+    """
+
+    def __init__(self, is_read_only: Callable[[str], bool] | None = None) -> None:
+        """Initialize the record; tools are state-changing unless `is_read_only` says otherwise."""
+        self.records: list[ToolCallRecord] = []
+        self.duplicates = 0
+        self._is_read_only = is_read_only
+        self._read_only: dict[str, bool] = {}
+        self._reads: dict[tuple[str, str], ToolCallRecord] = {}
+        self._last_write: tuple[str, str] | None = None
+
+    @staticmethod
+    def key(name: str, arguments: Any) -> tuple[str, str]:
+        """Return the memo key of a call."""
+        return name, canonical_arguments(arguments)
+
+    def read_only(self, name: str) -> bool:
+        """Return True if a tool only reads state."""
+        if name not in self._read_only:
+            self._read_only[name] = self._is_read_only is not None and self._is_read_only(name)
+        return self._read_only[name]
+
+    def reuse(self, key: tuple[str, str]) -> dict[str, Any] | None:
+        """Return the result to send instead of running a repeated call, or None to run it."""
+        if self.read_only(key[0]):
+            previous = self._reads.get(key)
+            if previous is None:
+                return None
+            result = previous.result
+        elif key == self._last_write:
+            result = dict(DUPLICATE_RESULT)
+        else:
+            return None
+        self.duplicates += 1
+        _LOGGER.debug(
+            "[v%s] Duplicate tool call %s in this turn, %s",
+            INTEGRATION_VERSION,
+            key[0],
+            "reusing result" if self.read_only(key[0]) else "not executing again",
+        )
+        return result
+
+    def record(self, key: tuple[str, str], name: str, arguments: dict[str, Any], result: dict[str, Any]) -> None:
+        """Record an executed call."""
+        record = ToolCallRecord(name, arguments, result)
+        self.records.append(record)
+        if self.read_only(name):
+            if record.ok:
+                self._reads[key] = record
+            return
+        # Whatever was read before may have changed, even if the call failed part way
+        self._reads.clear()
+        self._last_write = key if record.ok else None
@@ -0,0 +1,205 @@
+"""Size governor for tool results sent back to the model."""
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+from .const import (
+    CONF_TOOL_RESULT_MAX_ITEMS,
+    CONF_TOOL_RESULT_MAX_TOKENS,
+    DEFAULT_TOOL_RESULT_MAX_DEPTH,
+    DEFAULT_TOOL_RESULT_MAX_ITEMS,
+    DEFAULT_TOOL_RESULT_MAX_TOKENS,
+    INTEGRATION_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Rough characters-per-token ratio for compact JSON payloads
+CHARS_PER_TOKEN = 4
+MAX_STRING_CHARS = 2000
+
+
+def estimate_tokens(value: Any) -> int:
+    """Estimate the token count of a JSON-serializable value."""
+    try:
+        text = json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+    except (TypeError, ValueError):
+        text = str(value)
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+@dataclass
+class ResultLimits:
+    """Limits applied to a single tool result."""
+
+    max_tokens: int = DEFAULT_TOOL_RESULT_MAX_TOKENS
+    max_items: int = DEFAULT_TOOL_RESULT_MAX_ITEMS
+    max_depth: int = DEFAULT_TOOL_RESULT_MAX_DEPTH
+    keys: list[str] | None = None
+
+    @classmethod
+    def from_options(cls, options, function_setting: dict | None = None) -> ResultLimits:
+        """Build limits from integration options and a function's `result_limits`."""
+        limits = cls(
+            max_tokens=int(options.get(CONF_TOOL_RESULT_MAX_TOKENS, DEFAULT_TOOL_RESULT_MAX_TOKENS)),
+            max_items=int(options.get(CONF_TOOL_RESULT_MAX_ITEMS, DEFAULT_TOOL_RESULT_MAX_ITEMS)),
+        )
+        overrides = (function_setting or {}).get("result_limits") or {}
+        if isinstance(overrides, dict):
+            for key in ("max_tokens", "max_items", "max_depth"):
+                if overrides.get(key) is not None:
+                    setattr(limits, key, int(overrides[key]))
+            if isinstance(overrides.get("keys"), list):
+                limits.keys = [str(k) for k in overrides["keys"]]
+        return limits
+
+
+@dataclass
+class TrimStats:
+    """What the governor removed from a result."""
+
+    original_tokens: int = 0
+    tokens: int = 0
+    dropped_empty: int = 0
+    dropped_keys: int = 0
+    truncated_lists: int = 0
+    collapsed: int = 0
+    truncated_strings: int = 0
+    cut: bool = False
+
+    @property
+    def trimmed(self) -> bool:
+        """Return True if anything was removed."""
+        return self.tokens < self.original_tokens
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a compact summary for the model and the logs."""
+        summary = {
+            "original_tokens": self.original_tokens,
+            "tokens": self.tokens,
+        }
+        for key in (
+            "dropped_empty",
+            "dropped_keys",
+            "truncated_lists",
+            "collapsed",
+            "truncated_strings",
+            "cut",
+        ):
+            if getattr(self, key):
+                summary[key] = getattr(self, key)
+        return summary
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+class _Trimmer:
+    """Single trimming pass over a result."""
+
+    def __init__(self, limits: ResultLimits, stats: TrimStats, max_items: int) -> None:
+        self.limits = limits
+        self.stats = stats
+        self.max_items = max_items
+
+    def walk(self, value: Any, depth: int = 0) -> Any:
+        if isinstance(value, dict):
+            if depth >= self.limits.max_depth:
+                self.stats.collapsed += 1
+                return f"<object with {len(value)} keys>"
+            out = {}
+            for key, item in value.items():
+                if _is_empty(item):
+                    self.stats.dropped_empty += 1
+                    continue
+                out[key] = self.walk(item, depth + 1)
+            return out
+        if isinstance(value, (list, tuple, set)):
+            items = [item for item in value if not _is_empty(item)]
+            self.stats.dropped_empty += len(value) - len(items)
+            if depth >= self.limits.max_depth:
+                self.stats.collapsed += 1
+                return f"<list with {len(items)} items>"
+            out_list = [self.walk(item, depth + 1) for item in items[: self.max_items]]
+            if len(items) > self.max_items:
+                self.stats.truncated_lists += 1
+                out_list.append(f"... {len(items) - self.max_items} more items")
+            return out_list
+        if isinstance(value, str) and len(value) > MAX_STRING_CHARS:
+            self.stats.truncated_strings += 1
+            return f"{value[:MAX_STRING_CHARS]}... [{len(value) - MAX_STRING_CHARS} chars truncated]"
+        return value
+
+
+def _project(value: Any, keys: set[str], stats: TrimStats) -> Any:
+    """Keep only the declared keys of a result object or list of objects."""
+    if isinstance(value, dict):
+        kept = {k: v for k, v in value.items() if k in keys}
+        stats.dropped_keys += len(value) - len(kept)
+        return kept
+    if isinstance(value, list):
+        return [_project(item, keys, stats) if isinstance(item, dict) else item for item in value]
+    return value
+
+
+def govern_result(value: Any, limits: ResultLimits) -> tuple[Any, TrimStats]:
+    """Shrink a tool result so it fits the configured limits.
+
+    The result is first projected to the declared keys, if any. Results
+    under the token limit are then returned as is. Otherwise empty fields
+    are dropped, structures below the maximum depth are collapsed and long
+    lists are truncated with a count marker; the list limit is halved until
+    the result fits. As a last resort the serialized result is cut off at
+    the token limit.
+    """
+    stats = TrimStats(original_tokens=estimate_tokens(value))
+    if limits.keys:
+        value = _project(value, set(limits.keys), stats)
+    stats.tokens = estimate_tokens(value) if limits.keys else stats.original_tokens
+    if stats.tokens <= limits.max_tokens:
+        return value, stats
+
+    max_items = max(1, limits.max_items)
+    while True:
+        pass_stats = TrimStats(
+            original_tokens=stats.original_tokens,
+            dropped_keys=stats.dropped_keys,
+        )
+        trimmed = _Trimmer(limits, pass_stats, max_items).walk(value)
+        pass_stats.tokens = estimate_tokens(trimmed)
+        if pass_stats.tokens <= limits.max_tokens or max_items == 1:
+            break
+        max_items = max(1, max_items // 2)
+
+    stats = pass_stats
+    if stats.tokens > limits.max_tokens:
+        text = json.dumps(trimmed, ensure_ascii=False, separators=(",", ":"), default=str)
+        trimmed = text[: limits.max_tokens * CHARS_PER_TOKEN] + "... [truncated]"
+        stats.cut = True
+        stats.tokens = estimate_tokens(trimmed)
+    return trimmed, stats
+
+
+def wrap_tool_result(tool_name: str, result: Any, limits: ResultLimits) -> dict[str, Any]:
+    """Govern a raw tool result and wrap it in the payload sent to the model.
+
+    When anything was trimmed, a `_trimmed` summary records how much.
+    """
+    governed, stats = govern_result(result, limits)
+    result_data = {"ok": True, "result": governed} if not isinstance(governed, dict) else dict(governed)
+    if stats.trimmed:
+        _LOGGER.debug(
+            "[v%s] Trimmed result of %s from ~%d to ~%d tokens: %s",
+            INTEGRATION_VERSION,
+            tool_name,
+            stats.original_tokens,
+            stats.tokens,
+            stats.as_dict(),
+        )
+        result_data["_trimmed"] = stats.as_dict()
+    return result_data
@@ -0,0 +1,193 @@
+"""In-memory traces of recent conversation turns, exported on demand.
+
+Every turn records a short trace: what was sent, how long its phases
+took, which tools ran, the tokens used and what failed. Payloads are not
+kept; arguments and results are referenced by a short hash and their size,
+and responses by their id, so a trace can be matched with the API debug
+log when that is on. Finished traces are kept as they are in a ring
+buffer bounded by count; they are serialized, and the model input hashed,
+only when they are dumped, and a dump is bounded by bytes. Nothing is
+written to disk until then.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+# Bytes of serialized traces dumped per entry, whatever the configured count
+MAX_TRACE_BUFFER_BYTES = 512 * 1024
+# Errors and tool calls kept per trace
+MAX_TRACE_ITEMS = 32
+MAX_ERROR_LENGTH = 200
+
+
+def ref(value: Any) -> dict[str, Any] | None:
+    """Return a compact reference to a payload: a short hash and its size."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        data = value.encode()
+    else:
+        data = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str).encode()
+    return {"sha1": hashlib.sha1(data).hexdigest()[:12], "bytes": len(data)}
+
+
+def _usage_value(usage: Any, name: str) -> int:
+    value = usage.get(name) if isinstance(usage, dict) else getattr(usage, name, None)
+    return value if isinstance(value, int) else 0
+
+
+@dataclass
+class TurnTrace:
+    """What happened in one conversation turn."""
+
+    conversation_id: str | None = None
+    trace_id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    started: float = field(default_factory=time.time)
+    outcome: str = "model"
+    request: dict[str, Any] = field(default_factory=dict)
+    timings: dict[str, float] = field(default_factory=dict)
+    tool_calls: list[dict[str, Any]] = field(default_factory=list)
+    usage: dict[str, int] = field(default_factory=dict)
+    errors: list[str] = field(default_factory=list)
+    fallbacks: list[str] = field(default_factory=list)
+    refs: dict[str, Any] = field(default_factory=dict)
+    # The model input, referenced only when the trace is exported
+    input: Any = field(default=None, repr=False)
+    _monotonic: float = field(default_factory=time.monotonic, repr=False)
+    _ended: float | None = field(default=None, repr=False)
+
+    def add_tool_call(self, name: str, arguments: dict[str, Any] | None, result: Any, ms: float) -> None:
+        """Record a tool call; `arguments` is a reference made with `ref` before the call ran."""
+        if len(self.tool_calls) >= MAX_TRACE_ITEMS:
+            return
+        call: dict[str, Any] = {
+            "name": name,
+            "arguments": arguments,
+            "result": ref(result),
+            "ms": round(ms, 1),
+        }
+        if isinstance(result, dict) and result.get("ok") is False:
+            call["error"] = str(result.get("error"))[:MAX_ERROR_LENGTH]
+        self.tool_calls.append(call)
+
+    def add_response(self, response: Any) -> None:
+        """Record the id and token usage of a model response."""
+        response_id = getattr(response, "id", None)
+        if response_id:
+            self.refs.setdefault("responses", []).append(response_id)
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        details = usage.get("input_tokens_details") if isinstance(usage, dict) else getattr(usage, "input_tokens_details", None)
+        for key, value in (
+            ("input_tokens", _usage_value(usage, "input_tokens")),
+            ("output_tokens", _usage_value(usage, "output_tokens")),
+            ("cached_tokens", _usage_value(details, "cached_tokens") if details is not None else 0),
+        ):
+            self.usage[key] = self.usage.get(key, 0) + value
+
+    def add_error(self, err: BaseException | str) -> None:
+        """Record an error, handled or not."""
+        if len(self.errors) >= MAX_TRACE_ITEMS:
+            return
+        message = err if isinstance(err, str) else f"{type(err).__name__}: {err}"
+        self.errors.append(message[:MAX_ERROR_LENGTH])
+
+    def finish(self) -> None:
+        """Mark the end of the turn for its total time."""
+        if self._ended is None:
+            self._ended = time.monotonic()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the trace for export."""
+        return {
+            "trace_id": self.trace_id,
+            "time": datetime.fromtimestamp(self.started, timezone.utc).isoformat(),
+            "conversation_id": self.conversation_id,
+            "outcome": self.outcome,
+            "total_ms": round(((self._ended or time.monotonic()) - self._monotonic) * 1000, 1),
+            "request": {**self.request, "input": ref(self.input)} if self.input is not None else self.request,
+            "timings": self.timings,
+            "tool_calls": self.tool_calls,
+            "usage": self.usage,
+            "errors": self.errors,
+            "fallbacks": self.fallbacks,
+            "refs": self.refs,
+        }
+
+
+class TraceBuffer:
+    """Ring buffer of the most recent turn traces, bounded by count; dumps are bounded by bytes."""
+
+    def __init__(self, max_traces: int, max_bytes: int = MAX_TRACE_BUFFER_BYTES) -> None:
+        """Initialize the buffer."""
+        self.max_traces = max_traces
+        self.max_bytes = max_bytes
+        self._traces: deque[TurnTrace] = deque()
+        self.recorded = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        """Return the number of traces kept."""
+        return len(self._traces)
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if traces are kept."""
+        return self.max_traces > 0
+
+    def add(self, trace: TurnTrace) -> None:
+        """Keep a finished trace, evicting the oldest ones."""
+        if not self.enabled:
+            return
+        trace.finish()
+        self._traces.append(trace)
+        self.recorded += 1
+        while len(self._traces) > self.max_traces:
+            self._traces.popleft()
+            self.evicted += 1
+
+    def resize(self, max_traces: int) -> None:
+        """Change how many traces are kept."""
+        self.max_traces = max_traces
+        while len(self._traces) > max(max_traces, 0):
+            self._traces.popleft()
+            self.evicted += 1
+
+    def lines(self, limit: int | None = None) -> list[str]:
+        """Serialize the most recent traces as JSON lines, oldest first, up to `max_bytes`."""
+        traces = list(self._traces)
+        lines: list[str] = []
+        size = 0
+        for trace in reversed(traces[-limit:] if limit else traces):
+            line = json.dumps(trace.as_dict(), ensure_ascii=False, separators=(",", ":"), default=str)
+            size += len(line)
+            if size > self.max_bytes:
+                break
+            lines.append(line)
+        lines.reverse()
+        return lines
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the buffer counters for diagnostics."""
+        return {
+            "traces": len(self._traces),
+            "recorded": self.recorded,
+            "evicted": self.evicted,
+        }
+
+
+def write_traces(path: Path, lines: list[str]) -> None:
+    """Write traces as JSON Lines; only call from the executor."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        file.writelines(f"{line}\n" for line in lines)
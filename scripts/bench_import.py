@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Measure what importing the integration costs at Home Assistant startup.
+
+Runs `python -X importtime` on the integration package in a fresh
+interpreter and reports the total import time, the slowest top-level
+modules and which Home Assistant components the import pulled in. With
+`--ref`, the same is measured for another git revision (checked out into a
+temporary worktree) so the two can be compared.
+
+Usage:
+    python scripts/bench_import.py
+    python scripts/bench_import.py --ref HEAD~1 --runs 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+PACKAGE = "custom_components.openai_conversation_plus"
+REPO = Path(__file__).resolve().parent.parent
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def measure(root: Path, package: str = PACKAGE) -> tuple[int, list[tuple[int, str]], list[str]]:
+    """Return the import time of the package in microseconds, its imports by cost and loaded components."""
+    code = (
+        "import sys;"
+        f"import {package};"
+        "print('\\n'.join(sorted({m.split('.')[2] for m in sys.modules"
+        " if m.startswith('homeassistant.components.') and m.count('.') >= 2})))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=root,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0
+    top: list[tuple[int, str]] = []
+    children: list[tuple[int, str]] = []
+    # Lines come after the imports they caused; nesting shows as indentation
+    for line in result.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match is None:
+            continue
+        cumulative, indent, module = int(match.group(2)), len(match.group(3)), match.group(4)
+        if indent == 3:
+            children.append((cumulative, module))
+        elif indent == 1:
+            if module == package:
+                total, top = cumulative, children
+            children = []
+    return total, sorted(top, reverse=True), result.stdout.split()
+
+
+def report(label: str, root: Path, runs: int) -> None:
+    """Print the median import time and what was loaded."""
+    samples = [measure(root) for _ in range(runs)]
+    totals = [total for total, _, _ in samples]
+    _, top, components = samples[-1]
+    print(f"{label}: {statistics.median(totals) / 1000:.1f} ms (median of {runs})")
+    for cumulative, module in top[:10]:
+        print(f"  {cumulative / 1000:8.1f} ms  {module}")
+    print(f"  components loaded ({len(components)}): {', '.join(components)}")
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ref", help="git revision to compare with, e.g. HEAD~1")
+    parser.add_argument("--runs", type=int, default=3, help="imports per tree (default 3)")
+    args = parser.parse_args()
+
+    if args.ref:
+        with tempfile.TemporaryDirectory() as tmp:
+            worktree = Path(tmp) / "tree"
+            subprocess.run(["git", "worktree", "add", "--detach", str(worktree), args.ref], cwd=REPO, check=True)
+            try:
+                report(args.ref, worktree, args.runs)
+            finally:
+                subprocess.run(["git", "worktree", "remove", "--force", str(worktree)], cwd=REPO, check=True)
+    report("working tree", REPO, args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Measure what logging costs a conversation turn.
+
+Replays the log calls of a typical turn (a few chat log messages, a
+request with the exposed entities and tools, two tool calls) through a
+handler that formats every emitted record, the way Home Assistant's log
+does. Each pattern is timed with the integration's loggers at INFO and at
+WARNING:
+
+    eager: the former pattern, with each step at INFO and the request
+           serialized for its debug record whether or not it is emitted
+    lazy:  the current pattern, with steps at DEBUG, payloads serialized
+           only when emitted and one INFO summary per turn
+
+Usage:
+    python scripts/bench_logging.py
+    python scripts/bench_logging.py --entities 500 --turns 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.openai_conversation_plus.log_utils import (  # noqa: E402
+    lazy_json,
+    lazy_preview,
+    log_turn_summary,
+)
+from custom_components.openai_conversation_plus.traces import TurnTrace  # noqa: E402
+
+LOGGER_NAME = "custom_components.openai_conversation_plus.conversation"
+FORMAT = "%(asctime)s %(levelname)s (%(threadName)s) [%(name)s] %(message)s"
+VERSION = "bench"
+
+
+class _Discard:
+    """A stream that drops what is written, so only formatting is measured."""
+
+    def write(self, text: str) -> int:
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def make_request(entities: int, tools: int) -> dict:
+    """Return request arguments of the size a turn sends."""
+    exposed = [
+        {"entity_id": f"light.room_{index}", "name": f"Room {index}", "state": "off", "aliases": []}
+        for index in range(entities)
+    ]
+    return {
+        "model": "gpt-5-mini",
+        "input": [
+            {"role": "system", "content": "You are a helpful smart home assistant. " * 20},
+            {"role": "user", "content": f"Available entities:\n{json.dumps(exposed)}"},
+            {"role": "user", "content": "Turn off the kitchen lights"},
+        ],
+        "tools": [
+            {"type": "function", "name": f"tool_{index}", "description": "Does things. " * 10, "parameters": {"type": "object"}}
+            for index in range(tools)
+        ],
+        "stream": True,
+        "tool_choice": "auto",
+    }
+
+
+def eager_turn(logger: logging.Logger, kwargs: dict, result: dict) -> None:
+    """Log a turn the former way."""
+    logger.info("[v%s] Conversation state: new=%s, chat_log_length=%d", VERSION, True, 3)
+    logger.info("[v%s] Fetched %d exposed entities for new conversation", VERSION, 300)
+    for index, message in enumerate(kwargs["input"]):
+        logger.debug("[v%s] Chat log item %d: role=%s, text_len=%d", VERSION, index, message["role"], len(message["content"]))
+    logger.info("[v%s] Loading user-defined functions from options: %d found", VERSION, len(kwargs["tools"]))
+    for tool in kwargs["tools"]:
+        logger.info("[v%s]   - Added function: %s", VERSION, tool["name"])
+    logger.info("[v%s] Built %d messages from chat log", VERSION, len(kwargs["input"]))
+    logger.info("[v%s] Sending %d tools to OpenAI (stream=%s)", VERSION, len(kwargs["tools"]), kwargs["stream"])
+    logger.info("[v%s] Final kwargs summary - model=%s, tools=%d", VERSION, kwargs["model"], len(kwargs["tools"]))
+    logger.debug("[v%s] Complete kwargs being sent to Responses API: %s", VERSION, json.dumps(kwargs, default=str))
+    for name in ("execute_services", "get_attributes"):
+        logger.info("[v%s] Executing streaming tool call: %s", VERSION, name)
+        logger.info("[v%s] Tool %s executed successfully", VERSION, name)
+        logger.info("[v%s] Executed streaming tool: %s - result: %s", VERSION, name, str(result)[:100])
+
+
+def lazy_turn(logger: logging.Logger, kwargs: dict, result: dict) -> None:
+    """Log a turn the current way."""
+    logger.debug("[v%s] Conversation state: new=%s, chat_log_length=%d", VERSION, True, 3)
+    logger.debug("[v%s] Fetched %d exposed entities for new conversation", VERSION, 300)
+    for index, message in enumerate(kwargs["input"]):
+        logger.debug("[v%s] Chat log item %d: role=%s, text_len=%d", VERSION, index, message["role"], len(message["content"]))
+    logger.debug("[v%s] Loading user-defined functions from options: %d found", VERSION, len(kwargs["tools"]))
+    for tool in kwargs["tools"]:
+        logger.debug("[v%s]   - Added function: %s", VERSION, tool["name"])
+    logger.debug("[v%s] Built %d messages from chat log", VERSION, len(kwargs["input"]))
+    logger.debug("[v%s] Sending %d tools to OpenAI (stream=%s)", VERSION, len(kwargs["tools"]), kwargs["stream"])
+    logger.debug("[v%s] Final kwargs summary - model=%s, tools=%d", VERSION, kwargs["model"], len(kwargs["tools"]))
+    logger.debug("[v%s] Complete kwargs being sent to Responses API: %s", VERSION, lazy_json(kwargs))
+    trace = TurnTrace("01JBENCH")
+    trace.request = {"model": kwargs["model"], "stream": True, "tools": len(kwargs["tools"]), "messages": 3}
+    for name in ("execute_services", "get_attributes"):
+        logger.debug("[v%s] Executing streaming tool call: %s", VERSION, name)
+        logger.debug("[v%s] Tool %s executed successfully", VERSION, name)
+        logger.debug("[v%s] Executed streaming tool: %s - result: %s", VERSION, name, lazy_preview(result))
+        trace.add_tool_call(name, None, result, 12.0)
+    trace.usage = {"input_tokens": 5200, "output_tokens": 40, "cached_tokens": 4096}
+    trace.timings = {"ttfb": 420.0, "total": 1350.0}
+    log_turn_summary(logger, trace)
+
+
+class _Counter(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records += 1
+
+
+def measure(turn, kwargs: dict, result: dict, level: int, turns: int, repeats: int) -> tuple[float, float]:
+    """Return the median microseconds per turn and records emitted per turn."""
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(level)
+    logger.propagate = False
+    handler = logging.StreamHandler(_Discard())
+    handler.setFormatter(logging.Formatter(FORMAT))
+    counter = _Counter()
+    logger.handlers = [handler, counter]
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _ in range(turns):
+            turn(logger, kwargs, result)
+        samples.append((time.perf_counter() - started) / turns * 1_000_000)
+    return statistics.median(samples), counter.records / (turns * repeats)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entities", type=int, default=300, help="exposed entities in the prompt (default 300)")
+    parser.add_argument("--tools", type=int, default=15, help="tools sent with the request (default 15)")
+    parser.add_argument("--turns", type=int, default=500, help="turns per sample (default 500)")
+    parser.add_argument("--repeats", type=int, default=5, help="samples per case (default 5)")
+    args = parser.parse_args()
+
+    kwargs = make_request(args.entities, args.tools)
+    result = {"ok": True, "result": [{"entity_id": f"light.room_{index}", "state": "off"} for index in range(20)]}
+    print(f"request: {len(json.dumps(kwargs)) / 1024:.0f} KB, {args.tools} tools, {args.entities} entities")
+    for level in (logging.INFO, logging.WARNING):
+        for name, turn in (("eager", eager_turn), ("lazy", lazy_turn)):
+            micros, records = measure(turn, kwargs, result, level, args.turns, args.repeats)
+            print(f"{logging.getLevelName(level):<8} {name:<6} {micros:9.1f} µs/turn  {records:4.1f} records/turn")
+
+
+if __name__ == "__main__":
+    main()
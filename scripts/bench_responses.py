@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Load-test the integration's OpenAI client path against the fake Responses API.
+
+Runs conversation turns concurrently through the same pieces a real turn
+uses: an `AsyncOpenAI` client on an httpx client with the integration's
+pool limits and timeouts, and the entry's request scheduler fed by the
+rate limit headers of every response. Answers come from
+`tests/fake_responses.py`, so nothing is sent over the network and every
+run sees the same latency, errors and limits. With `--tool-calls`, each turn
+first gets a function call and sends its output back for the final answer,
+as the tool loop does.
+
+Usage:
+    python scripts/bench_responses.py
+    python scripts/bench_responses.py --turns 500 --concurrency 20 --rpm 300
+    python scripts/bench_responses.py --http --tool-calls --error-rate 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+import httpx
+import openai
+from openai import AsyncOpenAI
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.openai_conversation_plus.exceptions import CircuitOpen, SchedulerBusy  # noqa: E402
+from custom_components.openai_conversation_plus.http_client import HttpClientSettings  # noqa: E402
+from custom_components.openai_conversation_plus.scheduler import Priority, RequestScheduler  # noqa: E402
+from custom_components.openai_conversation_plus.spans import LatencyHistogram  # noqa: E402
+from tests.fake_responses import FakeResponsesAPI, FunctionCall, ScriptedTurn  # noqa: E402
+
+PROMPT = "You are a helpful smart home assistant. " * 50
+ANSWER = "I turned off the kitchen lights and the hallway lamp. Anything else?"
+
+
+class Results:
+    """Latencies and outcomes of all turns."""
+
+    def __init__(self) -> None:
+        self.first_event = LatencyHistogram()
+        self.request = LatencyHistogram()
+        self.turn = LatencyHistogram()
+        self.outcomes: Counter[str] = Counter()
+
+
+async def send(client: AsyncOpenAI, scheduler: RequestScheduler, stream: bool, results: Results, **kwargs: Any) -> Any:
+    """Send one request in a scheduler slot and time it."""
+    async with scheduler.slot(Priority.INTERACTIVE):
+        started = time.perf_counter()
+        if not stream:
+            response = await client.responses.create(**kwargs)
+        else:
+            async with client.responses.stream(**kwargs) as events:
+                first = None
+                async for _event in events:
+                    if first is None:
+                        first = time.perf_counter()
+                        results.first_event.record((first - started) * 1000)
+                response = await events.get_final_response()
+        results.request.record((time.perf_counter() - started) * 1000)
+        return response
+
+
+async def run_turn(client: AsyncOpenAI, scheduler: RequestScheduler, args: argparse.Namespace, results: Results) -> None:
+    """Run one turn, with a tool round if the model calls a function."""
+    started = time.perf_counter()
+    kwargs: dict[str, Any] = {
+        "model": "gpt-5-mini",
+        "input": [{"role": "system", "content": PROMPT}, {"role": "user", "content": "Turn off the kitchen"}],
+    }
+    try:
+        response = await send(client, scheduler, not args.no_stream, results, **kwargs)
+        calls = [item for item in response.output if item.type == "function_call"]
+        if calls:
+            kwargs["input"] += [item.model_dump(exclude_none=True) for item in calls]
+            kwargs["input"] += [
+                {"type": "function_call_output", "call_id": call.call_id, "output": json.dumps({"ok": True})}
+                for call in calls
+            ]
+            await send(client, scheduler, not args.no_stream, results, **kwargs)
+    except openai.APIStatusError as err:
+        results.outcomes[f"http_{err.status_code}"] += 1
+    except (openai.APIError, asyncio.TimeoutError, SchedulerBusy, CircuitOpen) as err:
+        results.outcomes[type(err).__name__] += 1
+    else:
+        results.outcomes["ok"] += 1
+        results.turn.record((time.perf_counter() - started) * 1000)
+
+
+async def async_main(args: argparse.Namespace) -> None:
+    """Run the load test and print the results."""
+    script = [ScriptedTurn(ANSWER, cached_tokens=512)]
+    if args.tool_calls:
+        script.insert(0, ScriptedTurn(calls=(FunctionCall("execute_services", {"list": [{"domain": "light"}]}),)))
+    api = FakeResponsesAPI(
+        script,
+        latency=args.latency,
+        jitter=args.jitter,
+        event_delay=args.event_delay,
+        error_rate=args.error_rate,
+        requests_per_minute=args.rpm,
+        tokens_per_minute=args.tpm,
+        seed=1,
+    )
+    runner = None
+    if args.http:
+        runner, base_url = await api.async_serve()
+        transport = None
+    else:
+        base_url, transport = "http://fake/v1", api.transport()
+
+    settings = HttpClientSettings()
+    scheduler = RequestScheduler(args.max_concurrent_requests)
+
+    async def observe(response: httpx.Response) -> None:
+        scheduler.observe_response(response.status_code, response.headers)
+
+    http_client = httpx.AsyncClient(
+        limits=settings.limits, timeout=settings.timeout, transport=transport, event_hooks={"response": [observe]}
+    )
+    client = AsyncOpenAI(api_key="fake", base_url=base_url, http_client=http_client)
+    results = Results()
+    pending = asyncio.Semaphore(args.concurrency)
+
+    async def limited() -> None:
+        async with pending:
+            await run_turn(client, scheduler, args, results)
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(limited() for _ in range(args.turns)))
+    finally:
+        elapsed = time.perf_counter() - started
+        await http_client.aclose()
+        if runner is not None:
+            await runner.cleanup()
+
+    print(f"{args.turns} turns in {elapsed:.1f} s ({args.turns / elapsed:.1f} turns/s), {api.received} requests")
+    print(f"outcomes: {dict(results.outcomes)}, 429 answers: {api.rate_limited}, injected errors: {api.errors}")
+    for name, histogram in (
+        ("first event", results.first_event),
+        ("request", results.request),
+        ("turn", results.turn),
+    ):
+        print(f"{name:<12} {json.dumps(histogram.as_dict())}")
+    print(f"scheduler    {json.dumps(scheduler.as_dict()['queues']['interactive'])}")
+
+
+def main() -> None:
+    """Parse the arguments and run."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=200, help="turns to run (default 200)")
+    parser.add_argument("--concurrency", type=int, default=10, help="turns running at once (default 10)")
+    parser.add_argument("--max-concurrent-requests", type=int, default=4, help="scheduler slots (default 4)")
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds before the first byte (default 0.3)")
+    parser.add_argument("--jitter", type=float, default=0.2, help="random extra latency in seconds (default 0.2)")
+    parser.add_argument("--event-delay", type=float, default=0.01, help="seconds between streamed events (default 0.01)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests failing with 500")
+    parser.add_argument("--rpm", type=int, default=0, help="requests per minute before 429s, 0 for unlimited")
+    parser.add_argument("--tpm", type=int, default=0, help="tokens per minute before 429s, 0 for unlimited")
+    parser.add_argument("--tool-calls", action="store_true", help="answer each turn with a function call first")
+    parser.add_argument("--no-stream", action="store_true", help="send non-streaming requests")
+    parser.add_argument("--http", action="store_true", help="serve the fake on a local port instead of in-process")
+    asyncio.run(async_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
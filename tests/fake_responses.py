@@ -0,0 +1,429 @@
+"""A stand-in for the OpenAI Responses API that replays scripted turns.
+
+The fake answers `POST /responses` the way the API does, streamed as
+server-sent events or as one JSON body, and `GET /models/{model}` for the
+keep-warm ping. Turns are taken from a script in order, and the script
+repeats. Answers can be delayed with jitter, streamed slowly, replaced by
+injected errors, or refused by request and token rate limits that are
+reported in the `x-ratelimit-*` headers.
+
+Use it in-process as the transport of an httpx client:
+
+    api = FakeResponsesAPI([ScriptedTurn("Done")], latency=0.3)
+    client = AsyncOpenAI(api_key="fake", http_client=httpx.AsyncClient(transport=api.transport()))
+
+or serve it over HTTP with aiohttp and use its URL as the base URL of an
+entry:
+
+    python -m tests.fake_responses --port 8765 --latency 0.4 --jitter 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+# Length of a rate limit window, like the per-minute limits of the API
+RATE_LIMIT_WINDOW = 60.0
+# Rough characters per token, used when a turn does not give its token counts
+CHARS_PER_TOKEN = 4
+
+ERROR_TYPES = {
+    400: "invalid_request_error",
+    401: "invalid_request_error",
+    404: "invalid_request_error",
+    429: "requests",
+    500: "server_error",
+    502: "server_error",
+    503: "server_error",
+}
+
+
+@dataclass(frozen=True)
+class FunctionCall:
+    """A function call made by the fake model."""
+
+    name: str
+    arguments: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class ScriptedTurn:
+    """One answer of the fake model.
+
+    With `error` set, the request fails with that HTTP status instead.
+    Token counts left as None are estimated from the request and the answer.
+    """
+
+    text: str = ""
+    calls: tuple[FunctionCall, ...] = ()
+    input_tokens: int | None = None
+    cached_tokens: int = 0
+    error: int | None = None
+
+
+@dataclass
+class FakeReply:
+    """Status, headers and body chunks of one answer."""
+
+    status: int
+    headers: dict[str, str]
+    chunks: AsyncIterator[bytes]
+
+
+def load_script(path: str) -> list[ScriptedTurn]:
+    """Read a script from a JSON list of `{"text", "calls", "error", ...}` objects."""
+    with open(path, encoding="utf-8") as file:
+        raw = json.load(file)
+    return [
+        ScriptedTurn(
+            text=turn.get("text", ""),
+            calls=tuple(FunctionCall(call["name"], call.get("arguments", {})) for call in turn.get("calls", [])),
+            input_tokens=turn.get("input_tokens"),
+            cached_tokens=turn.get("cached_tokens", 0),
+            error=turn.get("error"),
+        )
+        for turn in raw
+    ]
+
+
+class FakeResponsesAPI:
+    """Scripted answers, latency, rate limits and errors of a fake Responses API."""
+
+    def __init__(
+        self,
+        script: Iterable[ScriptedTurn] = (ScriptedTurn("OK"),),
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        event_delay: float = 0.0,
+        delta_size: int = 16,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize the fake.
+
+        `latency` plus up to `jitter` seconds pass before the first byte of an
+        answer, and `event_delay` between streamed events. Text is streamed in
+        deltas of `delta_size` characters. A share `error_rate` of requests
+        fails with `error_status`. Rate limits of 0 are unlimited.
+        """
+        turns = tuple(script)
+        if not turns:
+            raise ValueError("The script needs at least one turn")
+        self._script = itertools.cycle(turns)
+        self.latency = latency
+        self.jitter = jitter
+        self.event_delay = event_delay
+        self.delta_size = max(1, delta_size)
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._random = random.Random(seed)
+        # The last requests, for assertions; counters cover all of them
+        self.requests: deque[dict[str, Any]] = deque(maxlen=100)
+        self.received = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self._window_started = time.monotonic()
+        self._window_requests = 0
+        self._window_tokens = 0
+
+    def transport(self) -> httpx.AsyncBaseTransport:
+        """Return an httpx transport that answers from this fake."""
+        return _FakeTransport(self)
+
+    async def answer(self, method: str, path: str, body: bytes) -> FakeReply:
+        """Answer one HTTP request."""
+        if method == "GET" and "/models/" in path:
+            model = path.rsplit("/", 1)[-1]
+            return _json_reply(200, {"id": model, "object": "model", "created": 0, "owned_by": "fake"})
+        if method != "POST" or not path.endswith("/responses"):
+            return _error_reply(404, f"Unknown endpoint {method} {path}")
+
+        try:
+            request = json.loads(body or b"{}")
+        except ValueError:
+            return _error_reply(400, "Request body is not JSON")
+        self.received += 1
+        self.requests.append(request)
+        number = self.received
+        turn = next(self._script)
+        input_tokens = turn.input_tokens if turn.input_tokens is not None else max(1, len(body) // CHARS_PER_TOKEN)
+
+        headers, retry_after = self._rate_limit(input_tokens, time.monotonic())
+        headers["x-request-id"] = f"req_fake{number:06d}"
+        if retry_after is not None:
+            self.rate_limited += 1
+            headers["retry-after"] = f"{retry_after:.3f}"
+            return _error_reply(429, "Rate limit reached for requests", headers, code="rate_limit_exceeded")
+
+        status = turn.error
+        if status is None and self.error_rate and self._random.random() < self.error_rate:
+            status = self.error_status
+        if status is not None:
+            self.errors += 1
+            await asyncio.sleep(self._first_byte_delay())
+            return _error_reply(status, f"Injected error {status}", headers)
+
+        answer = _Answer(turn, request.get("model", "gpt-fake"), number, input_tokens)
+        if request.get("stream"):
+            headers["content-type"] = "text/event-stream"
+            return FakeReply(200, headers, self._stream(answer))
+        await asyncio.sleep(self._first_byte_delay())
+        return _json_reply(200, answer.response("completed"), headers)
+
+    def _first_byte_delay(self) -> float:
+        return self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    def _rate_limit(self, tokens: int, now: float) -> tuple[dict[str, str], float | None]:
+        """Count a request against the limits; return its headers and, if refused, when to retry."""
+        if now - self._window_started >= RATE_LIMIT_WINDOW:
+            self._window_started = now
+            self._window_requests = 0
+            self._window_tokens = 0
+        reset = max(0.001, RATE_LIMIT_WINDOW - (now - self._window_started))
+        refused = (self.requests_per_minute and self._window_requests >= self.requests_per_minute) or (
+            self.tokens_per_minute and self._window_tokens + tokens > self.tokens_per_minute
+        )
+        if not refused:
+            self._window_requests += 1
+            self._window_tokens += tokens
+        headers: dict[str, str] = {}
+        if self.requests_per_minute:
+            headers["x-ratelimit-limit-requests"] = str(self.requests_per_minute)
+            headers["x-ratelimit-remaining-requests"] = str(max(0, self.requests_per_minute - self._window_requests))
+            headers["x-ratelimit-reset-requests"] = f"{reset:.3f}s"
+        if self.tokens_per_minute:
+            headers["x-ratelimit-limit-tokens"] = str(self.tokens_per_minute)
+            headers["x-ratelimit-remaining-tokens"] = str(max(0, self.tokens_per_minute - self._window_tokens))
+            headers["x-ratelimit-reset-tokens"] = f"{reset:.3f}s"
+        return headers, reset if refused else None
+
+    async def _stream(self, answer: _Answer) -> AsyncIterator[bytes]:
+        await asyncio.sleep(self._first_byte_delay())
+        for index, event in enumerate(answer.events(self.delta_size)):
+            if index and self.event_delay:
+                await asyncio.sleep(self.event_delay)
+            yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n".encode()
+
+    async def async_serve(self, host: str = "127.0.0.1", port: int = 0) -> tuple[Any, str]:
+        """Serve the fake over HTTP; return the aiohttp runner to clean up and the base URL."""
+        from aiohttp import web  # pylint: disable=import-outside-toplevel
+
+        async def handle(request: web.Request) -> web.StreamResponse:
+            reply = await self.answer(request.method, request.path, await request.read())
+            response = web.StreamResponse(status=reply.status, headers=reply.headers)
+            await response.prepare(request)
+            async for chunk in reply.chunks:
+                await response.write(chunk)
+            await response.write_eof()
+            return response
+
+        app = web.Application()
+        app.router.add_route("*", "/{path:.*}", handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, host, port)
+        await site.start()
+        bound_host, bound_port = runner.addresses[0][:2]
+        return runner, f"http://{bound_host}:{bound_port}/v1"
+
+
+class _Answer:
+    """The response objects and stream events of one scripted turn."""
+
+    def __init__(self, turn: ScriptedTurn, model: str, number: int, input_tokens: int) -> None:
+        self.turn = turn
+        self.model = model
+        self.id = f"resp_fake{number:06d}"
+        self.created_at = int(time.time())
+        output_chars = len(turn.text) + sum(len(json.dumps(call.arguments)) + len(call.name) for call in turn.calls)
+        self.usage = {
+            "input_tokens": input_tokens,
+            "input_tokens_details": {"cached_tokens": min(turn.cached_tokens, input_tokens)},
+            "output_tokens": max(1, output_chars // CHARS_PER_TOKEN),
+            "output_tokens_details": {"reasoning_tokens": 0},
+            "total_tokens": input_tokens + max(1, output_chars // CHARS_PER_TOKEN),
+        }
+
+    def items(self) -> list[dict[str, Any]]:
+        """Return the finished output items: the message, then the function calls."""
+        items: list[dict[str, Any]] = []
+        if self.turn.text:
+            items.append(
+                {
+                    "id": f"msg_{self.id[5:]}",
+                    "type": "message",
+                    "role": "assistant",
+                    "status": "completed",
+                    "content": [_text_part(self.turn.text)],
+                }
+            )
+        for index, call in enumerate(self.turn.calls):
+            items.append(
+                {
+                    "id": f"fc_{self.id[5:]}_{index}",
+                    "type": "function_call",
+                    "call_id": f"call_{self.id[5:]}_{index}",
+                    "name": call.name,
+                    "arguments": json.dumps(call.arguments),
+                    "status": "completed",
+                }
+            )
+        return items
+
+    def response(self, status: str, output: list[dict[str, Any]] | None = None) -> dict[str, Any]:
+        """Return the response object, with usage once it is completed."""
+        completed = status == "completed"
+        return {
+            "id": self.id,
+            "object": "response",
+            "created_at": self.created_at,
+            "status": status,
+            "model": self.model,
+            "output": self.items() if completed else (output or []),
+            "usage": self.usage if completed else None,
+            "error": None,
+            "incomplete_details": None,
+            "instructions": None,
+            "metadata": {},
+            "parallel_tool_calls": True,
+            "temperature": 1.0,
+            "tool_choice": "auto",
+            "tools": [],
+            "top_p": 1.0,
+        }
+
+    def events(self, delta_size: int) -> list[dict[str, Any]]:
+        """Return the stream events of the turn, in the order the API sends them."""
+        events: list[dict[str, Any]] = [
+            {"type": "response.created", "response": self.response("in_progress")},
+            {"type": "response.in_progress", "response": self.response("in_progress")},
+        ]
+        for output_index, item in enumerate(self.items()):
+            location = {"item_id": item["id"], "output_index": output_index}
+            if item["type"] == "message":
+                text = self.turn.text
+                events.append({"type": "response.output_item.added", "output_index": output_index, "item": {**item, "status": "in_progress", "content": []}})
+                events.append({"type": "response.content_part.added", **location, "content_index": 0, "part": _text_part("")})
+                events.extend(
+                    {"type": "response.output_text.delta", **location, "content_index": 0, "delta": text[start : start + delta_size], "logprobs": []}
+                    for start in range(0, len(text), delta_size)
+                )
+                events.append({"type": "response.output_text.done", **location, "content_index": 0, "text": text, "logprobs": []})
+                events.append({"type": "response.content_part.done", **location, "content_index": 0, "part": _text_part(text)})
+            else:
+                arguments = item["arguments"]
+                events.append({"type": "response.output_item.added", "output_index": output_index, "item": {**item, "status": "in_progress", "arguments": ""}})
+                events.extend(
+                    {"type": "response.function_call_arguments.delta", **location, "delta": arguments[start : start + delta_size]}
+                    for start in range(0, len(arguments), delta_size)
+                )
+                events.append({"type": "response.function_call_arguments.done", **location, "name": item["name"], "arguments": arguments})
+            events.append({"type": "response.output_item.done", "output_index": output_index, "item": item})
+        events.append({"type": "response.completed", "response": self.response("completed")})
+        for sequence_number, event in enumerate(events):
+            event["sequence_number"] = sequence_number
+        return events
+
+
+def _text_part(text: str) -> dict[str, Any]:
+    return {"type": "output_text", "text": text, "annotations": [], "logprobs": []}
+
+
+async def _chunks(body: bytes) -> AsyncIterator[bytes]:
+    yield body
+
+
+def _json_reply(status: int, payload: dict[str, Any], headers: dict[str, str] | None = None) -> FakeReply:
+    body = json.dumps(payload).encode()
+    return FakeReply(
+        status,
+        {**(headers or {}), "content-type": "application/json", "content-length": str(len(body))},
+        _chunks(body),
+    )
+
+
+def _error_reply(status: int, message: str, headers: dict[str, str] | None = None, code: str | None = None) -> FakeReply:
+    error = {"message": message, "type": ERROR_TYPES.get(status, "server_error"), "param": None, "code": code}
+    return _json_reply(status, {"error": error}, headers)
+
+
+class _FakeStream(httpx.AsyncByteStream):
+    def __init__(self, chunks: AsyncIterator[bytes]) -> None:
+        self._chunks = chunks
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._chunks:
+            yield chunk
+
+    async def aclose(self) -> None:
+        await self._chunks.aclose()
+
+
+class _FakeTransport(httpx.AsyncBaseTransport):
+    def __init__(self, api: FakeResponsesAPI) -> None:
+        self._api = api
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        reply = await self._api.answer(request.method, request.url.path, await request.aread())
+        return httpx.Response(reply.status, headers=reply.headers, stream=_FakeStream(reply.chunks), request=request)
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    script = load_script(args.script) if args.script else [ScriptedTurn(args.text)]
+    api = FakeResponsesAPI(
+        script,
+        latency=args.latency,
+        jitter=args.jitter,
+        event_delay=args.event_delay,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        requests_per_minute=args.rpm,
+        tokens_per_minute=args.tpm,
+    )
+    runner, base_url = await api.async_serve(args.host, args.port)
+    print(f"Fake Responses API at {base_url}, stop with Ctrl+C")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+def main() -> None:
+    """Serve the fake until interrupted."""
+    parser = argparse.ArgumentParser(description="Serve a fake OpenAI Responses API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--script", help="JSON file with the turns to replay")
+    parser.add_argument("--text", default="OK", help="answer when no script is given")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before the first byte")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many seconds added to the latency")
+    parser.add_argument("--event-delay", type=float, default=0.0, help="seconds between streamed events")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests that fail")
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--rpm", type=int, default=0, help="requests per minute, 0 for unlimited")
+    parser.add_argument("--tpm", type=int, default=0, help="tokens per minute, 0 for unlimited")
+    try:
+        asyncio.run(_async_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
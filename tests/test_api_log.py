@@ -0,0 +1,94 @@
+"""Test the background API log writer."""
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import os
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from custom_components.openai_conversation_plus.api_log import (
+    ApiLog,
+    ApiLogSettings,
+    SegmentWriter,
+)
+
+
+def make_hass():
+    """Return the parts of hass the log uses, running executor jobs inline."""
+    loop = asyncio.get_running_loop()
+
+    async def async_add_executor_job(target, *args):
+        return target(*args)
+
+    return SimpleNamespace(
+        loop=loop,
+        async_create_background_task=lambda coro, name: loop.create_task(coro),
+        async_add_executor_job=async_add_executor_job,
+    )
+
+
+async def test_disabled_log_queues_nothing(tmp_path):
+    """Test the off switch skips turns and writes."""
+    api_log = ApiLog(make_hass(), tmp_path, ApiLogSettings(enabled=False))
+    assert api_log.start_turn() is None
+    api_log.write("request", {"kwargs": {}})
+    await api_log.async_close()
+    assert api_log.stats.events == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_events_written_as_gzip_jsonl(tmp_path):
+    """Test events of a turn end up in one compressed segment."""
+    api_log = ApiLog(make_hass(), tmp_path, ApiLogSettings(enabled=True, compression="gzip"))
+    turn = api_log.start_turn()
+    turn.write("request", {"kwargs": {"model": "gpt-5"}})
+    turn.write("tool_results_iter_1", {"tool_results": [{"output": "ok"}]})
+    await api_log.async_close()
+
+    (segment,) = tmp_path.iterdir()
+    assert segment.name.startswith("api_") and segment.name.endswith(".jsonl.gz")
+    with gzip.open(segment, "rt", encoding="utf-8") as file:
+        events = [json.loads(line) for line in file]
+    assert [event["type"] for event in events] == ["request", "tool_results_iter_1"]
+    assert events[0]["turn"] == events[1]["turn"] == turn.turn_id
+    assert events[0]["kwargs"] == {"model": "gpt-5"}
+    assert api_log.stats.events == 2 and api_log.stats.bytes_written > 0
+
+
+async def test_sampling_skips_turns(tmp_path):
+    """Test only the sampled share of turns is logged."""
+    api_log = ApiLog(make_hass(), tmp_path, ApiLogSettings(enabled=True, sample_rate=0.25))
+    with patch("custom_components.openai_conversation_plus.api_log.random.random", side_effect=[0.1, 0.5]):
+        assert api_log.start_turn() is not None
+        assert api_log.start_turn() is None
+
+
+def test_segments_rotate_and_expire(tmp_path):
+    """Test a new segment starts after the age limit and old segments are removed."""
+    writer = SegmentWriter(tmp_path)
+    settings = ApiLogSettings(enabled=True, compression="none", retention_days=1)
+    old = tmp_path / "20240101_000000_request.json"
+    old.write_text("{}")
+    os.utime(old, (0, 0))
+
+    writer.write(b'{"type": "a"}\n', settings, 1_000_000)
+    writer.write(b'{"type": "b"}\n', settings, 1_000_010)
+    assert len(list(tmp_path.glob("api_*.jsonl"))) == 1
+    assert not old.exists()
+
+    writer.write(b'{"type": "c"}\n', settings, 1_004_000)
+    assert len(list(tmp_path.glob("api_*.jsonl"))) == 2
+
+
+def test_size_limit_removes_oldest_segments(tmp_path):
+    """Test segments beyond the size limit are removed, oldest first."""
+    for index in range(3):
+        segment = tmp_path / f"api_2024010{index + 1}_000000_000000.jsonl"
+        segment.write_bytes(b"x" * 600_000)
+        os.utime(segment, (1_000_000 + index, 1_000_000 + index))
+    writer = SegmentWriter(tmp_path)
+    removed = writer.prune(ApiLogSettings(max_size_mb=1), 1_000_010)
+    assert removed == 2
+    assert [path.name for path in tmp_path.iterdir()] == ["api_20240103_000000_000000.jsonl"]
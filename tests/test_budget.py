@@ -0,0 +1,68 @@
+"""Test the tool-call budgets of turns and conversations."""
+from __future__ import annotations
+
+from custom_components.openai_conversation_plus.budget import (
+    RUNAWAY_EXHAUSTIONS,
+    ToolBudgetTracker,
+)
+
+
+def test_round_limit_per_turn():
+    """Test a turn stops allowing calls after its rounds, and the next turn starts fresh."""
+    tracker = ToolBudgetTracker()
+    budget = tracker.start_turn("conv", 2, 30, 60)
+    for _ in range(2):
+        assert budget.allow_call() and budget.allow_call()
+        budget.finish_round()
+    assert budget.exhausted
+    assert not budget.allow_call()
+    assert budget.denied_calls == 1
+    assert not tracker.start_turn("conv", 2, 30, 60).exhausted
+
+
+def test_conversation_call_cap():
+    """Test tool calls count across the turns of a conversation only."""
+    tracker = ToolBudgetTracker()
+    first = tracker.start_turn("conv", 5, 3, 60)
+    assert first.allow_call() and first.allow_call()
+    second = tracker.start_turn("conv", 5, 3, 60)
+    assert second.allow_call()
+    assert not second.allow_call()
+    assert tracker.start_turn("other", 5, 3, 60).allow_call()
+
+
+def test_conversation_round_trip_cap():
+    """Test model round trips count across the turns of a conversation."""
+    tracker = ToolBudgetTracker()
+    first = tracker.start_turn("conv", 5, 30, 2)
+    first.record_round_trip()
+    assert not first.exhausted
+    first.record_round_trip()
+    assert first.exhausted
+    assert tracker.start_turn("conv", 5, 30, 2).exhausted
+
+
+def test_spent_budget_requests_text_only_answer():
+    """Test tool_choice becomes none once the budget is spent, and only with tools."""
+    budget = ToolBudgetTracker().start_turn("conv", 1, 30, 60)
+    kwargs = {"tools": [{"type": "function", "name": "get_state"}], "tool_choice": "auto"}
+    assert not budget.shape_request(kwargs)
+    assert kwargs["tool_choice"] == "auto"
+    budget.allow_call()
+    budget.finish_round()
+    assert budget.shape_request(kwargs)
+    assert kwargs["tool_choice"] == "none"
+    assert not budget.shape_request({"input": "hi"})
+
+
+def test_repeated_exhaustion_is_reported_as_runaway():
+    """Test exhaustion counts once per turn and turns runaway after repeats."""
+    tracker = ToolBudgetTracker()
+    reports = []
+    for _ in range(RUNAWAY_EXHAUSTIONS):
+        budget = tracker.start_turn("conv", 0, 30, 60)
+        reports.append(tracker.report_exhausted("conv", budget))
+        tracker.report_exhausted("conv", budget)
+    assert reports == [False] * (RUNAWAY_EXHAUSTIONS - 1) + [True]
+    assert budget.usage.exhaustions == RUNAWAY_EXHAUSTIONS
+    assert tracker.total_exhaustions == RUNAWAY_EXHAUSTIONS * 2
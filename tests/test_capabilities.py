@@ -0,0 +1,155 @@
+"""Test the model capability cache."""
+from __future__ import annotations
+
+from custom_components.openai_conversation_plus.capabilities import CapabilityCache
+
+KEY = CapabilityCache.key("http://localhost:8080/v1/", "local-model")
+
+
+class BadRequest(Exception):
+    """Stand-in for the SDK's BadRequestError."""
+
+    status_code = 400
+
+    def __init__(self, message, param=None, code=None):
+        super().__init__(message)
+        self.message = message
+        self.param = param
+        self.code = code
+
+
+class FakeStore:
+    def __init__(self):
+        self.saved = None
+
+    def async_delay_save(self, data_func, delay):
+        self.saved = data_func()
+
+
+def request():
+    return {
+        "model": "local-model",
+        "input": [],
+        "reasoning": {"effort": "low"},
+        "text": {"verbosity": "low"},
+        "tools": [{"type": "function", "name": "execute_services"}, {"type": "web_search_preview"}],
+        "tool_choice": "auto",
+        "parallel_tool_calls": True,
+    }
+
+
+def test_unknown_keyword_is_learned_and_dropped():
+    """Test a TypeError naming a parameter removes only that parameter."""
+    cache = CapabilityCache()
+    kwargs = request()
+    learned = cache.learn(KEY, kwargs, TypeError("create() got an unexpected keyword argument 'reasoning'"))
+    assert learned == ["reasoning"]
+    assert "reasoning" not in kwargs and "text" in kwargs
+
+
+def test_unsupported_parameter_from_bad_request():
+    """Test the API's `param` field identifies the rejected parameter."""
+    cache = CapabilityCache()
+    kwargs = request()
+    err = BadRequest("Unsupported parameter: 'text.verbosity'", param="text.verbosity", code="unsupported_parameter")
+    assert cache.learn(KEY, kwargs, err) == ["text"]
+
+    later = request()
+    assert cache.shape(KEY, later) == ["text"]
+    assert "text" not in later
+
+
+def test_rejected_tool_is_dropped_from_this_request_only():
+    """Test a rejection pointing at one tool removes it from the retry without persisting it."""
+    store = FakeStore()
+    cache = CapabilityCache(store)
+    kwargs = request()
+    assert cache.learn(KEY, kwargs, BadRequest("Tool type not supported", param="tools[1].type")) == ["tools[1]"]
+    assert kwargs["tools"] == [{"type": "function", "name": "execute_services"}]
+    assert kwargs["tool_choice"] == "auto"
+    assert cache.shape(KEY, request()) == []
+    assert store.saved is None
+
+
+def test_no_tools_left_drops_tool_choice():
+    """Test tool options are removed with the last tool."""
+    cache = CapabilityCache()
+    kwargs = request()
+    assert cache.learn(KEY, kwargs, BadRequest("This model does not support tools")) == [
+        "tools:function",
+        "tools:web_search",
+    ]
+    assert not {"tools", "tool_choice", "parallel_tool_calls"} & set(kwargs)
+
+
+def test_streaming_rejection():
+    """Test an endpoint rejecting streaming is marked as such."""
+    cache = CapabilityCache()
+    assert cache.learn(KEY, request(), BadRequest("Streaming is not supported", param="stream")) == ["stream"]
+    assert cache.get(KEY).streaming is False
+
+
+def test_other_errors_are_not_learned():
+    """Test errors unrelated to capabilities are left to the caller."""
+    cache = CapabilityCache()
+    kwargs = request()
+    assert cache.learn(KEY, kwargs, BadRequest("Invalid input", param="input")) == []
+    assert cache.learn(KEY, kwargs, RuntimeError("connection reset")) == []
+    assert kwargs == request()
+    assert cache.as_data() == {"models": []}
+
+
+def test_invalid_values_and_schemas_are_not_learned():
+    """Test a bad value or tool schema does not mark the parameter or tool type unsupported."""
+    cache = CapabilityCache()
+    kwargs = request()
+    value = BadRequest(
+        "Unsupported value: 'reasoning.effort' does not support 'minimal' with this model.",
+        param="reasoning.effort",
+        code="unsupported_value",
+    )
+    schema = BadRequest(
+        "Invalid schema for function 'my_function'", param="tools[0].parameters", code="invalid_function_parameters"
+    )
+    uncoded = BadRequest("Unsupported value: 'minimal' is not supported with this model.", param="reasoning.effort")
+    assert cache.learn(KEY, kwargs, value) == []
+    assert cache.learn(KEY, kwargs, schema) == []
+    assert cache.learn(KEY, kwargs, uncoded) == []
+    assert kwargs == request()
+    assert cache.as_data() == {"models": []}
+
+
+def test_forget_base_url():
+    """Test changed options clear what was learned about the entry's endpoint."""
+    store = FakeStore()
+    cache = CapabilityCache(store)
+    other = CapabilityCache.key(None, "gpt-5-mini")
+    cache.learn(KEY, request(), TypeError("create() got an unexpected keyword argument 'reasoning'"))
+    cache.learn(other, request(), TypeError("create() got an unexpected keyword argument 'text'"))
+    cache.forget("http://localhost:8080/v1")
+    assert cache.shape(KEY, request()) == []
+    assert cache.shape(other, request()) == ["text"]
+    assert [item["model"] for item in store.saved["models"]] == ["gpt-5-mini"]
+
+
+def test_learned_capabilities_are_persisted():
+    """Test learned capabilities are saved and restored per endpoint and model."""
+    store = FakeStore()
+    cache = CapabilityCache(store)
+    cache.learn(KEY, request(), TypeError("create() got an unexpected keyword argument 'reasoning'"))
+    assert store.saved == {
+        "models": [
+            {
+                "base_url": "http://localhost:8080/v1",
+                "model": "local-model",
+                "unsupported_parameters": ["reasoning"],
+                "unsupported_tools": [],
+                "streaming": True,
+            }
+        ]
+    }
+
+    restored = CapabilityCache(data=store.saved)
+    kwargs = request()
+    assert restored.shape(KEY, kwargs) == ["reasoning"]
+    assert restored.shape(CapabilityCache.key(None, "local-model"), request()) == []
@@ -0,0 +1,79 @@
+"""Test sharing one turn between satellites."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.openai_conversation_plus.coalesce import TurnCoalescer
+
+
+class Turn:
+    """A turn that records its calls and waits to be released."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        await self.release.wait()
+        return f"answer {self.calls}"
+
+
+async def test_identical_turns_share_one_call():
+    """Test a second satellite joins the running turn."""
+    coalescer = TurnCoalescer()
+    turn = Turn()
+    first = asyncio.create_task(coalescer.run("key", 2, turn))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(coalescer.run("key", 2, turn))
+    await asyncio.sleep(0)
+    turn.release.set()
+    assert await first == ("answer 1", False)
+    assert await second == ("answer 1", True)
+    assert turn.calls == 1
+    assert coalescer.stats.as_dict() == {"turns": 1, "joined": 1, "join_rate": 0.5}
+
+
+async def test_late_duplicate_gets_finished_result():
+    """Test a duplicate arriving after the turn finished, but within the window, is shared."""
+    coalescer = TurnCoalescer()
+    turn = Turn()
+    turn.release.set()
+    assert await coalescer.run("key", 2, turn, now=10) == ("answer 1", False)
+    assert await coalescer.run("key", 2, turn, now=11) == ("answer 1", True)
+    assert await coalescer.run("key", 2, turn, now=13) == ("answer 2", False)
+    assert await coalescer.run("other", 2, turn, now=13) == ("answer 3", False)
+    assert len(coalescer) == 2
+
+
+async def test_shared_turn_error_reaches_every_caller():
+    """Test callers that joined a failed turn get its error."""
+    coalescer = TurnCoalescer()
+
+    async def fail():
+        await asyncio.sleep(0)
+        raise ValueError("boom")
+
+    first = asyncio.create_task(coalescer.run("key", 2, fail))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(coalescer.run("key", 2, fail))
+    for task in (first, second):
+        with pytest.raises(ValueError):
+            await task
+
+
+async def test_cancelled_turn_is_run_by_joined_caller():
+    """Test a caller that joined a cancelled turn runs it on its own."""
+    coalescer = TurnCoalescer()
+    turn = Turn()
+    first = asyncio.create_task(coalescer.run("key", 2, turn))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(coalescer.run("key", 2, turn))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    turn.release.set()
+    assert await second == ("answer 2", False)
+    assert coalescer.stats.as_dict()["joined"] == 0
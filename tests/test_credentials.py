@@ -0,0 +1,70 @@
+"""Test background validation of the API key."""
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, patch
+
+import httpx
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import issue_registry as ir
+from openai import APIConnectionError, AuthenticationError
+
+from custom_components.openai_conversation_plus.const import DOMAIN
+from custom_components.openai_conversation_plus.credentials import (
+    ValidationCache,
+    async_validate_entry,
+    issue_id,
+    key_hash,
+)
+
+VALIDATE = "custom_components.openai_conversation_plus.helpers.validate_authentication"
+REQUEST = httpx.Request("GET", "https://api.openai.com/v1/models")
+
+
+def test_cache_expires_after_ttl():
+    """Test a validation is trusted for the TTL only."""
+    cache = ValidationCache(ttl=100)
+    key = key_hash("sk-test", None)
+    assert not cache.is_valid(key, now=0)
+    cache.remember(key, now=0)
+    assert cache.is_valid(key, now=99)
+    assert not cache.is_valid(key, now=100)
+    assert "sk-test" not in str(cache.as_data())
+    assert ValidationCache(data=cache.as_data(), ttl=100).is_valid(key, now=50)
+
+
+def test_key_hash_depends_on_endpoint():
+    """Test the same key on another endpoint is validated again."""
+    assert key_hash("sk-test", "https://api.openai.com/v1/") == key_hash("sk-test", "https://api.openai.com/v1")
+    assert key_hash("sk-test", None) != key_hash("sk-test", "http://localhost:8080/v1")
+
+
+async def test_valid_key_is_checked_once(hass: HomeAssistant, mock_config_entry):
+    """Test a validated key is not checked again within the TTL."""
+    cache = ValidationCache()
+    with patch(VALIDATE, AsyncMock()) as validate:
+        assert await async_validate_entry(hass, mock_config_entry, cache) is True
+        assert await async_validate_entry(hass, mock_config_entry, cache) is True
+    assert validate.await_count == 1
+
+
+async def test_rejected_key_raises_issue(hass: HomeAssistant, mock_config_entry):
+    """Test a rejected key creates a repair issue that a valid key removes."""
+    cache = ValidationCache()
+    error = AuthenticationError("invalid key", response=httpx.Response(401, request=REQUEST), body=None)
+    with patch(VALIDATE, AsyncMock(side_effect=error)):
+        assert await async_validate_entry(hass, mock_config_entry, cache) is False
+    registry = ir.async_get(hass)
+    assert registry.async_get_issue(DOMAIN, issue_id(mock_config_entry)) is not None
+
+    with patch(VALIDATE, AsyncMock()):
+        assert await async_validate_entry(hass, mock_config_entry, cache) is True
+    assert registry.async_get_issue(DOMAIN, issue_id(mock_config_entry)) is None
+
+
+async def test_unreachable_api_is_not_cached(hass: HomeAssistant, mock_config_entry):
+    """Test a network error neither raises an issue nor marks the key valid."""
+    cache = ValidationCache()
+    with patch(VALIDATE, AsyncMock(side_effect=APIConnectionError(request=REQUEST))):
+        assert await async_validate_entry(hass, mock_config_entry, cache) is None
+    assert ir.async_get(hass).async_get_issue(DOMAIN, issue_id(mock_config_entry)) is None
+    assert cache.as_data() == {"validated": {}}
@@ -0,0 +1,74 @@
+"""Test the per-turn deadline."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.openai_conversation_plus.deadline import TurnDeadline
+from custom_components.openai_conversation_plus.exceptions import ToolTimeout, TurnTimeout
+
+
+async def test_run_tool_returns_result():
+    """Test a tool finishing in time returns its result."""
+    deadline = TurnDeadline(30, 5, 1.5)
+
+    async def tool():
+        return "done"
+
+    assert await deadline.run_tool("fast", tool()) == "done"
+    assert deadline.timed_out_tools == []
+
+
+async def test_run_tool_cancels_overdue_tool():
+    """Test an overdue tool is cancelled and reported."""
+    deadline = TurnDeadline(30, 5, 1.5)
+    cancelled = asyncio.Event()
+
+    async def tool():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(ToolTimeout):
+        await deadline.run_tool("slow", tool(), 0.01)
+
+    assert cancelled.is_set()
+    assert deadline.timed_out_tools == ["slow"]
+
+
+def test_tool_timeout_capped_by_remaining_budget():
+    """Test tool timeouts never exceed the remaining turn budget."""
+    deadline = TurnDeadline(2, 10, 1.5)
+    assert deadline.tool_timeout() <= 2
+    assert deadline.tool_timeout(0.5) == 0.5
+
+
+def test_round_trip_estimate():
+    """Test the round trip estimate follows the slowest observed trip."""
+    deadline = TurnDeadline(5, 10, 1.5)
+    assert deadline.can_afford_round_trip()
+    deadline.record_round_trip(6)
+    assert not deadline.can_afford_round_trip()
+
+
+async def test_model_requests_bounded_by_turn_budget():
+    """Test model requests, streamed or not, are cancelled when the turn budget runs out."""
+    deadline = TurnDeadline(0.01, 5, 1.5)
+
+    async def request():
+        await asyncio.sleep(10)
+
+    with pytest.raises(TurnTimeout):
+        await deadline.run_request(request())
+
+    with pytest.raises(TurnTimeout):
+        async with deadline.limit_request():
+            await asyncio.sleep(10)
+
+    async def answer():
+        return "answer"
+
+    assert await TurnDeadline(30, 5, 1.5).run_request(answer()) == "answer"
@@ -0,0 +1,81 @@
+"""Test the fake Responses API through the real OpenAI client."""
+from __future__ import annotations
+
+import httpx
+import openai
+import pytest
+from openai import AsyncOpenAI
+
+from custom_components.openai_conversation_plus.scheduler import RequestScheduler
+from tests.fake_responses import FakeResponsesAPI, FunctionCall, ScriptedTurn
+
+
+def _client(api: FakeResponsesAPI, **hooks) -> AsyncOpenAI:
+    http_client = httpx.AsyncClient(transport=api.transport(), event_hooks=hooks)
+    return AsyncOpenAI(api_key="fake", base_url="http://fake/v1", http_client=http_client, max_retries=0)
+
+
+async def test_streams_scripted_turns():
+    """Test text and function calls stream as events the client assembles."""
+    api = FakeResponsesAPI(
+        [
+            ScriptedTurn("Turned off the kitchen lights.", input_tokens=1200, cached_tokens=1024),
+            ScriptedTurn(calls=(FunctionCall("execute_services", {"list": [{"domain": "light"}]}),)),
+        ],
+        delta_size=8,
+    )
+    client = _client(api)
+
+    async with client.responses.stream(model="gpt-5-mini", input="Turn off the kitchen") as stream:
+        types = [event.type async for event in stream]
+        final = await stream.get_final_response()
+    assert types.count("response.output_text.delta") == 4
+    assert final.output_text == "Turned off the kitchen lights."
+    assert final.usage.input_tokens_details.cached_tokens == 1024
+
+    async with client.responses.stream(model="gpt-5-mini", input="Turn off the kitchen") as stream:
+        async for _event in stream:
+            pass
+        final = await stream.get_final_response()
+    [call] = final.output
+    assert call.type == "function_call"
+    assert call.name == "execute_services"
+    assert call.arguments == '{"list": [{"domain": "light"}]}'
+    assert api.requests[-1]["model"] == "gpt-5-mini"
+
+
+async def test_rate_limits_feed_the_scheduler():
+    """Test the rate limit headers and 429s reach the scheduler."""
+    api = FakeResponsesAPI(requests_per_minute=2)
+    scheduler = RequestScheduler()
+
+    async def observe(response: httpx.Response) -> None:
+        scheduler.observe_response(response.status_code, response.headers)
+
+    client = _client(api, response=[observe])
+    await client.responses.create(model="gpt-5-mini", input="hi")
+    assert scheduler.as_dict()["requests_remaining"] == 1
+    await client.responses.create(model="gpt-5-mini", input="hi")
+    with pytest.raises(openai.RateLimitError):
+        await client.responses.create(model="gpt-5-mini", input="hi")
+    assert api.rate_limited == 1
+    assert scheduler.as_dict()["requests_remaining"] == 0
+
+
+async def test_injected_errors():
+    """Test scripted and random errors fail requests with their status."""
+    api = FakeResponsesAPI([ScriptedTurn(error=503), ScriptedTurn("OK")], error_rate=0.5, error_status=500, seed=3)
+    client = _client(api)
+    with pytest.raises(openai.InternalServerError) as err:
+        await client.responses.create(model="gpt-5-mini", input="hi", stream=True)
+    assert err.value.status_code == 503
+
+    statuses = set()
+    for _ in range(20):
+        try:
+            await client.responses.create(model="gpt-5-mini", input="hi")
+        except openai.InternalServerError as error:
+            statuses.add(error.status_code)
+        else:
+            statuses.add(200)
+    assert statuses == {200, 500, 503}
@@ -0,0 +1,58 @@
+"""Test skipping vision requests for unchanged frames."""
+from __future__ import annotations
+
+from custom_components.openai_conversation_plus.frame_gate import FrameGate
+
+
+def test_unchanged_frames_reuse_the_answer():
+    """Test frames within the threshold return the previous answer."""
+    gate = FrameGate()
+    key = FrameGate.key("gpt-5", "Anyone there?", ["camera.door"])
+    assert gate.check(key, [0b1010], 2) is None
+    gate.remember(key, [0b1010], {"content": "No"})
+
+    assert gate.check(key, [0b1011], 2) == ({"content": "No"}, 1)
+    assert gate.check(key, [0b0101], 2) is None
+    assert gate.stats(["camera.door"]) == {"camera.door": {"checks": 3, "skips": 1, "skip_rate": 0.333}}
+
+
+def test_every_source_must_be_unchanged():
+    """Test one changed frame of several forces a new request."""
+    gate = FrameGate()
+    key = FrameGate.key("gpt-5", "Compare", ["camera.a", "camera.b"])
+    gate.remember(key, [0, 0], {"content": "Same"})
+    assert gate.check(key, [0, 0xFF], 4) is None
+    assert gate.check(key, [1, 0], 4) == ({"content": "Same"}, 1)
+
+
+def test_sources_without_fingerprint_are_never_skipped():
+    """Test remote images, which have no fingerprint, are always queried."""
+    gate = FrameGate()
+    key = FrameGate.key("gpt-5", "Describe", ["https://example.com/a.jpg"])
+    gate.remember(key, [None], {"content": "A cat"})
+    assert gate.check(key, [None], 64) is None
+
+
+def test_prompt_and_model_are_part_of_the_key():
+    """Test another question about the same frame is not answered from the gate."""
+    gate = FrameGate()
+    gate.remember(FrameGate.key("gpt-5", "Anyone there?", ["camera.door"]), [7], {"content": "No"})
+    assert gate.check(FrameGate.key("gpt-5", "Any parcels?", ["camera.door"]), [7], 0) is None
+    assert gate.check(FrameGate.key("gpt-5-mini", "Anyone there?", ["camera.door"]), [7], 0) is None
+
+
+def test_oldest_queries_are_evicted():
+    """Test the gate remembers a bounded number of queries."""
+    gate = FrameGate(max_entries=1)
+    first = FrameGate.key("gpt-5", "a", ["camera.a"])
+    gate.remember(first, [1], {"content": "a"})
+    gate.remember(FrameGate.key("gpt-5", "b", ["camera.b"]), [1], {"content": "b"})
+    assert gate.check(first, [1], 0) is None
+
+
+def test_least_recent_source_counters_are_evicted():
+    """Test skip counters are kept for a bounded number of sources."""
+    gate = FrameGate(max_sources=2)
+    for source in ("camera.a", "camera.b", "camera.a", "camera.c"):
+        gate.check(FrameGate.key("gpt-5", "a", [source]), [1], 0)
+    assert list(gate.stats(["camera.a", "camera.b", "camera.c"])) == ["camera.a", "camera.c"]
@@ -0,0 +1,155 @@
+"""Test hedged model requests."""
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.openai_conversation_plus.hedging import (
+    HedgedStream,
+    HedgePolicy,
+    HedgeStats,
+    async_hedge,
+    hedge_kwargs,
+    is_output_event,
+)
+
+
+def event(etype, **data):
+    return SimpleNamespace(type=etype, **data)
+
+
+class FakeStreamManager:
+    """Stand-in for `client.responses.stream` that waits before its output."""
+
+    def __init__(self, delay, text, closed):
+        self.delay = delay
+        self.text = text
+        self.closed = closed
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.closed.append(self.text)
+
+    async def __aiter__(self):
+        yield event("response.created")
+        await asyncio.sleep(self.delay)
+        yield event("response.output_text.delta", delta=self.text)
+        yield event("response.completed")
+
+    async def get_final_response(self):
+        return self.text
+
+
+async def test_fast_request_is_not_hedged():
+    """Test no second request is sent when output arrives in time."""
+    stats = HedgeStats()
+    calls = []
+
+    async def primary():
+        calls.append("primary")
+        return "primary"
+
+    async def hedge():
+        calls.append("hedge")
+        return "hedge"
+
+    assert await async_hedge(primary, hedge, HedgePolicy(0.5), stats) == "primary"
+    assert calls == ["primary"]
+    assert (stats.requests, stats.fired, stats.won) == (1, 0, 0)
+
+
+async def test_slow_request_loses_to_hedge():
+    """Test the hedged request wins and the slow one is cancelled."""
+    stats = HedgeStats()
+    cancelled = asyncio.Event()
+
+    async def primary():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def hedge():
+        return "hedge"
+
+    assert await async_hedge(primary, hedge, HedgePolicy(0.01), stats) == "hedge"
+    assert cancelled.is_set()
+    assert stats.as_dict() == {"requests": 1, "fired": 1, "won": 1, "fire_rate": 1.0, "win_rate": 1.0}
+
+
+async def test_failed_request_falls_back_to_hedge():
+    """Test a request failing after the hedge started does not fail the turn."""
+    stats = HedgeStats()
+
+    async def primary():
+        await asyncio.sleep(0.02)
+        raise RuntimeError("boom")
+
+    async def hedge():
+        await asyncio.sleep(0.05)
+        return "hedge"
+
+    assert await async_hedge(primary, hedge, HedgePolicy(0.01), stats) == "hedge"
+
+
+async def test_both_failing_raises_original_error():
+    """Test the original error is raised when both requests fail."""
+
+    async def primary():
+        await asyncio.sleep(0.02)
+        raise RuntimeError("primary")
+
+    async def hedge():
+        raise RuntimeError("hedge")
+
+    with pytest.raises(RuntimeError, match="primary"):
+        await async_hedge(primary, hedge, HedgePolicy(0.01), HedgeStats())
+
+
+async def test_hedged_stream_uses_first_output_and_closes_loser():
+    """Test the stream that outputs first is used and the other one closed."""
+    closed = []
+    delays = {"gpt-5": 1.0, "gpt-5-nano": 0.0}
+
+    def open_stream(**kwargs):
+        return FakeStreamManager(delays[kwargs["model"]], kwargs["model"], closed)
+
+    stats = HedgeStats()
+    async with HedgedStream(
+        open_stream, {"model": "gpt-5"}, HedgePolicy(0.01, "gpt-5-nano"), stats
+    ) as stream:
+        assert closed == ["gpt-5"]
+        events = [item.type async for item in stream]
+        assert await stream.get_final_response() == "gpt-5-nano"
+
+    assert events == ["response.created", "response.output_text.delta", "response.completed"]
+    assert closed == ["gpt-5", "gpt-5-nano"]
+    assert stats.won == 1
+
+
+def test_hedge_kwargs_for_other_model_family():
+    """Test reasoning and verbosity are dropped for models without them."""
+    kwargs = {
+        "model": "gpt-5",
+        "reasoning": {"effort": "medium"},
+        "text": {"verbosity": "low", "format": {"type": "text"}},
+    }
+    assert hedge_kwargs(kwargs, None) == kwargs
+    assert hedge_kwargs(kwargs, "gpt-5-nano")["reasoning"] == {"effort": "medium"}
+    hedged = hedge_kwargs(kwargs, "gpt-4o-mini")
+    assert hedged == {"model": "gpt-4o-mini", "text": {"format": {"type": "text"}}}
+    assert kwargs["model"] == "gpt-5"
+
+
+def test_reasoning_is_not_output():
+    """Test only events carrying an answer or a tool call end the wait."""
+    assert not is_output_event(event("response.created"))
+    assert not is_output_event(event("response.reasoning_summary_text.delta"))
+    assert not is_output_event(event("response.output_item.added", item=SimpleNamespace(type="reasoning")))
+    assert is_output_event(event("response.output_item.added", item=SimpleNamespace(type="function_call")))
+    assert is_output_event(event("response.output_text.delta", delta="Hi"))
@@ -0,0 +1,49 @@
+"""Test lazy loading of function executors."""
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.openai_conversation_plus import helpers
+from custom_components.openai_conversation_plus.exceptions import FunctionNotFound, InvalidFunction
+
+
+def test_import_does_not_load_executor_dependencies():
+    """Test importing the integration leaves rest, scrape and bs4 unloaded."""
+    code = (
+        "import sys, custom_components.openai_conversation_plus;"
+        "print(sorted(m for m in ('bs4', 'homeassistant.components.rest', 'homeassistant.components.scrape')"
+        " if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_function_types_include_composite_steps():
+    """Test the types of composite steps are collected."""
+    functions = [
+        {"type": "native", "name": "execute_service"},
+        {"type": "composite", "sequence": [{"type": "rest"}, {"type": "template"}]},
+    ]
+    assert helpers.function_types(functions) == {"native", "composite", "rest", "template"}
+
+
+def test_executor_created_once():
+    """Test an executor is created on first use and reused."""
+    executor = helpers.get_function_executor("template")
+    assert helpers.get_function_executor("template") is executor
+    with pytest.raises(FunctionNotFound):
+        helpers.get_function_executor("unknown")
+    with pytest.raises(InvalidFunction) as err:
+        executor.to_arguments({"type": "template"})
+    assert err.value.function_name == "template"
+
+
+async def test_load_executors_ahead(hass: HomeAssistant):
+    """Test executors of configured types are created by the loader."""
+    await helpers.async_load_function_executors(hass, {"rest", "unknown"})
+    assert isinstance(helpers._LOADED_EXECUTORS["rest"], helpers.RestFunctionExecutor)
+    assert "unknown" not in helpers._LOADED_EXECUTORS
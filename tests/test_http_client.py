@@ -0,0 +1,56 @@
+"""Test the OpenAI HTTP client settings and connection counters."""
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from custom_components.openai_conversation_plus.const import (
+    CONF_HTTP_MAX_CONNECTIONS,
+    CONF_HTTP_READ_TIMEOUT,
+    CONF_KEEP_WARM_INTERVAL,
+)
+from custom_components.openai_conversation_plus.http_client import (
+    ConnectionStats,
+    HttpClientSettings,
+    OpenAIHttpClient,
+)
+
+
+def test_settings_from_options():
+    """Test options map to pool limits and per-phase timeouts."""
+    settings = HttpClientSettings.from_options(
+        {CONF_HTTP_MAX_CONNECTIONS: 4, CONF_HTTP_READ_TIMEOUT: 30, CONF_KEEP_WARM_INTERVAL: 0}
+    )
+    assert settings.limits.max_connections == 4
+    assert settings.limits.max_keepalive_connections == 4
+    assert settings.timeout.read == 30
+    assert settings.timeout.connect == HttpClientSettings().connect_timeout
+    assert settings.keep_warm_interval == 0
+
+
+def test_settings_compare_equal():
+    """Test unchanged options give equal settings, so no reload is needed."""
+    assert HttpClientSettings.from_options({}) == HttpClientSettings()
+    assert HttpClientSettings.from_options({CONF_HTTP_MAX_CONNECTIONS: 2}) != HttpClientSettings()
+
+
+def test_connection_reuse_rate():
+    """Test requests without a new connection count as reused."""
+    stats = ConnectionStats(requests=10, new_connections=2)
+    assert stats.reused == 8
+    assert stats.reuse_rate == 0.8
+    assert stats.as_dict()["reuse_rate"] == 0.8
+    assert ConnectionStats().reuse_rate == 0.0
+
+
+async def test_client_uses_the_entry_settings():
+    """Test the client is built with the entry's pool limits and timeouts."""
+    settings = HttpClientSettings.from_options({CONF_HTTP_MAX_CONNECTIONS: 3, CONF_HTTP_READ_TIMEOUT: 20})
+    http = OpenAIHttpClient(SimpleNamespace(), settings, http2=False)
+    try:
+        assert http.client.timeout.read == 20
+        assert http.client.timeout.connect == settings.connect_timeout
+        pool = http.client._transport._pool
+        assert pool._max_connections == 3
+        assert "User-Agent" in http.client.headers
+    finally:
+        await http.async_close()
@@ -0,0 +1,149 @@
+"""Test image preparation for vision requests."""
+from __future__ import annotations
+
+import base64
+import io
+
+import pytest
+
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.openai_conversation_plus.images import (
+    ImageCache,
+    ImageOptions,
+    PreparedImage,
+    b64encode_stream,
+    encode_image_bytes,
+    frame_hash,
+    hash_distance,
+    prepare_image,
+)
+
+
+def test_chunked_encoding_matches_base64():
+    """Test chunked encoding gives the same result as encoding at once."""
+    data = bytes(range(256)) * 3000
+    assert b64encode_stream(io.BytesIO(data), "x:") == "x:" + base64.b64encode(data).decode()
+
+
+def test_prepare_image_without_resizing(tmp_path):
+    """Test a local image becomes a data URL."""
+    path = tmp_path / "snapshot.png"
+    path.write_bytes(b"\x89PNG fake")
+    prepared = prepare_image(str(path), ImageOptions(max_edge=0))
+    assert prepared.fingerprint is None
+    assert prepared.data_url == "data:image/png;base64," + base64.b64encode(b"\x89PNG fake").decode()
+
+
+def test_prepare_image_is_cached_until_file_changes(tmp_path):
+    """Test an unchanged file is encoded once."""
+    path = tmp_path / "snapshot.png"
+    path.write_bytes(b"first")
+    cache = ImageCache()
+    options = ImageOptions(max_edge=0)
+    first = prepare_image(str(path), options, cache)
+    assert prepare_image(str(path), options, cache) == first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    path.write_bytes(b"second, longer")
+    assert prepare_image(str(path), options, cache) != first
+    assert cache.misses == 2
+
+
+def test_cache_evicts_over_size_limit():
+    """Test the cache stays within its byte limit."""
+    cache = ImageCache(max_bytes=10)
+    cache.put(("a",), PreparedImage("123456"))
+    cache.put(("b",), PreparedImage("123456"))
+    assert cache.get(("a",)) is None
+    assert cache.get(("b",)) == PreparedImage("123456")
+
+
+def test_prepare_image_errors(tmp_path):
+    """Test missing files and non-images are rejected."""
+    with pytest.raises(HomeAssistantError):
+        prepare_image(str(tmp_path / "missing.jpg"), ImageOptions())
+    text = tmp_path / "notes.txt"
+    text.write_text("hello")
+    with pytest.raises(HomeAssistantError):
+        prepare_image(str(text), ImageOptions())
+
+
+def test_prepare_image_downscales(tmp_path):
+    """Test large images are re-encoded within the maximum edge."""
+    image_module = pytest.importorskip("PIL.Image")
+    path = tmp_path / "large.png"
+    image_module.new("RGB", (800, 400), "red").save(path)
+
+    data_url = prepare_image(str(path), ImageOptions(max_edge=200, quality=80)).data_url
+    assert data_url.startswith("data:image/jpeg;base64,")
+    decoded = base64.b64decode(data_url.split(",", 1)[1])
+    with image_module.open(io.BytesIO(decoded)) as image:
+        assert image.size == (200, 100)
+
+
+def test_encode_image_bytes_in_memory():
+    """Test camera frames are encoded without touching disk."""
+    data_url = encode_image_bytes(b"jpeg bytes", "image/jpeg", ImageOptions(max_edge=0)).data_url
+    assert data_url == "data:image/jpeg;base64," + base64.b64encode(b"jpeg bytes").decode()
+
+
+def test_encode_image_bytes_downscales():
+    """Test large camera frames are downscaled."""
+    image_module = pytest.importorskip("PIL.Image")
+    frame = io.BytesIO()
+    image_module.new("RGB", (1920, 1080), "blue").save(frame, format="JPEG")
+
+    data_url = encode_image_bytes(frame.getvalue(), "image/jpeg", ImageOptions(max_edge=640)).data_url
+    decoded = base64.b64decode(data_url.split(",", 1)[1])
+    with image_module.open(io.BytesIO(decoded)) as image:
+        assert max(image.size) == 640
+
+
+def test_frame_hash_tells_scenes_apart(tmp_path):
+    """Test similar frames hash close together and a changed scene does not."""
+    image_module = pytest.importorskip("PIL.Image")
+    draw_module = pytest.importorskip("PIL.ImageDraw")
+
+    def frame(name, box, shade=255):
+        image = image_module.new("L", (320, 240), 0)
+        draw_module.Draw(image).rectangle(box, fill=shade)
+        image.save(tmp_path / name)
+        return str(tmp_path / name)
+
+    first = frame_hash(frame("a.png", (20, 20, 120, 200)))
+    brighter = frame_hash(frame("b.png", (20, 20, 120, 200), shade=235))
+    moved = frame_hash(frame("c.png", (180, 20, 300, 200)))
+    assert hash_distance(first, brighter) <= 2
+    assert hash_distance(first, moved) > 6
+
+
+def test_prepare_image_adds_fingerprint_to_cached_entry(tmp_path):
+    """Test a fingerprint is computed once for an already cached image."""
+    image_module = pytest.importorskip("PIL.Image")
+    path = tmp_path / "snapshot.png"
+    image_module.new("RGB", (64, 48), "green").save(path)
+    cache = ImageCache()
+    options = ImageOptions(max_edge=0)
+
+    assert prepare_image(str(path), options, cache).fingerprint is None
+    fingerprinted = prepare_image(str(path), options, cache, fingerprint=True)
+    assert fingerprinted.fingerprint is not None
+    assert prepare_image(str(path), options, cache, fingerprint=True) == fingerprinted
+    assert cache.misses == 1
+
+
+def test_frame_hash_of_undecodable_image():
+    """Test an image Pillow cannot read gets no fingerprint instead of failing."""
+    pytest.importorskip("PIL.Image")
+    assert frame_hash(io.BytesIO(b"not an image")) is None
+
+
+def test_undecodable_image_is_sent_as_is(tmp_path):
+    """Test a file Pillow cannot read is uploaded unchanged instead of failing."""
+    pytest.importorskip("PIL.Image")
+    path = tmp_path / "bad.png"
+    path.write_bytes(b"\x89PNG broken")
+    prepared = prepare_image(str(path), ImageOptions())
+    assert prepared.data_url == "data:image/png;base64," + base64.b64encode(b"\x89PNG broken").decode()
+    assert encode_image_bytes(b"not an image", "image/jpeg", ImageOptions()).data_url.startswith("data:image/jpeg;base64,")
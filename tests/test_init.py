@@ -51,16 +51,18 @@ async def test_setup_entry_auth_failed(
     mock_config_entry,
     mock_openai_client,
 ):
-    """Test setup with authentication failure."""
+    """Test setup does not wait for or fail on API key validation."""
     mock_config_entry.add_to_hass(hass)
 
     with patch(
         "custom_components.openai_conversation_plus.helpers.validate_authentication",
         side_effect=Exception("Authentication failed"),
-    ):
+    ) as mock_validate:
         result = await async_setup_entry(hass, mock_config_entry)
+        await hass.async_block_till_done()
 
-    assert result is False
+    assert result is True
+    mock_validate.assert_awaited_once()
 
 
 async def test_unload_entry(
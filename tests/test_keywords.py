@@ -0,0 +1,48 @@
+"""Test the action-keyword matcher."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.openai_conversation_plus.keywords import detect_action
+
+
+@pytest.mark.parametrize(
+    ("text", "language"),
+    [
+        ("Släck lampan i hallen", "sv"),
+        ("sätt på tv:n", "sv"),
+        ("Kan du tända köket?", "sv"),
+        ("Turn off the kitchen lights", "en"),
+        ("could you set the thermostat to 21?", "en"),
+        ("stäng av fläkten", None),
+        ("var snäll och släck lampan", "sv"),
+        ("Var så snäll och tänd i köket", None),
+        ("do turn off the lights", "en"),
+        ("is it possible to turn on the fan", "en"),
+    ],
+)
+def test_commands_force(text, language):
+    """Test imperative commands are detected."""
+    assert detect_action(text, language).force
+
+
+@pytest.mark.parametrize(
+    ("text", "language", "reason"),
+    [
+        ("open the settings page", "en", "action keyword"),
+        ("show me the settings", "en", "no action keyword"),
+        ("When does the bus stop at our street", "en", "question word"),
+        ("Is the garage door open?", "en", "question word"),
+        ("Vad är temperaturen ute?", "sv", "question word"),
+        ("Dags att sätta igång?", "sv", "question mark"),
+        ("Jag gillar dimman", "sv", "no action keyword"),
+        ("Var är fjärrkontrollen", "sv", "question word"),
+        ("Har du släckt i köket", "sv", "question word"),
+        ("do you know if the garage is open", "en", "question word"),
+    ],
+)
+def test_decisions(text, language, reason):
+    """Test word boundaries, questions and decision reasons."""
+    decision = detect_action(text, language)
+    assert decision.reason == reason
+    assert decision.force is (reason == "action keyword")
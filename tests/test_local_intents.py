@@ -0,0 +1,90 @@
+"""Test the local fast-path intent matcher."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.openai_conversation_plus.keywords import INTENT_VERBS, detect_action
+from custom_components.openai_conversation_plus.local_intents import (
+    EntityIndex,
+    confirmation,
+    match_local_intent,
+)
+
+
+@pytest.fixture
+def index() -> EntityIndex:
+    """Return an index with a few entities and areas."""
+    index = EntityIndex("sv")
+    index.add_entity("light.kitchen_ceiling", ["Kitchen ceiling", "Taklampa kök"])
+    index.add_entity("cover.garage", ["Garage door", "Garageport"])
+    index.add_entity("switch.coffee", ["Kaffebryggare"])
+    index.add_entity("light.bed_1", ["Sänglampa"])
+    index.add_entity("light.bed_2", ["Sänglampa"])
+    index.add_area("kitchen", ["Kök", "Kitchen"])
+    return index
+
+
+def test_swedish_area_light_command(index):
+    """Test 'tänd köket' turns on the kitchen lights."""
+    match = match_local_intent("Tänd köket", index)
+    assert match is not None
+    assert (match.domain, match.service) == ("light", "turn_on")
+    assert match.target == {"area_id": ["kitchen"]}
+
+
+def test_english_entity_command(index):
+    """Test an English command on a named entity."""
+    match = match_local_intent("Open the garage door", index)
+    assert (match.domain, match.service) == ("cover", "open_cover")
+    assert match.target == {"entity_id": "cover.garage"}
+
+
+def test_brightness_value(index):
+    """Test a percentage is mapped to brightness."""
+    match = match_local_intent("set the kitchen lights to 30%", index)
+    assert match.service == "turn_on"
+    assert match.service_data == {"brightness_pct": 30}
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "vad är temperaturen i köket",
+        "turn on kitchen",
+        "släck sänglampan",
+        "tänd köket och hallen",
+        "set kitchen lights",
+        "öppna kaffebryggaren",
+    ],
+)
+def test_falls_through(index, text):
+    """Test questions, ambiguous and unsupported commands go to the model."""
+    assert match_local_intent(text, index) is None
+
+
+def test_confirmation_language():
+    """Test confirmations follow the request language."""
+    assert confirmation("sv") == "Utfört."
+    assert confirmation("en-GB") == "Done."
+    assert confirmation("de") == "Done."
+
+
+def test_intent_verbs_are_action_keywords():
+    """Test the verbs local intents handle come from the keyword tables and force tools."""
+    assert INTENT_VERBS["tänd"] == ("turn_on", "light")
+    assert INTENT_VERBS["turn off"] == ("turn_off", None)
+    for verb in INTENT_VERBS:
+        assert detect_action(f"{verb} the kitchen").force, verb
+
+
+def test_percentages_are_not_dropped(index):
+    """Test a percentage with an on or open verb sets the level, and is never ignored."""
+    match = match_local_intent("tänd köket 50%", index)
+    assert (match.domain, match.service) == ("light", "turn_on")
+    assert match.service_data == {"brightness_pct": 50}
+
+    match = match_local_intent("open garage door 50%", index)
+    assert (match.service, match.service_data) == ("set_cover_position", {"position": 50})
+
+    assert match_local_intent("släck köket 50%", index) is None
+    assert match_local_intent("sätt på kaffebryggare 50%", index) is None
@@ -0,0 +1,68 @@
+"""Test lazy log arguments and the per-turn summary."""
+from __future__ import annotations
+
+import logging
+
+from custom_components.openai_conversation_plus.log_utils import (
+    lazy_json,
+    lazy_preview,
+    log_turn_summary,
+    turn_summary,
+)
+from custom_components.openai_conversation_plus.traces import TurnTrace
+
+
+class _Unserializable:
+    def __init__(self) -> None:
+        self.formatted = 0
+
+    def __str__(self) -> str:
+        self.formatted += 1
+        return "value"
+
+
+def test_payloads_are_serialized_only_when_formatted():
+    """Test lazy arguments do no work until the record is formatted."""
+    value = _Unserializable()
+    payload = lazy_json({"value": value})
+    preview = lazy_preview(value, length=3)
+    assert value.formatted == 0
+    assert str(payload) == '{"value": "value"}'
+    assert str(preview) == "val..."
+    assert value.formatted == 2
+
+
+def test_summary_drops_empty_fields():
+    """Test the summary keeps what happened and leaves out what did not."""
+    trace = TurnTrace("conv")
+    trace.request = {"model": "gpt-5-mini", "stream": False, "tools": 0, "messages": 3}
+    trace.timings = {"total": 812.4}
+    trace.add_tool_call("get_state", None, {"ok": True}, 4)
+    fields = turn_summary(trace)
+    assert fields == {
+        "outcome": "model",
+        "conversation_id": "conv",
+        "ms": 812.4,
+        "model": "gpt-5-mini",
+        "stream": False,
+        "messages": 3,
+        "tool_calls": ["get_state"],
+    }
+
+
+def test_summary_is_one_info_record(caplog):
+    """Test a turn logs one INFO record at INFO and none above it."""
+    logger = logging.getLogger("custom_components.openai_conversation_plus.test")
+    trace = TurnTrace("conv")
+    trace.add_tool_call("get_state", None, {"ok": True}, 4)
+    trace.add_tool_call("execute_services", None, {"ok": False, "error": "timeout"}, 4)
+
+    with caplog.at_level(logging.WARNING, logger=logger.name):
+        log_turn_summary(logger, trace)
+    assert not caplog.records
+
+    with caplog.at_level(logging.INFO, logger=logger.name):
+        log_turn_summary(logger, trace)
+    [record] = caplog.records
+    assert record.turn["tool_failures"] == 1
+    assert "tool_calls=get_state,execute_services" in record.getMessage()
@@ -0,0 +1,51 @@
+"""Test the performance aggregates behind the sensors."""
+from __future__ import annotations
+
+from custom_components.openai_conversation_plus.metrics import (
+    HourlyCounter,
+    PerformanceMetrics,
+    RollingHistogram,
+)
+from custom_components.openai_conversation_plus.traces import TurnTrace
+
+
+def test_hourly_counter_forgets_old_buckets():
+    """Test values older than the window no longer count."""
+    counter = HourlyCounter(window=3600, bucket=60)
+    counter.add(100, 0)
+    counter.add(50, 30)
+    counter.add(10, 1800)
+    assert counter.total(1800) == 160
+    assert counter.total(3650) == 10
+    assert counter.total(5500) == 0
+
+
+def test_rolling_histogram_keeps_two_periods():
+    """Test latencies of the previous period still count and older ones do not."""
+    histogram = RollingHistogram(period=100)
+    histogram.record(5000, 0)
+    histogram.record(100, 150)
+    assert histogram.percentile(99, 150) >= 4000
+    assert histogram.percentile(99, 250) == 100
+    assert histogram.percentile(50, 500) is None
+
+
+def test_turns_feed_metrics():
+    """Test a finished trace updates latency, tokens, tools and fallbacks."""
+    trace = TurnTrace("conv")
+    trace.timings = {"ttfb": 400.0, "total": 1500.0}
+    trace.usage = {"input_tokens": 1000, "output_tokens": 50, "cached_tokens": 750}
+    trace.add_tool_call("get_state", None, {"ok": True}, 5)
+    trace.add_tool_call("execute_services", None, {"ok": False, "error": "timeout"}, 5)
+    trace.fallbacks.append("non_streaming")
+
+    metrics = PerformanceMetrics()
+    metrics.record(trace, now=10)
+    assert metrics.turns == 1
+    assert metrics.tool_calls == 2 and metrics.tool_failures == 1
+    assert metrics.fallbacks == 1
+    assert metrics.output_tokens.total(10) == 50
+    assert metrics.cache_hit_rate(10) == 75.0
+    assert 1500 <= metrics.latency.percentile(50, 10) <= 1500 * 1.15
+    assert metrics.first_token.percentile(50, 10) is not None
+    assert PerformanceMetrics().cache_hit_rate(10) is None
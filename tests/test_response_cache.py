@@ -0,0 +1,90 @@
+"""Test the answer cache for read-only questions."""
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from custom_components.openai_conversation_plus.response_cache import (
+    ResponseCache,
+    entities_read,
+    entity_ids_in,
+    make_key,
+    mentioned_entities,
+)
+
+EXPOSED = [
+    {"entity_id": "sensor.outdoor_temperature", "name": "Outdoor temperature", "aliases": ["Ute"]},
+    {"entity_id": "cover.garage", "name": "Garage door", "aliases": []},
+]
+
+
+def test_key_is_normalized():
+    """Test punctuation and case do not change the key."""
+    assert make_key("Is the garage open?", "en", "hall") == make_key("is the  garage open", "EN", "hall")
+    assert make_key("Is the garage open?", "en", "hall") != make_key("Is the garage open?", "en", None)
+
+
+def test_hit_and_hit_rate():
+    """Test a stored answer is returned and counted."""
+    cache = ResponseCache(ttl=60)
+    key = make_key("Is the garage open?", "en", None)
+    assert cache.get(key, now=0) is None
+    assert cache.put(key, "Yes, it is open.", {"cover.garage"}, now=0)
+    cached = cache.get(key, now=1)
+    assert cached is not None and cached.answer == "Yes, it is open."
+    assert cache.stats.hits == 1 and cache.stats.misses == 1
+    assert cache.stats.hit_rate == 0.5
+
+
+def test_ttl_expiry():
+    """Test answers expire after the TTL."""
+    cache = ResponseCache(ttl=60)
+    key = make_key("Is the garage open?", "en", None)
+    cache.put(key, "Yes.", {"cover.garage"}, now=0)
+    assert cache.get(key, now=61) is None
+    assert cache.stats.expirations == 1
+    assert not cache.tracks("cover.garage")
+
+
+def test_state_change_invalidates():
+    """Test a state change drops every answer depending on the entity."""
+    cache = ResponseCache(ttl=60)
+    open_key = make_key("Is the garage open?", "en", None)
+    temp_key = make_key("How warm is it outside?", "en", None)
+    cache.put(open_key, "Yes.", {"cover.garage"}, now=0)
+    cache.put(temp_key, "12 degrees.", {"sensor.outdoor_temperature"}, now=0)
+    assert cache.invalidate_entity("cover.garage") == 1
+    assert cache.get(open_key, now=1) is None
+    assert cache.get(temp_key, now=1) is not None
+
+
+def test_untracked_answers_are_not_stored():
+    """Test answers without entities to watch are skipped."""
+    cache = ResponseCache(ttl=60)
+    assert not cache.put(make_key("Tell me a joke", "en", None), "No.", set())
+    assert len(cache) == 0
+
+
+def test_lru_eviction():
+    """Test the least recently used answer is evicted."""
+    cache = ResponseCache(ttl=60, max_entries=2)
+    keys = [make_key(f"question {i}", "en", None) for i in range(3)]
+    for key in keys:
+        cache.put(key, "answer", {"cover.garage"}, now=0)
+    assert len(cache) == 2
+    assert cache.get(keys[0], now=1) is None
+
+
+def test_entity_extraction():
+    """Test entities are found in tool arguments and in text."""
+    assert entity_ids_in({"entity_id": ["cover.garage"], "hours": 3, "name": "x"}) == {"cover.garage"}
+    assert mentioned_entities(["Is the garage door open?"], EXPOSED) == {"cover.garage"}
+    assert mentioned_entities(["Hur kallt är det ute?"], EXPOSED) == {"sensor.outdoor_temperature"}
+
+
+def test_dependencies_must_be_fully_known():
+    """Test an answer depends on known entities only when every tool call named them."""
+    history = SimpleNamespace(arguments={"entity_ids": ["cover.garage"], "hours": 3})
+    assert entities_read([history]) == {"cover.garage"}
+    # Answered from the states in the prompt, such as "how many lights are on?"
+    assert entities_read([]) is None
+    assert entities_read([history, SimpleNamespace(arguments={"domain": "light"})]) is None
@@ -0,0 +1,69 @@
+"""Test per-turn routing of model and reasoning settings."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.openai_conversation_plus.router import (
+    CONFIGURED_ROUTE,
+    RouterStats,
+    TurnFeatures,
+    choose_route,
+    parse_routes,
+)
+
+
+def test_features_of_a_command():
+    """Test a device command needs tools and is not a question."""
+    features = TurnFeatures.from_text("Turn off the hallway light", "en")
+    assert features == TurnFeatures(action=True, question=False, words=5, tools=True)
+
+
+def test_features_of_a_question():
+    """Test a question about a known entity needs tools."""
+    features = TurnFeatures.from_text("Is the front door locked?", "en", mentions_entity=True)
+    assert features.question and features.tools and not features.action
+
+
+def test_default_table_routes_commands_to_fast_model():
+    """Test the default table sends short commands to the small model."""
+    route = choose_route("", TurnFeatures.from_text("Turn off the hallway light", "en"))
+    assert (route.name, route.model, route.reasoning) == ("command", "gpt-5-mini", "low")
+    assert route.max_output_tokens == 300
+
+
+def test_default_table_keeps_configured_model_for_open_requests():
+    """Test long or open-ended requests keep the configured settings."""
+    route = choose_route("", TurnFeatures.from_text("Plan tomorrow's energy usage around the cheapest hours", "en"))
+    assert route.name == "default"
+    assert route.model is None and route.reasoning is None
+
+
+def test_custom_table_first_match_wins():
+    """Test routes are tried in order and word limits apply."""
+    table = """
+- name: short
+  when: {max_words: 3}
+  model: gpt-5-nano
+- name: long
+  when: {min_words: 4}
+  reasoning: high
+"""
+    assert choose_route(table, TurnFeatures(False, False, 2, False)).name == "short"
+    assert choose_route(table, TurnFeatures(False, False, 8, False)).reasoning == "high"
+
+
+def test_invalid_table_falls_back_to_configured_settings():
+    """Test a broken table does not break the turn."""
+    with pytest.raises(ValueError):
+        parse_routes("- name: x\n  when: {colour: red}")
+    assert choose_route("not: a list", TurnFeatures(True, False, 3, True)) is CONFIGURED_ROUTE
+
+
+def test_route_latency_stats():
+    """Test latency is recorded per route."""
+    stats = RouterStats()
+    stats.record("command", 400)
+    stats.record("command", 800)
+    stats.record("default", 3000)
+    assert stats.as_dict()["command"] == {"turns": 2, "mean_ms": 600, "max_ms": 800, "last_ms": 800}
+    assert stats.as_dict()["default"]["turns"] == 1
@@ -0,0 +1,185 @@
+"""Test the rate-limit-aware request scheduler."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.openai_conversation_plus.exceptions import CircuitOpen, SchedulerBusy
+from custom_components.openai_conversation_plus.scheduler import (
+    CircuitBreaker,
+    Priority,
+    RequestScheduler,
+    TokenBucket,
+    parse_duration,
+)
+
+
+class ServerError(Exception):
+    status_code = 500
+
+
+class BadRequest(Exception):
+    status_code = 400
+
+
+def test_parse_duration():
+    """Test the reset formats used in rate limit headers."""
+    assert parse_duration("1s") == 1.0
+    assert parse_duration("6m0s") == 360.0
+    assert parse_duration("20ms") == 0.02
+    assert parse_duration("1h2m3.5s") == 3723.5
+    assert parse_duration("7") == 7.0
+    assert parse_duration(None) is None
+    assert parse_duration("soon") is None
+
+
+def test_token_bucket_refills_between_reports():
+    """Test the budget refills at the rate implied by the reset time."""
+    bucket = TokenBucket()
+    assert bucket.wait_for(1, 0) == 0
+    bucket.update(limit=60, remaining=0, reset=60, now=100)
+    assert bucket.available(100) == 0
+    assert bucket.available(110) == pytest.approx(10)
+    assert bucket.wait_for(5, 100) == pytest.approx(5)
+
+
+async def test_priority_order_when_slots_free_up():
+    """Test queued interactive requests start before background ones."""
+    scheduler = RequestScheduler(max_concurrency=1)
+    order = []
+    release = asyncio.Event()
+
+    async def request(priority, name, wait=False):
+        async with scheduler.slot(priority):
+            order.append(name)
+            if wait:
+                await release.wait()
+
+    first = asyncio.create_task(request(Priority.INTERACTIVE, "first", wait=True))
+    await asyncio.sleep(0)
+    background = asyncio.create_task(request(Priority.BACKGROUND, "background"))
+    voice = asyncio.create_task(request(Priority.INTERACTIVE, "voice"))
+    await asyncio.sleep(0)
+    assert scheduler.as_dict()["queues"]["background"]["depth"] == 1
+
+    release.set()
+    await asyncio.gather(first, background, voice)
+    assert order == ["first", "voice", "background"]
+    assert scheduler.in_flight == 0
+    assert scheduler.stats[Priority.BACKGROUND].max_depth == 1
+
+
+async def test_full_queue_rejects_requests():
+    """Test backpressure when a class's queue is full."""
+    scheduler = RequestScheduler(max_concurrency=1, queue_limits={p: 1 for p in Priority})
+    release = asyncio.Event()
+
+    async def hold():
+        async with scheduler.slot(Priority.TASK):
+            await release.wait()
+
+    running = asyncio.create_task(hold())
+    queued = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    with pytest.raises(SchedulerBusy):
+        async with scheduler.slot(Priority.TASK):
+            pass
+    assert scheduler.stats[Priority.TASK].rejected == 1
+    release.set()
+    await asyncio.gather(running, queued)
+
+
+async def test_background_leaves_rate_limit_to_voice():
+    """Test lower classes wait when only the reserved share of the limit is left."""
+    scheduler = RequestScheduler()
+    scheduler.observe_response(
+        200,
+        {
+            "x-ratelimit-limit-requests": "100",
+            "x-ratelimit-remaining-requests": "20",
+            "x-ratelimit-reset-requests": "1m",
+        },
+    )
+    async with scheduler.slot(Priority.INTERACTIVE):
+        pass
+
+    waiting = asyncio.create_task(scheduler.slot(Priority.BACKGROUND).__aenter__())
+    await asyncio.sleep(0.01)
+    assert not waiting.done()
+    assert scheduler.stats[Priority.BACKGROUND].depth == 1
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    assert scheduler.stats[Priority.BACKGROUND].depth == 0
+
+
+async def test_rate_limited_response_pauses_requests():
+    """Test a 429 holds back new requests until its retry time."""
+    scheduler = RequestScheduler()
+    scheduler.observe_response(429, {"retry-after": "0.05"})
+    started = asyncio.get_running_loop().time()
+    async with scheduler.slot(Priority.INTERACTIVE):
+        pass
+    assert asyncio.get_running_loop().time() - started >= 0.04
+
+
+async def test_circuit_breaker_fails_fast_during_outage():
+    """Test consecutive server errors open the circuit and a probe closes it."""
+    scheduler = RequestScheduler(failure_threshold=2, cooldown=0.05)
+
+    async def fail(err):
+        async with scheduler.slot(Priority.INTERACTIVE):
+            raise err
+
+    with pytest.raises(BadRequest):
+        await fail(BadRequest())
+    for _ in range(2):
+        with pytest.raises(ServerError):
+            await fail(ServerError())
+    assert scheduler.breaker.state == "open"
+    with pytest.raises(CircuitOpen):
+        async with scheduler.slot(Priority.INTERACTIVE):
+            pass
+
+    await asyncio.sleep(0.06)
+    async with scheduler.slot(Priority.INTERACTIVE):
+        pass
+    assert scheduler.breaker.state == "closed"
+    assert scheduler.stats[Priority.INTERACTIVE].failed_fast == 1
+
+
+def test_half_open_allows_a_single_probe():
+    """Test only one request probes a recovering API."""
+    breaker = CircuitBreaker(threshold=1, cooldown=10)
+    breaker.record(ServerError(), now=0)
+    assert breaker.retry_in(5) == 5
+    assert breaker.retry_in(11) == 0
+    breaker.started()
+    assert breaker.retry_in(11) > 0
+    breaker.record(ServerError(), now=12)
+    assert breaker.state == "open"
+
+
+async def test_cancelled_probe_lets_another_request_probe():
+    """Test a probe cancelled by a timeout or a lost hedge does not keep the circuit half open."""
+    scheduler = RequestScheduler(failure_threshold=1, cooldown=0.05)
+    with pytest.raises(ServerError):
+        async with scheduler.slot(Priority.INTERACTIVE):
+            raise ServerError()
+    await asyncio.sleep(0.06)
+
+    async def probe():
+        async with scheduler.slot(Priority.INTERACTIVE):
+            await asyncio.sleep(10)
+
+    task = asyncio.ensure_future(probe())
+    await asyncio.sleep(0)
+    assert scheduler.breaker.state == "half_open"
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    async with scheduler.slot(Priority.INTERACTIVE):
+        pass
+    assert scheduler.breaker.state == "closed"
@@ -0,0 +1,56 @@
+"""Test turn latency spans and their histograms."""
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from custom_components.openai_conversation_plus.spans import (
+    DISABLED_SPANS,
+    LatencyHistogram,
+    PhaseHistograms,
+    TurnSpans,
+)
+
+
+def test_spans_accumulate_phases():
+    """Test repeated phases add up and the total is recorded on finish."""
+    with patch("custom_components.openai_conversation_plus.spans.time.perf_counter", side_effect=[0.0, 1.0, 1.5, 2.0, 2.25, 3.0]):
+        spans = TurnSpans()
+        started = spans.start()
+        assert spans.end("tools", started) == 1.5
+        spans.end("tools", spans.start())
+        spans.add("model", 40)
+        assert spans.finish() == {"tools": 750.0, "model": 40.0, "total": 3000.0}
+
+
+def test_disabled_spans_record_nothing():
+    """Test the shared recorder of untimed turns stays empty."""
+    started = DISABLED_SPANS.start()
+    DISABLED_SPANS.end("tools", started)
+    DISABLED_SPANS.add("model", 10)
+    assert DISABLED_SPANS.finish() == {}
+    assert DISABLED_SPANS.phases == {}
+
+
+def test_histogram_percentiles_within_bucket_error():
+    """Test percentiles land within one bucket of the exact value."""
+    histogram = LatencyHistogram()
+    for ms in range(1, 1001):
+        histogram.record(ms)
+    stats = histogram.as_dict()
+    assert stats["count"] == 1000 and stats["max"] == 1000
+    assert 500 <= stats["p50"] <= 500 * 1.15
+    assert 950 <= stats["p95"] <= 950 * 1.15
+    assert 990 <= stats["p99"] <= 1000
+    assert LatencyHistogram().as_dict()["p50"] is None
+
+
+def test_phase_histograms_skip_untimed_turns():
+    """Test only turns with phases are counted."""
+    histograms = PhaseHistograms()
+    histograms.record({})
+    histograms.record({"ttfb": 300.0, "total": 900.0})
+    histograms.record({"total": 1200.0})
+    stats = histograms.as_dict()
+    assert stats["turns"] == 2
+    assert list(stats["phases"]) == ["total", "ttfb"]
+    assert stats["phases"]["total"]["count"] == 2
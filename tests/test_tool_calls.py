@@ -0,0 +1,91 @@
+"""Test per-turn tool call deduplication."""
+from __future__ import annotations
+
+from custom_components.openai_conversation_plus.tool_calls import (
+    DUPLICATE_RESULT,
+    TurnToolCalls,
+    canonical_arguments,
+)
+
+
+def test_canonical_arguments_ignore_key_order():
+    """Test equal arguments serialize equally regardless of key order."""
+    assert canonical_arguments({"b": 1, "a": {"y": 2, "x": 1}}) == canonical_arguments(
+        {"a": {"x": 1, "y": 2}, "b": 1}
+    )
+
+
+READ_ONLY = {"get_attributes", "get_history"}
+
+
+def _calls() -> TurnToolCalls:
+    return TurnToolCalls(lambda name: name in READ_ONLY)
+
+
+def _service(service: str) -> dict:
+    return {"list": [{"domain": "light", "service": service, "target": {"entity_id": "light.hall"}}]}
+
+
+def test_read_only_duplicate_reuses_result():
+    """Test a repeated read-only call gets the first result."""
+    calls = _calls()
+    key = calls.key("get_attributes", {"entity_id": "sensor.outdoor"})
+    calls.record(key, "get_attributes", {"entity_id": "sensor.outdoor"}, {"ok": True, "result": 12})
+    assert calls.reuse(calls.key("get_attributes", {"entity_id": "sensor.outdoor"})) == {"ok": True, "result": 12}
+    assert calls.duplicates == 1
+
+
+def test_state_change_invalidates_reads():
+    """Test a read after a state-changing call runs again."""
+    calls = _calls()
+    read = calls.key("get_attributes", {"entity_id": "light.hall"})
+    calls.record(read, "get_attributes", {"entity_id": "light.hall"}, {"ok": True, "result": "off"})
+    write = calls.key("execute_services", _service("turn_on"))
+    calls.record(write, "execute_services", _service("turn_on"), {"ok": True, "result": []})
+    assert calls.reuse(read) is None
+
+
+def test_state_changing_duplicate_is_suppressed():
+    """Test a state-changing call repeating the last one is reported as already executed."""
+    calls = _calls()
+    key = calls.key("execute_services", _service("turn_on"))
+    calls.record(key, "execute_services", _service("turn_on"), {"ok": True, "result": []})
+    assert calls.reuse(key) == DUPLICATE_RESULT
+
+
+def test_state_changes_in_between_run_again():
+    """Test on, off, on runs the last call instead of suppressing it."""
+    calls = _calls()
+    on = calls.key("execute_services", _service("turn_on"))
+    off = calls.key("execute_services", _service("turn_off"))
+    calls.record(on, "execute_services", _service("turn_on"), {"ok": True, "result": []})
+    assert calls.reuse(off) is None
+    calls.record(off, "execute_services", _service("turn_off"), {"ok": True, "result": []})
+    assert calls.reuse(on) is None
+
+
+def test_failed_calls_are_not_remembered():
+    """Test a failed call may be retried."""
+    calls = _calls()
+    key = calls.key("get_history", {"entity_id": "sensor.x"})
+    calls.record(key, "get_history", {"entity_id": "sensor.x"}, {"ok": False, "error": "timeout"})
+    assert calls.reuse(key) is None
+    assert len(calls.records) == 1 and not calls.records[0].ok
+
+
+def test_different_arguments_are_not_duplicates():
+    """Test calls with other arguments run again."""
+    calls = _calls()
+    key = calls.key("get_attributes", {"entity_id": "sensor.a"})
+    calls.record(key, "get_attributes", {"entity_id": "sensor.a"}, {"ok": True})
+    assert calls.reuse(calls.key("get_attributes", {"entity_id": "sensor.b"})) is None
+
+
+def test_unknown_tools_are_state_changing():
+    """Test a repeated read of an unclassified tool is not reused."""
+    calls = TurnToolCalls()
+    read = calls.key("get_attributes", {"entity_id": "sensor.a"})
+    other = calls.key("get_attributes", {"entity_id": "sensor.b"})
+    calls.record(read, "get_attributes", {"entity_id": "sensor.a"}, {"ok": True})
+    calls.record(other, "get_attributes", {"entity_id": "sensor.b"}, {"ok": True})
+    assert calls.reuse(read) is None
@@ -0,0 +1,66 @@
+"""Test the tool result size governor."""
+from __future__ import annotations
+
+from custom_components.openai_conversation_plus.tool_results import (
+    ResultLimits,
+    estimate_tokens,
+    govern_result,
+    wrap_tool_result,
+)
+
+
+def test_small_result_untouched():
+    """Test results under the limit pass through unchanged."""
+    result = {"state": "on", "attributes": {"brightness": 255}}
+    governed, stats = govern_result(result, ResultLimits())
+    assert governed is result
+    assert not stats.trimmed
+
+
+def test_long_list_truncated_with_marker():
+    """Test long lists are cut and marked with the number of dropped items."""
+    rows = [{"entity_id": f"sensor.s{i}", "state": str(i)} for i in range(1000)]
+    limits = ResultLimits(max_tokens=500, max_items=50)
+    governed, stats = govern_result(rows, limits)
+
+    assert estimate_tokens(governed) <= 500
+    assert governed[-1].endswith("more items")
+    assert stats.truncated_lists == 1
+    assert stats.original_tokens > stats.tokens
+
+
+def test_empty_fields_dropped_and_deep_structures_collapsed():
+    """Test null/empty fields are removed and deep nesting is summarized."""
+    result = {
+        "a": None,
+        "b": "",
+        "c": [],
+        "deep": {"l1": {"l2": {"l3": {"x": 1}}}},
+        "pad": ["x" * 100] * 20,
+    }
+    governed, stats = govern_result(result, ResultLimits(max_tokens=100, max_depth=3))
+
+    assert "a" not in governed and "b" not in governed and "c" not in governed
+    assert governed["deep"]["l1"]["l2"] == "<object with 1 keys>"
+    assert stats.dropped_empty == 3
+    assert stats.collapsed == 1
+
+
+def test_projection_to_declared_keys():
+    """Test results are projected to the keys declared for the function."""
+    limits = ResultLimits.from_options(
+        {}, {"result_limits": {"keys": ["entity_id", "state"]}}
+    )
+    rows = [{"entity_id": "light.a", "state": "on", "attributes": {"x": 1}}]
+    governed, stats = govern_result(rows, limits)
+    assert governed == [{"entity_id": "light.a", "state": "on"}]
+    assert stats.dropped_keys == 1
+
+
+def test_wrap_records_trim_summary():
+    """Test the wrapped payload records how much was trimmed."""
+    result_data = wrap_tool_result(
+        "get_attributes", ["y" * 50] * 500, ResultLimits(max_tokens=200, max_items=10)
+    )
+    assert result_data["ok"] is True
+    assert result_data["_trimmed"]["original_tokens"] > result_data["_trimmed"]["tokens"]
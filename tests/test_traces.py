@@ -0,0 +1,94 @@
+"""Test the in-memory turn trace buffer."""
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+
+from custom_components.openai_conversation_plus.traces import (
+    TraceBuffer,
+    TurnTrace,
+    ref,
+    write_traces,
+)
+
+
+def test_trace_keeps_references_not_payloads():
+    """Test arguments, results and input are kept as hash and size only."""
+    trace = TurnTrace("conv-1")
+    trace.add_tool_call("execute_services", ref({"list": [{"domain": "light"}]}), {"ok": False, "error": "boom"}, 12.34)
+    trace.add_response(
+        SimpleNamespace(
+            id="resp_1",
+            usage=SimpleNamespace(input_tokens=100, output_tokens=20, input_tokens_details=SimpleNamespace(cached_tokens=64)),
+        )
+    )
+    trace.add_response(SimpleNamespace(id="resp_2", usage={"input_tokens": 50, "output_tokens": 5}))
+
+    data = trace.as_dict()
+    (call,) = data["tool_calls"]
+    assert call["arguments"] == ref({"list": [{"domain": "light"}]})
+    assert set(call["result"]) == {"sha1", "bytes"}
+    assert call["error"] == "boom" and call["ms"] == 12.3
+    assert data["usage"] == {"input_tokens": 150, "output_tokens": 25, "cached_tokens": 64}
+    assert data["refs"]["responses"] == ["resp_1", "resp_2"]
+
+
+def test_buffer_bounded_by_count_and_dump_by_bytes():
+    """Test the oldest traces are evicted past the count and left out of a dump past the bytes."""
+    buffer = TraceBuffer(3)
+    for index in range(5):
+        buffer.add(TurnTrace(f"conv-{index}"))
+    assert [json.loads(line)["conversation_id"] for line in buffer.lines()] == ["conv-2", "conv-3", "conv-4"]
+    assert buffer.lines(1) == buffer.lines()[-1:]
+
+    size = len(buffer.lines()[0])
+    small = TraceBuffer(100, max_bytes=size * 2)
+    for index in range(5):
+        small.add(TurnTrace(f"conv-{index}"))
+    assert len(small) == 5
+    assert [json.loads(line)["conversation_id"] for line in small.lines()] == ["conv-3", "conv-4"]
+
+    buffer.resize(1)
+    assert len(buffer) == 1
+
+
+class _Message:
+    def __init__(self) -> None:
+        self.serialized = 0
+
+    def __str__(self) -> str:
+        self.serialized += 1
+        return "message"
+
+
+def test_input_hashed_only_when_dumped():
+    """Test adding a trace does not serialize its input or change its total time later."""
+    message = _Message()
+    trace = TurnTrace("conv")
+    trace.input = [message]
+    buffer = TraceBuffer(10)
+    buffer.add(trace)
+    assert message.serialized == 0
+
+    first = json.loads(buffer.lines()[0])
+    assert message.serialized == 1
+    assert first["request"]["input"] == ref([message])
+    assert json.loads(buffer.lines()[0])["total_ms"] == first["total_ms"]
+
+
+def test_disabled_buffer_keeps_nothing():
+    """Test a buffer of size 0 turns tracing off."""
+    buffer = TraceBuffer(0)
+    assert not buffer.enabled
+    buffer.add(TurnTrace())
+    assert len(buffer) == 0
+
+
+def test_write_traces_as_jsonl(tmp_path):
+    """Test traces are written one per line."""
+    buffer = TraceBuffer(10)
+    buffer.add(TurnTrace("a"))
+    buffer.add(TurnTrace("b"))
+    path = tmp_path / "logs" / "traces.jsonl"
+    write_traces(path, buffer.lines())
+    assert [json.loads(line)["conversation_id"] for line in path.read_text().splitlines()] == ["a", "b"]